@@ -0,0 +1,111 @@
+import json
+from typing import Dict, List, Optional, Tuple
+from models import Pokemon, PaginationInfo
+import config
+
+# Layouts of /api/pokemon pages: an object per Pokemon, or an array per field (format=columns)
+PAGE_FORMATS = ('objects', 'columns')
+POKEMON_COLUMNS = ('id', 'name', 'height', 'weight', 'types', 'abilities', 'base_experience', 'sprite_url', 'description')
+
+def encode_json(data) -> bytes:
+    """Encode a value as compact JSON bytes"""
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+def pokemon_page_body(pokemon_list: List[Pokemon], pagination_info: PaginationInfo,
+                      filters: Optional[Dict] = None) -> bytes:
+    """JSON body of /api/pokemon: the page of Pokemon plus pagination metadata (and filter coverage, if filtered)"""
+    # Each Pokemon caches its own JSON encoding, so the page body is plain byte concatenation
+    return (b'{"pokemon":[' + b','.join(pokemon.to_json() for pokemon in pokemon_list) +
+            b'],"pagination":' + encode_json(pagination_fields(pagination_info, len(pokemon_list))) +
+            (b',"filters":' + encode_json(filters) if filters is not None else b'') + b'}')
+
+def pokemon_columns_body(pokemon_list: List[Pokemon], pagination_info: PaginationInfo,
+                         filters: Optional[Dict] = None) -> bytes:
+    """Columnar /api/pokemon body: the same page with each Pokemon field sent once as an array ({"id":[...],"name":[...]})"""
+    rows = [pokemon.to_dict() for pokemon in pokemon_list]
+    body = {'pokemon': {column: [row[column] for row in rows] for column in POKEMON_COLUMNS},
+            'pagination': pagination_fields(pagination_info, len(pokemon_list))}
+    if filters is not None:
+        body['filters'] = filters
+    return encode_json(body)
+
+def page_format(params) -> str:
+    """
+    The `format` parameter of a page request
+    
+    Args:
+        params: Request arguments with `getlist()` (Flask or Starlette)
+        
+    Returns:
+        One of PAGE_FORMATS ('objects' if missing)
+        
+    Raises:
+        ValueError: On an unknown format
+    """
+    values = params.getlist('format')
+    value = values[-1].strip().lower() if values else 'objects'
+    if value not in PAGE_FORMATS:
+        raise ValueError(f"'format' must be one of {', '.join(PAGE_FORMATS)}")
+    return value
+
+def pagination_fields(pagination_info: PaginationInfo, current_count: int) -> Dict:
+    """The `pagination` object of page responses"""
+    return {
+        'current_page': pagination_info.current_page,
+        'total_pages': pagination_info.total_pages,
+        'has_next': pagination_info.has_next,
+        'has_previous': pagination_info.has_previous,
+        'total_count': pagination_info.count,
+        'current_count': current_count,
+        'stale': pagination_info.stale,
+        'next_cursor': pagination_info.next_cursor
+    }
+
+def batch_lookup_names(data) -> List[str]:
+    """
+    The names of an /api/pokemon/batch request body ({"pokemon": ["pikachu", 6, "mew"]})
+    
+    Returns:
+        Names and IDs as strings, in request order (duplicates kept, so results line up)
+        
+    Raises:
+        ValueError: If the list is missing, empty, longer than BATCH_LOOKUP_MAX or holds anything but names and IDs
+    """
+    names = data.get('pokemon') if isinstance(data, dict) else None
+    if not isinstance(names, list) or not names:
+        raise ValueError("'pokemon' must be a non-empty list of names or IDs")
+    if len(names) > config.BATCH_LOOKUP_MAX:
+        raise ValueError(f"'pokemon' may hold at most {config.BATCH_LOOKUP_MAX} names or IDs")
+    if any(isinstance(name, bool) or not isinstance(name, (str, int)) or not str(name).strip() for name in names):
+        raise ValueError("'pokemon' must be a non-empty list of names or IDs")
+    return [str(name).strip() for name in names]
+
+def batch_lookup_body(names: List[str], results: List[Tuple[Optional[Pokemon], bool, Optional[str]]]) -> bytes:
+    """JSON body of /api/pokemon/batch: one result per requested name, in request order, each found or with an error"""
+    items = []
+    for name, (pokemon, _, error) in zip(names, results):
+        if pokemon is not None:
+            items.append(b'{"query":' + encode_json(name) + b',"found":true,"pokemon":' + pokemon.to_json() + b'}')
+        else:
+            items.append(encode_json({'query': name, 'found': False, 'error': error or 'Pokemon not found'}))
+    stale = any(stale for _, stale, _ in results)
+    return b'{"results":[' + b','.join(items) + b'],"stale":' + (b'true' if stale else b'false') + b'}'
+
+def channel_page_body(message_id, pagination_info: PaginationInfo) -> bytes:
+    """First /ws reply to a page request: pagination, with current_count the number of Pokemon the page should hold"""
+    expected = max(0, min(pagination_info.current_limit, pagination_info.count - pagination_info.current_offset))
+    return (b'{"id":' + encode_json(message_id) + b',"type":"page","pagination":' +
+            encode_json(pagination_fields(pagination_info, expected)) + b'}')
+
+def channel_pokemon_body(message_id, position: int, pokemon: Pokemon) -> bytes:
+    """/ws message carrying one Pokemon card of a page as soon as it has loaded"""
+    return (b'{"id":' + encode_json(message_id) + b',"type":"pokemon","index":' + str(position).encode() +
+            b',"pokemon":' + pokemon.to_json() + b'}')
+
+def channel_body(message_id, message_type: str, body: Dict) -> bytes:
+    """Any other /ws reply: `body` tagged with the request's id and a message type"""
+    return encode_json({'id': message_id, 'type': message_type, **body})
+
+def search_found_body(pokemon: Pokemon, stale: bool = False) -> bytes:
+    """JSON body of a successful /api/search"""
+    return b'{"pokemon":' + pokemon.to_json() + b',"found":true,"stale":' + (b'true' if stale else b'false') + b'}'
@@ -0,0 +1,611 @@
+"""
+ASGI entry point serving the same routes as web_app.py on an async stack
+
+Run with:
+    uvicorn asgi_app:app --port 5000
+
+Upstream PokeAPI calls go through AsyncPokeAPIClient, so a single process
+can keep many page loads in flight without a thread per request.
+"""
+
+from contextlib import asynccontextmanager
+import json
+import logging
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional, Tuple
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Mount, Route, WebSocketRoute
+from starlette.staticfiles import StaticFiles
+from starlette.templating import Jinja2Templates
+from starlette.websockets import WebSocket, WebSocketDisconnect
+from api_responses import (batch_lookup_body, batch_lookup_names, channel_body, channel_page_body,
+                           channel_pokemon_body, encode_json, page_format, search_found_body)
+from async_pokemon_service import AsyncPokemonService
+from battle import battle_pokemon_from_details, choose_computer_action, simulate_turn
+from battle_engine import Combatant, batch_options, run_battles
+from battle_sessions import ACTIONS, BattleSessionStore
+from models import Pokemon
+from cursors import PageCursor, export_options
+from dex_index import DexQuery
+from http_cache import (FILTERED_PAGE_POLICY, PAGE_POLICY, POKEMON_POLICY, SPRITE_POLICY, RenderedResponse,
+                        ResponseCache, content_etag, is_complete_page, pokemon_etag, render_page)
+from sprites import SPRITE_VARIANTS, Sprite, SpriteStore, sheet_options, sprite_size
+from stat_store import StatsQuery
+from tournament import TOURNAMENT_STATUS_CODES, TournamentRunner, tournament_options
+import config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+pokemon_service = AsyncPokemonService(page_size=12)  # 12 for nice grid layout
+tournament_runner = TournamentRunner()
+battle_sessions = BattleSessionStore()
+response_cache = ResponseCache()
+# Blocking (disk and upstream I/O), so it is called through run_in_threadpool
+sprite_store = SpriteStore()
+
+BASE_DIR = Path(__file__).resolve().parent
+
+templates = Jinja2Templates(directory=BASE_DIR / 'templates')
+# The templates use Flask's url_for('static', filename=...) signature
+templates.env.globals['url_for'] = lambda endpoint, filename: f'/static/{filename}'
+
+def int_param(params, name: str, default: int) -> int:
+    """An integer query parameter, or `default` when it is missing or not an integer (as Flask's `type=int`)"""
+    try:
+        return int(params[name])
+    except (KeyError, ValueError):
+        return default
+
+def json_bytes_response(body: bytes, status: int = 200) -> Response:
+    """Wrap already encoded JSON bytes in a response"""
+    return Response(body, status_code=status, media_type='application/json')
+
+def rendered_response(request: Request, rendered: RenderedResponse) -> Response:
+    """see web_app.rendered_response"""
+    status, headers, body = response_cache.answer(rendered, request.headers.get('if-none-match'),
+                                                  request.headers.get('accept-encoding'))
+    return Response(body, status_code=status, headers=headers, media_type='application/json' if status == 200 else None)
+
+def response_cache_key(request: Request) -> str:
+    """Response cache key of a request"""
+    return ResponseCache.key(request.url.path, request.query_params.multi_items())
+
+def sprite_response(request: Request, sprite: Sprite, complete: bool = True) -> Response:
+    """see web_app.sprite_response"""
+    rendered = RenderedResponse(sprite.body, sprite.etag, SPRITE_POLICY.headers(not complete))
+    status, headers, body = rendered.response_parts(request.headers.get('if-none-match'))
+    return Response(body, status_code=status, headers=headers, media_type='image/png' if status == 200 else None)
+
+async def index(request: Request):
+    """Main page route"""
+    return templates.TemplateResponse(request, 'index.html')
+
+async def battle_page(request: Request):
+    """Battle simulator page route"""
+    return templates.TemplateResponse(request, 'battle.html')
+
+async def get_pokemon_list(request: Request):
+    """API endpoint to get paginated Pokemon list; see web_app.get_pokemon_list"""
+    try:
+        key = response_cache_key(request)
+        rendered = response_cache.get(key)
+        if rendered is not None:
+            return rendered_response(request, rendered)
+            
+        page = max(1, int_param(request.query_params, 'page', 1))
+        limit = max(1, min(int_param(request.query_params, 'limit', pokemon_service.page_size), config.MAX_PAGE_SIZE))
+        
+        offset = (page - 1) * limit
+        
+        try:
+            query = DexQuery.from_params(request.query_params)
+            layout = page_format(request.query_params)
+            cursor = PageCursor.from_params(request.query_params)
+            if cursor is not None and query is not None:
+                raise ValueError("'cursor' can't be combined with filters or sorting")
+        except ValueError as e:
+            return JSONResponse({'error': str(e)}, status_code=400)
+            
+        if query is not None:
+            pokemon_list, pagination_info = await pokemon_service.filter_pokemon(query, offset=offset, limit=limit)
+            filters = {'indexed': len(pokemon_service.dex_indexer), 'complete': pokemon_service.dex_indexer.complete}
+            rendered = render_page(pokemon_list, pagination_info, filters, FILTERED_PAGE_POLICY, layout)
+            if filters['complete']:
+                response_cache.put(key, rendered)
+            return rendered_response(request, rendered)
+            
+        if cursor is not None:
+            pokemon_list, pagination_info = await pokemon_service.load_pokemon_page_after(cursor, limit=limit)
+        else:
+            pokemon_list, pagination_info = await pokemon_service.load_pokemon_page(offset=offset, limit=limit)
+        rendered = render_page(pokemon_list, pagination_info, page_format=layout)
+        if is_complete_page(pokemon_list, pagination_info):
+            response_cache.put(key, rendered)
+        return rendered_response(request, rendered)
+        
+    except Exception as e:
+        logger.error(f"Error fetching Pokemon list: {e}")
+        return JSONResponse({'error': 'Failed to fetch Pokemon list'}, status_code=500)
+
+async def export_pokemon(request: Request):
+    """API endpoint streaming a range of Pokemon as NDJSON; see web_app.export_pokemon"""
+    try:
+        try:
+            cursor, offset, count = export_options(request.query_params)
+        except ValueError as e:
+            return JSONResponse({'error': str(e)}, status_code=400)
+            
+        if cursor is not None:
+            offset = await pokemon_service.locate_cursor(cursor)
+        return StreamingResponse(ndjson_lines(pokemon_service.export_pokemon(offset, count)),
+                                 media_type='application/x-ndjson')
+        
+    except Exception as e:
+        logger.error(f"Error exporting Pokemon: {e}")
+        return JSONResponse({'error': 'Failed to export Pokemon'}, status_code=500)
+
+async def ndjson_lines(pokemon_stream: AsyncIterator[Pokemon]) -> AsyncIterator[bytes]:
+    """see web_app.ndjson_lines"""
+    try:
+        async for pokemon in pokemon_stream:
+            yield pokemon.to_json() + b'\n'
+    except Exception as e:
+        logger.error(f"Error exporting Pokemon: {e}")
+    finally:
+        await pokemon_stream.aclose()
+
+async def get_pokemon_batch(request: Request):
+    """API endpoint to look up many Pokemon by name or ID in one request; see web_app.get_pokemon_batch"""
+    try:
+        try:
+            data = await request.json()
+        except ValueError:
+            data = None
+        try:
+            names = batch_lookup_names(data)
+        except ValueError as e:
+            return JSONResponse({'error': str(e)}, status_code=400)
+            
+        return json_bytes_response(batch_lookup_body(names, await pokemon_service.get_many(names)))
+        
+    except Exception as e:
+        logger.error(f"Error fetching Pokemon batch: {e}")
+        return JSONResponse({'error': 'Failed to fetch Pokemon'}, status_code=500)
+
+async def get_pokemon_details(request: Request):
+    """API endpoint to get specific Pokemon details"""
+    pokemon_name = request.path_params['pokemon_name']
+    try:
+        key = response_cache_key(request)
+        rendered = response_cache.get(key)
+        if rendered is not None:
+            return rendered_response(request, rendered)
+            
+        pokemon = await pokemon_service.search_pokemon(pokemon_name, match=False)
+        
+        if pokemon:
+            rendered = RenderedResponse(pokemon.to_json(), pokemon_etag(pokemon), POKEMON_POLICY.headers())
+            return rendered_response(request, response_cache.put(key, rendered))
+        else:
+            return JSONResponse({'error': 'Pokemon not found'}, status_code=404)
+            
+    except Exception as e:
+        logger.error(f"Error fetching Pokemon details for {pokemon_name}: {e}")
+        return JSONResponse({'error': 'Failed to fetch Pokemon details'}, status_code=500)
+
+async def search_pokemon(request: Request):
+    """API endpoint to search Pokemon"""
+    try:
+        query = request.query_params.get('q', '').strip().lower()
+        
+        if not query:
+            return JSONResponse({'error': 'Search query is required'}, status_code=400)
+            
+        pokemon = await pokemon_service.search_pokemon(query)
+        
+        if pokemon:
+            return json_bytes_response(search_found_body(pokemon))
+        else:
+            return JSONResponse({'found': False, 'message': f'Pokemon "{query}" not found'})
+            
+    except Exception as e:
+        logger.error(f"Error searching for Pokemon: {e}")
+        return JSONResponse({'error': 'Search failed'}, status_code=500)
+
+async def suggest_pokemon(request: Request):
+    """API endpoint for search autocomplete, answered from the local name index"""
+    try:
+        query = request.query_params.get('q', '').strip().lower()
+        limit = int_param(request.query_params, 'limit', config.SEARCH_SUGGESTION_LIMIT)
+            
+        if not query:
+            return JSONResponse({'query': query, 'suggestions': []})
+            
+        limit = max(1, min(limit, config.MAX_PAGE_SIZE))
+        return JSONResponse({'query': query, 'suggestions': await pokemon_service.suggest_pokemon(query, limit)})
+        
+    except Exception as e:
+        logger.error(f"Error suggesting Pokemon names: {e}")
+        return JSONResponse({'error': 'Suggestions failed'}, status_code=500)
+
+async def get_stats(request: Request):
+    """API endpoint for aggregate stats: percentiles, top-N and per-type averages"""
+    try:
+        try:
+            query = StatsQuery.from_params(request.query_params)
+        except ValueError as e:
+            return JSONResponse({'error': str(e)}, status_code=400)
+            
+        return JSONResponse(pokemon_service.stats_report(query))
+        
+    except Exception as e:
+        logger.error(f"Error computing Pokemon stats: {e}")
+        return JSONResponse({'error': 'Failed to compute Pokemon stats'}, status_code=500)
+
+async def get_pokemon_names(request: Request):
+    """API endpoint to get a list of Pokemon names for dropdowns"""
+    try:
+        key = response_cache_key(request)
+        rendered = response_cache.get(key)
+        if rendered is not None:
+            return rendered_response(request, rendered)
+            
+        response = await pokemon_service.api_client.get_pokemon_list(limit=151, offset=0)
+        pokemon_names = [pokemon['name'] for pokemon in response.get('results', [])]
+        body = encode_json({'pokemon': pokemon_names})
+        rendered = RenderedResponse(body, content_etag(body), PAGE_POLICY.headers())
+        if pokemon_names:
+            response_cache.put(key, rendered)
+        return rendered_response(request, rendered)
+    except Exception as e:
+        logger.error(f"Error fetching Pokemon names: {e}")
+        return JSONResponse({'error': 'Failed to fetch Pokemon names'}, status_code=500)
+
+async def get_battle_pokemon(request: Request):
+    """API endpoint to get Pokemon battle stats"""
+    pokemon_name = request.path_params['pokemon_name']
+    try:
+        key = response_cache_key(request)
+        rendered = response_cache.get(key)
+        if rendered is not None:
+            return rendered_response(request, rendered)
+            
+        battle_pokemon = await load_battle_pokemon(pokemon_name)
+        if not battle_pokemon:
+            return JSONResponse({'error': 'Pokemon not found'}, status_code=404)
+            
+        body = encode_json(battle_pokemon)
+        return rendered_response(request, response_cache.put(key, RenderedResponse(body, content_etag(body), POKEMON_POLICY.headers())))
+        
+    except Exception as e:
+        logger.error(f"Error fetching battle Pokemon {pokemon_name}: {e}")
+        return JSONResponse({'error': 'Failed to fetch Pokemon battle data'}, status_code=500)
+
+async def get_computer_action(request: Request):
+    """API endpoint to get computer's action choice"""
+    try:
+        data = await request.json()
+        return JSONResponse(choose_computer_action(data.get('computer_pokemon'), data.get('player_pokemon')))
+        
+    except Exception as e:
+        logger.error(f"Error getting computer action: {e}")
+        return JSONResponse({'action': 'attack', 'description': 'The opponent attacks!'}, status_code=500)
+
+async def simulate_battle(request: Request):
+    """API endpoint to simulate a battle turn with different actions"""
+    try:
+        data = await request.json()
+        return JSONResponse(simulate_turn(data.get('action', 'attack'), data.get('attacker'), data.get('defender')))
+        
+    except Exception as e:
+        logger.error(f"Error simulating battle: {e}")
+        return JSONResponse({'error': 'Battle simulation failed'}, status_code=500)
+
+async def simulate_battle_batch(request: Request):
+    """API endpoint to run many full battles between two Pokemon and return win rates, turns and damage"""
+    try:
+        try:
+            data = await request.json()
+        except ValueError:
+            data = None
+        if not isinstance(data, dict):
+            data = {}
+        try:
+            battles, seed, max_turns = batch_options(data)
+            player = await battle_combatant(data.get('player'))
+            computer = await battle_combatant(data.get('computer'))
+        except ValueError as e:
+            return JSONResponse({'error': str(e)}, status_code=400)
+            
+        if player is None or computer is None:
+            return JSONResponse({'error': 'Pokemon not found'}, status_code=404)
+            
+        # CPU-bound; keep it off the event loop
+        outcomes = await run_in_threadpool(run_battles, player, computer, battles, seed=seed, max_turns=max_turns)
+        return JSONResponse({'seed': seed, **outcomes.summary()})
+        
+    except Exception as e:
+        logger.error(f"Error running battle batch: {e}")
+        return JSONResponse({'error': 'Battle batch failed'}, status_code=500)
+
+async def battle_combatant(pokemon) -> Optional[Combatant]:
+    """Resolve one side of a battle batch request; see web_app.battle_combatant"""
+    if isinstance(pokemon, dict):
+        return Combatant.from_battle_pokemon(pokemon)
+    if not isinstance(pokemon, (str, int)) or not str(pokemon).strip():
+        raise ValueError("'player' and 'computer' must be Pokemon names or battle Pokemon")
+        
+    battle_pokemon = await load_battle_pokemon(pokemon)
+    return Combatant.from_battle_pokemon(battle_pokemon) if battle_pokemon else None
+
+async def load_battle_pokemon(pokemon) -> Optional[Dict]:
+    """Battle Pokemon for a name or ID, or None if it doesn't exist; see web_app.load_battle_pokemon"""
+    if not isinstance(pokemon, (str, int)) or not str(pokemon).strip():
+        raise ValueError("'player' and 'computer' must be Pokemon names or IDs")
+        
+    pokemon_details = await pokemon_service.api_client.get_pokemon_details(str(pokemon).strip().lower())
+    if not pokemon_details:
+        return None
+    return battle_pokemon_from_details(pokemon_details, pokemon_service.battle_stats(pokemon_details))
+
+async def create_battle_session(request: Request):
+    """API endpoint to start a battle held on the server; turns then send only the action"""
+    try:
+        try:
+            data = await request.json()
+        except ValueError:
+            data = None
+        body, status = await open_battle_session(data)
+        return JSONResponse(body, status_code=status)
+        
+    except Exception as e:
+        logger.error(f"Error creating battle session: {e}")
+        return JSONResponse({'error': 'Failed to start battle'}, status_code=500)
+
+async def open_battle_session(data) -> Tuple[Dict, int]:
+    """Start a battle session; returns (response body, HTTP status), see web_app.open_battle_session"""
+    if not isinstance(data, dict):
+        data = {}
+    try:
+        player = await load_battle_pokemon(data.get('player'))
+        computer = await load_battle_pokemon(data.get('computer'))
+    except ValueError as e:
+        return {'error': str(e)}, 400
+        
+    if player is None or computer is None:
+        return {'error': 'Pokemon not found'}, 404
+        
+    session_id, _ = battle_sessions.create(player, computer)
+    return {'session_id': session_id, 'player': player, 'computer': computer,
+            'next': 'player', 'expires_in': battle_sessions.ttl}, 201
+
+async def play_battle_turn(request: Request):
+    """API endpoint to play the player's action or, with no action, the computer's announced one"""
+    try:
+        try:
+            data = await request.json()
+        except ValueError:
+            data = None
+        body, status = play_session_turn(request.path_params['session_id'], data)
+        return JSONResponse(body, status_code=status)
+        
+    except Exception as e:
+        logger.error(f"Error playing battle turn: {e}")
+        return JSONResponse({'error': 'Battle turn failed'}, status_code=500)
+
+def play_session_turn(session_id, data) -> Tuple[Dict, int]:
+    """Play one turn of a battle session; returns (response body, HTTP status), see web_app.play_session_turn"""
+    action = data.get('action') if isinstance(data, dict) else None
+    if action is not None and action not in ACTIONS:
+        return {'error': f"'action' must be one of {', '.join(ACTIONS)}"}, 400
+        
+    try:
+        delta = battle_sessions.play(str(session_id), action)
+    except ValueError as e:
+        # Not this side's turn, or the battle is over
+        return {'error': str(e)}, 409
+        
+    if delta is None:
+        return {'error': 'Battle session not found or expired'}, 404
+    return delta, 200
+
+async def end_battle_session(request: Request):
+    """API endpoint to close a battle session before it expires"""
+    if not battle_sessions.end(request.path_params['session_id']):
+        return JSONResponse({'error': 'Battle session not found or expired'}, status_code=404)
+    return Response(status_code=204)
+
+async def live_channel(websocket: WebSocket):
+    """WebSocket carrying streamed Pokemon pages and battle turns; see web_app.live_channel for the protocol"""
+    await websocket.accept()
+    
+    async def send(body: bytes):
+        await websocket.send_text(body.decode('utf-8'))
+        
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+            except ValueError:
+                message = None
+            if not isinstance(message, dict):
+                await send(channel_body(None, 'error', {'error': 'Messages must be JSON objects', 'status': 400}))
+                continue
+                
+            message_id, message_type = message.get('id'), message.get('type')
+            try:
+                if message_type == 'page':
+                    await stream_page(send, message_id, message)
+                    continue
+                if message_type == 'battle_start':
+                    body, status = await open_battle_session(message)
+                elif message_type == 'turn':
+                    body, status = play_session_turn(message.get('session_id'), message)
+                elif message_type == 'battle_end':
+                    ended = battle_sessions.end(str(message.get('session_id')))
+                    body, status = ({}, 200) if ended else ({'error': 'Battle session not found or expired'}, 404)
+                else:
+                    body, status = {'error': "'type' must be one of page, battle_start, turn, battle_end"}, 400
+                await send(channel_body(message_id, message_type if status < 400 else 'error',
+                                        body if status < 400 else {**body, 'status': status}))
+                                        
+            except WebSocketDisconnect:
+                raise
+            except Exception as e:
+                logger.error(f"Error handling {message_type} message: {e}")
+                await send(channel_body(message_id, 'error', {'error': 'Request failed', 'status': 500}))
+                
+    except WebSocketDisconnect:
+        pass
+
+async def stream_page(send, message_id, message: Dict):
+    """Send a page of Pokemon over the live channel card by card, in the order they finish loading"""
+    try:
+        page = max(1, int(message.get('page', 1)))
+        limit = max(1, min(int(message.get('limit', pokemon_service.page_size)), config.MAX_PAGE_SIZE))
+    except (TypeError, ValueError):
+        await send(channel_body(message_id, 'error', {'error': "'page' and 'limit' must be integers", 'status': 400}))
+        return
+        
+    pagination_info, pokemon_stream = await pokemon_service.stream_pokemon_page(offset=(page - 1) * limit, limit=limit)
+    await send(channel_page_body(message_id, pagination_info))
+    count = 0
+    async for position, pokemon in pokemon_stream:
+        await send(channel_pokemon_body(message_id, position, pokemon))
+        count += 1
+    await send(channel_body(message_id, 'done', {'count': count}))
+
+async def get_tournament(request: Request):
+    """API endpoint for the round-robin win-probability matrix of a Pokemon set; 202 with progress while computing"""
+    try:
+        try:
+            pokemon_set, battles, seed = tournament_options(request.query_params)
+        except ValueError as e:
+            return JSONResponse({'error': str(e)}, status_code=400)
+            
+        names, stats = await pokemon_service.battle_roster(pokemon_set)
+        if len(names) < 2:
+            return JSONResponse({'error': 'Not enough Pokemon loaded for a tournament'}, status_code=404)
+            
+        # May read a cached matrix from disk
+        status, result = await run_in_threadpool(tournament_runner.get, names, stats, battles, seed)
+        if result is None:
+            headers = {'Retry-After': str(status['retry_after'])} if 'retry_after' in status else None
+            return JSONResponse({'set': pokemon_set, **status}, status_code=TOURNAMENT_STATUS_CODES.get(status['status'], 202),
+                                headers=headers)
+        return JSONResponse({'set': pokemon_set, **status, **result.to_dict()})
+        
+    except Exception as e:
+        logger.error(f"Error running tournament: {e}")
+        return JSONResponse({'error': 'Tournament failed'}, status_code=500)
+
+async def get_sprite(request: Request):
+    """Pokemon sprite proxied through the local sprite store; see web_app.get_sprite"""
+    pokemon_id, variant = request.path_params['pokemon_id'], request.path_params['variant']
+    try:
+        if variant not in SPRITE_VARIANTS:
+            return JSONResponse({'error': 'Sprite not found'}, status_code=404)
+        try:
+            size = sprite_size(request.query_params)
+        except ValueError as e:
+            return JSONResponse({'error': str(e)}, status_code=400)
+            
+        sprite = await run_in_threadpool(sprite_store.get, pokemon_id, variant, size)
+        if sprite is None:
+            return JSONResponse({'error': 'Sprite not found'}, status_code=404)
+        return sprite_response(request, sprite)
+        
+    except Exception as e:
+        logger.error(f"Error fetching sprite {pokemon_id}/{variant}: {e}")
+        return JSONResponse({'error': 'Failed to fetch sprite'}, status_code=500)
+
+async def get_sprite_sheet(request: Request):
+    """One PNG strip with the sprites of several Pokemon; see web_app.get_sprite_sheet"""
+    try:
+        try:
+            pokemon_ids, variant, size = sheet_options(request.query_params)
+        except ValueError as e:
+            return JSONResponse({'error': str(e)}, status_code=400)
+            
+        sheet, complete = await run_in_threadpool(sprite_store.get_sheet, pokemon_ids, variant, size)
+        return sprite_response(request, sheet, complete)
+        
+    except Exception as e:
+        logger.error(f"Error building sprite sheet: {e}")
+        return JSONResponse({'error': 'Failed to build sprite sheet'}, status_code=500)
+
+async def get_cache_stats(request: Request):
+    """API endpoint exposing upstream and rendered response cache, request coalescing and circuit breaker counters"""
+    api_client = pokemon_service.api_client
+    upstream = {
+        'coalescing': api_client.single_flight.stats(),
+        'circuit_breaker': api_client.circuit_breaker.stats(),
+        'battle_sessions': battle_sessions.stats(),
+        'rendered_responses': response_cache.stats(),
+        'sprites': sprite_store.stats(),
+    }
+    
+    if api_client.cache is None:
+        return JSONResponse({'enabled': False, **upstream})
+    return JSONResponse({'enabled': True, **api_client.cache.stats(), **upstream})
+
+async def not_found(request: Request, exc: Exception):
+    """Handle 404 errors"""
+    return JSONResponse({'error': 'Endpoint not found'}, status_code=404)
+
+async def internal_error(request: Request, exc: Exception):
+    """Handle 500 errors"""
+    return JSONResponse({'error': 'Internal server error'}, status_code=500)
+
+@asynccontextmanager
+async def lifespan(app: Starlette):
+    yield
+    await pokemon_service.api_client.aclose()
+
+routes = [
+    Route('/', index),
+    Route('/battle', battle_page),
+    Route('/api/pokemon', get_pokemon_list),
+    Route('/api/export/pokemon', export_pokemon),
+    Route('/api/pokemon/batch', get_pokemon_batch, methods=['POST']),
+    Route('/api/pokemon/{pokemon_name}', get_pokemon_details),
+    Route('/api/search', search_pokemon),
+    Route('/api/search/suggest', suggest_pokemon),
+    Route('/api/stats', get_stats),
+    Route('/api/pokemon-list', get_pokemon_names),
+    Route('/api/battle/pokemon/{pokemon_name}', get_battle_pokemon),
+    Route('/api/battle/computer-action', get_computer_action, methods=['POST']),
+    Route('/api/battle/simulate', simulate_battle, methods=['POST']),
+    Route('/api/battle/batch', simulate_battle_batch, methods=['POST']),
+    Route('/api/battle/sessions', create_battle_session, methods=['POST']),
+    Route('/api/battle/sessions/{session_id}/turn', play_battle_turn, methods=['POST']),
+    Route('/api/battle/sessions/{session_id}', end_battle_session, methods=['DELETE']),
+    Route('/api/battle/tournament', get_tournament),
+    Route('/api/cache/stats', get_cache_stats),
+    Route('/sprites/sheet', get_sprite_sheet),
+    Route('/sprites/{pokemon_id:int}/{variant}', get_sprite),
+    WebSocketRoute('/ws', live_channel),
+    Mount('/static', StaticFiles(directory=BASE_DIR / 'static'), name='static'),
+]
+
+app = Starlette(
+    routes=routes,
+    middleware=[Middleware(CORSMiddleware, allow_origins=['*'])],
+    exception_handlers={404: not_found, 500: internal_error},
+    lifespan=lifespan
+)
+
+if __name__ == '__main__':
+    import uvicorn
+    
+    print("🎮 Starting Pokemon Viewer (ASGI)...")
+    print("📱 Open your browser and navigate to: http://localhost:5000")
+    print("🛑 Press Ctrl+C to stop the server\n")
+    
+    uvicorn.run(app, host='0.0.0.0', port=5000)
@@ -0,0 +1,190 @@
+import asyncio
+import httpx
+import json
+from typing import Callable, Dict, Optional, Tuple
+import config
+from cache import CacheBackend, CacheEntry, get_default_cache, make_cache_key
+from json_stream import parse_selected_async
+from payloads import POKEMON_DETAILS_SPEC, POKEMON_SPECIES_SPEC, trim_pokemon_details, trim_pokemon_species
+from pokemon_api import _global_circuit_breaker, _global_rate_limiter
+from rate_limiter import TokenBucket
+from resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+from single_flight import AsyncSingleFlight
+
+class AsyncPokeAPIClient:
+    """asyncio client for the PokeAPI with the same caching and trimming behaviour as PokeAPIClient"""
+    
+    def __init__(self, base_url: str = "https://pokeapi.co/api/v2", rate_limiter: Optional[TokenBucket] = None,
+                 cache: Optional[CacheBackend] = None, cache_ttl: float = config.CACHE_EXPIRY,
+                 trim_payloads: bool = config.TRIM_PAYLOADS,
+                 streaming_endpoints: Tuple[str, ...] = config.STREAMING_ENDPOINTS,
+                 max_connections: int = config.ASYNC_MAX_CONNECTIONS,
+                 max_keepalive_connections: int = config.ASYNC_MAX_KEEPALIVE_CONNECTIONS,
+                 retry_policy: Optional[RetryPolicy] = None, circuit_breaker: Optional[CircuitBreaker] = None):
+        self.base_url = base_url
+        # One pooled client for the whole process; connections are reused across requests
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(config.READ_TIMEOUT, connect=config.CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_keepalive_connections if config.HTTP_KEEP_ALIVE else 0,
+                                keepalive_expiry=config.HTTP_KEEPALIVE_EXPIRY)
+        )
+        # Excess requests queue here rather than in the connection pool, which rescans its whole
+        # queue on every release and would hit its pool timeout under thousands of waiters
+        self._connection_slots = asyncio.Semaphore(max_connections)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or _global_circuit_breaker
+        self.rate_limiter = rate_limiter or _global_rate_limiter
+        self.cache = cache if cache is not None else get_default_cache()
+        self.cache_ttl = cache_ttl
+        self.trim_payloads = trim_payloads
+        self.streaming_endpoints = set(streaming_endpoints) if trim_payloads else set()
+        self.single_flight = AsyncSingleFlight()
+    
+    async def aclose(self):
+        """Close pooled upstream connections"""
+        await self.client.aclose()
+    
+    async def _get_json(self, url: str, params: Optional[Dict] = None,
+                        extract: Optional[Callable[[Dict], Dict]] = None, stream_spec: Optional[Dict] = None) -> Dict:
+        """Return the decoded JSON body for a GET request; see PokeAPIClient._get_json"""
+        cache_key = make_cache_key(url, params)
+        entry = None
+        if self.cache is not None:
+            entry = self.cache.get(cache_key, allow_stale=True)
+            if entry is not None and not entry.is_expired:
+                return entry.value
+                
+        return await self.single_flight.do(
+            cache_key, lambda: self._fetch_json(cache_key, url, params, entry, extract, stream_spec)
+        )
+    
+    async def _fetch_json(self, cache_key: str, url: str, params: Optional[Dict], entry: Optional[CacheEntry],
+                          extract: Optional[Callable[[Dict], Dict]], stream_spec: Optional[Dict]) -> Dict:
+        """Download (or revalidate an expired `entry`) and store the result in the cache"""
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+                
+        async with self._connection_slots:
+            response = await self._send(url, params, headers)
+            etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+            try:
+                if response.status_code == 304 and entry is not None:
+                    data = entry.value
+                    size = entry.size
+                    # see PokeAPIClient._fetch_json: a 304 needn't repeat the validators
+                    etag, last_modified = etag or entry.etag, last_modified or entry.last_modified
+                else:
+                    response.raise_for_status()
+                    if stream_spec is not None:
+                        data = await parse_selected_async(response.aiter_bytes(16384), stream_spec)
+                        size = 0
+                    else:
+                        body = await response.aread()
+                        data = json.loads(body)
+                        size = len(body)
+                    if extract is not None:
+                        data = extract(data)
+                        size = len(json.dumps(data, separators=(',', ':')))
+            finally:
+                await response.aclose()
+        
+        if self.cache is not None:
+            self.cache.set(cache_key, data, ttl=self.cache_ttl, size=size, etag=etag, last_modified=last_modified)
+                           
+        return data
+    
+    async def _send(self, url: str, params: Optional[Dict], headers: Dict) -> httpx.Response:
+        """Send a streamed GET with the same retry and circuit breaker rules as PokeAPIClient._send"""
+        self.circuit_breaker.before_call()
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire_async()
+            request = self.client.build_request('GET', url, params=params, headers=headers)
+            try:
+                response = await self.client.send(request, stream=True)
+            except httpx.TransportError:
+                delay = self.retry_policy.backoff(attempt)
+                if delay is None:
+                    self.circuit_breaker.record_failure()
+                    raise
+            else:
+                if response.status_code not in self.retry_policy.status_codes:
+                    self.circuit_breaker.record_success()
+                    return response
+                delay = self.retry_policy.backoff(attempt, response.headers.get('Retry-After'))
+                if delay is None:
+                    self.circuit_breaker.record_failure()
+                    return response
+                await response.aclose()
+            
+            attempt += 1
+            await asyncio.sleep(delay)
+    
+    async def get_pokemon_list(self, limit: int = 20, offset: int = 0) -> Dict:
+        """
+        Get a paginated list of Pokemon
+        
+        Args:
+            limit: Number of Pokemon to fetch (default: 20)
+            offset: Starting position (default: 0)
+            
+        Returns:
+            Dict containing Pokemon list and pagination info
+        """
+        url = f"{self.base_url}/pokemon"
+        params = {"limit": limit, "offset": offset}
+        
+        try:
+            return await self._get_json(url, params=params)
+        except (httpx.HTTPError, CircuitOpenError) as e:
+            print(f"Error fetching Pokemon list: {e}")
+            return {"results": [], "count": 0, "next": None, "previous": None}
+    
+    async def get_pokemon_details(self, pokemon_name: str) -> Optional[Dict]:
+        """
+        Get detailed information about a specific Pokemon
+        
+        Args:
+            pokemon_name: Name or ID of the Pokemon
+            
+        Returns:
+            Dict containing Pokemon details or None if not found
+        """
+        url = f"{self.base_url}/pokemon/{pokemon_name.lower()}"
+        
+        try:
+            return await self._get_json(
+                url,
+                extract=trim_pokemon_details if self.trim_payloads else None,
+                stream_spec=POKEMON_DETAILS_SPEC if 'pokemon' in self.streaming_endpoints else None
+            )
+        except (httpx.HTTPError, CircuitOpenError) as e:
+            print(f"Error fetching Pokemon details for {pokemon_name}: {e}")
+            return None
+    
+    async def get_pokemon_species(self, pokemon_id: int) -> Optional[Dict]:
+        """
+        Get Pokemon species information for description
+        
+        Args:
+            pokemon_id: ID of the Pokemon
+            
+        Returns:
+            Dict containing species information or None if not found
+        """
+        url = f"{self.base_url}/pokemon-species/{pokemon_id}"
+        
+        try:
+            return await self._get_json(
+                url,
+                extract=trim_pokemon_species if self.trim_payloads else None,
+                stream_spec=POKEMON_SPECIES_SPEC if 'pokemon-species' in self.streaming_endpoints else None
+            )
+        except (httpx.HTTPError, CircuitOpenError) as e:
+            print(f"Error fetching Pokemon species for ID {pokemon_id}: {e}")
+            return None
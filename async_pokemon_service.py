@@ -0,0 +1,247 @@
+import asyncio
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from async_pokemon_api import AsyncPokeAPIClient
+from cursors import PageCursor
+from models import Pokemon, PaginationInfo
+from pokemon_service import PokemonService
+from search_index import AsyncSearchIndex, NameIndex
+from dex_index import DexIndexer, DexQuery
+from stat_store import StatStore, StatsQuery
+from urllib.parse import urlencode
+import numpy as np
+import config
+
+class AsyncPokemonService:
+    """asyncio counterpart of PokemonService, used by the ASGI app"""
+    
+    def __init__(self, page_size: int = 20, api_client: Optional[AsyncPokeAPIClient] = None):
+        self.api_client = api_client or AsyncPokeAPIClient()
+        self.page_size = page_size
+        self.search_index = AsyncSearchIndex(self._build_name_index)
+        self.dex_indexer = DexIndexer()
+    
+    async def load_pokemon_page(self, offset: int = 0, limit: Optional[int] = None) -> Tuple[List[Pokemon], PaginationInfo]:
+        """
+        Load a page of Pokemon
+        
+        Args:
+            offset: Starting position (default: 0)
+            limit: Number of Pokemon on the page (default: the service page size)
+            
+        Returns:
+            Tuple of (Pokemon list, pagination info)
+        """
+        if limit is None:
+            limit = self.page_size
+            
+        response, pagination_info = await self._fetch_listing(offset, limit)
+        
+        # Every detail and species request of the page is in flight at once; gather keeps list order
+        results = response.get('results', [])
+        loaded = await asyncio.gather(*(self._load_pokemon(pokemon_basic) for pokemon_basic in results))
+        
+        return [pokemon for pokemon in loaded if pokemon is not None], pagination_info
+    
+    async def stream_pokemon_page(self, offset: int = 0, limit: Optional[int] = None
+                                  ) -> Tuple[PaginationInfo, AsyncIterator[Tuple[int, Pokemon]]]:
+        """
+        Load a page of Pokemon, handing out each one as soon as it has loaded
+        
+        Returns:
+            Tuple of (pagination info, async iterator of (position on the page, Pokemon) in completion order)
+        """
+        if limit is None:
+            limit = self.page_size
+            
+        response, pagination_info = await self._fetch_listing(offset, limit)
+        return pagination_info, self._stream_loads(response.get('results', []))
+    
+    async def _stream_loads(self, results: List[Dict]) -> AsyncIterator[Tuple[int, Pokemon]]:
+        async def load(position: int, pokemon_basic: Dict) -> Tuple[int, Optional[Pokemon]]:
+            return position, await self._load_pokemon(pokemon_basic)
+            
+        tasks = [asyncio.ensure_future(load(position, pokemon_basic)) for position, pokemon_basic in enumerate(results)]
+        try:
+            for next_loaded in asyncio.as_completed(tasks):
+                position, pokemon = await next_loaded
+                if pokemon is not None:
+                    yield position, pokemon
+        finally:
+            # The consumer went away (e.g. a closed WebSocket); don't leave requests running for nobody
+            for task in tasks:
+                task.cancel()
+    
+    async def _fetch_listing(self, offset: int, limit: int) -> Tuple[Dict, PaginationInfo]:
+        """Fetch one /pokemon listing page; returns (response, pagination info)"""
+        response = await self.api_client.get_pokemon_list(limit=limit, offset=offset)
+        if response.get('count'):
+            self.dex_indexer.expected_count = response['count']
+            
+        pagination_info = PaginationInfo(
+            count=response.get('count', 0),
+            next_url=response.get('next'),
+            previous_url=response.get('previous'),
+            current_offset=offset,
+            current_limit=limit,
+            next_cursor=PokemonService._next_cursor(response, offset)
+        )
+        return response, pagination_info
+    
+    async def _load_pokemon(self, pokemon_basic: dict) -> Optional[Pokemon]:
+        pokemon_id = PokemonService._pokemon_id_from_url(pokemon_basic.get('url'))
+        if pokemon_id:
+            pokemon_details, species_data = await asyncio.gather(
+                self.api_client.get_pokemon_details(pokemon_basic['name']),
+                self.api_client.get_pokemon_species(pokemon_id)
+            )
+        else:
+            pokemon_details = await self.api_client.get_pokemon_details(pokemon_basic['name'])
+            species_data = None
+            if pokemon_details:
+                species_data = await self.api_client.get_pokemon_species(pokemon_details.get('id', 0))
+                
+        if not pokemon_details:
+            return None
+        self.dex_indexer.add(pokemon_details)
+        return PokemonService._build_pokemon(pokemon_details, species_data)
+    
+    async def load_pokemon_page_after(self, cursor: PageCursor,
+                                      limit: Optional[int] = None) -> Tuple[List[Pokemon], PaginationInfo]:
+        """Load the page of Pokemon following a cursor; see PokemonService.load_pokemon_page_after"""
+        pokemon_list, pagination_info = await self.load_pokemon_page(offset=await self.locate_cursor(cursor), limit=limit)
+        return [pokemon for pokemon in pokemon_list if pokemon.id > cursor.after_id], pagination_info
+    
+    async def locate_cursor(self, cursor: PageCursor) -> int:
+        """Current listing offset of the first Pokemon after `cursor`"""
+        index = await self.search_index.get()
+        return index.position_after(cursor.after_id) if index is not None and index.ids else cursor.offset
+    
+    async def export_pokemon(self, offset: int = 0, count: Optional[int] = None,
+                             chunk_size: int = config.EXPORT_CHUNK_SIZE) -> AsyncIterator[Pokemon]:
+        """Every Pokemon from `offset` on, in listing order; see PokemonService.export_pokemon"""
+        end = None if count is None else offset + count
+        
+        async def load_chunk(start: int) -> Tuple[Optional[Dict], List[Optional[Pokemon]]]:
+            limit = chunk_size if end is None else min(chunk_size, end - start)
+            if limit <= 0:
+                return None, []
+            response, _ = await self._fetch_listing(start, limit)
+            return response, await asyncio.gather(*(self._load_pokemon(pokemon_basic)
+                                                    for pokemon_basic in response.get('results', [])))
+            
+        task = asyncio.ensure_future(load_chunk(offset))
+        try:
+            while task is not None:
+                response, loaded = await task
+                offset += len(loaded)
+                # The next chunk loads while this one is sent
+                task = asyncio.ensure_future(load_chunk(offset)) if loaded and response.get('next') else None
+                for pokemon in loaded:
+                    if pokemon is not None:
+                        yield pokemon
+        finally:
+            if task is not None:
+                task.cancel()
+    
+    async def search_pokemon(self, name: str, match: bool = True) -> Optional[Pokemon]:
+        """
+        Search for a specific Pokemon by name
+        
+        Args:
+            name: Pokemon name to search for
+            match: Resolve prefixes and typos through the name index; see PokemonService
+            
+        Returns:
+            Pokemon object if found, None otherwise
+        """
+        name = name.strip().lower()
+        index = await self.search_index.get()
+        if index is not None:
+            name = index.resolve(name) if match else index.lookup(name)
+            if name is None:
+                return None
+                
+        pokemon_details = await self.api_client.get_pokemon_details(name)
+        if pokemon_details:
+            self.dex_indexer.add(pokemon_details)
+            species_data = await self.api_client.get_pokemon_species(pokemon_details.get('id', 0))
+            return PokemonService._build_pokemon(pokemon_details, species_data)
+            
+        return None
+    
+    async def get_many(self, names: List[str]) -> List[Tuple[Optional[Pokemon], bool, Optional[str]]]:
+        """Look up many Pokemon by exact name or ID at once; see PokemonService.get_many"""
+        index = await self.search_index.get()
+        queries = [PokemonService._exact_query(name, index) for name in names]
+        unique = list(dict.fromkeys(query for query in queries if query is not None))
+        
+        # Cached documents come back from the client without a request; the rest are fetched together
+        loaded = await asyncio.gather(*(self.search_pokemon(query, match=False) for query in unique),
+                                      return_exceptions=True)
+        results = {}
+        for query, pokemon in zip(unique, loaded):
+            if isinstance(pokemon, BaseException):
+                print(f"Error loading Pokemon {query}: {pokemon}")
+                results[query] = (None, False, 'Failed to fetch Pokemon')
+            else:
+                results[query] = (pokemon, False, None)
+                
+        return [results[query] if query is not None else (None, False, None) for query in queries]
+    
+    async def filter_pokemon(self, query: DexQuery, offset: int = 0,
+                             limit: Optional[int] = None) -> Tuple[List[Pokemon], PaginationInfo]:
+        """Filter and sort the Pokemon loaded so far; see PokemonService.filter_pokemon"""
+        if limit is None:
+            limit = self.page_size
+            
+        names, total = self.dex_indexer.get().query(query, offset, limit)
+        loaded = await asyncio.gather(*(self.search_pokemon(name, match=False) for name in names))
+        
+        params = query.to_params()
+        pagination_info = PaginationInfo(
+            count=total,
+            next_url=f"/api/pokemon?{urlencode(params + [('offset', offset + limit), ('limit', limit)])}"
+            if offset + limit < total else None,
+            previous_url=f"/api/pokemon?{urlencode(params + [('offset', max(0, offset - limit)), ('limit', limit)])}"
+            if offset > 0 else None,
+            current_offset=offset,
+            current_limit=limit
+        )
+        return [pokemon for pokemon in loaded if pokemon is not None], pagination_info
+    
+    def stats_report(self, query: StatsQuery) -> Dict:
+        """Aggregate stats over the Pokemon loaded so far; see PokemonService.stats_report"""
+        report = self.dex_indexer.get(StatStore).report(query)
+        report.update(indexed=len(self.dex_indexer), complete=self.dex_indexer.complete)
+        return report
+    
+    def battle_stats(self, pokemon_details: Dict) -> Optional[Dict[str, int]]:
+        """Base stats of a Pokemon from the columnar store; see PokemonService.battle_stats"""
+        self.dex_indexer.add(pokemon_details)
+        store = self.dex_indexer.peek(StatStore)
+        return store.battle_stats(pokemon_details['id']) if store is not None else None
+    
+    async def battle_roster(self, pokemon_set: str = '151') -> Tuple[List[str], np.ndarray]:
+        """Names and battle stats of a set of Pokemon; see PokemonService.battle_roster"""
+        if pokemon_set == 'indexed':
+            return self.dex_indexer.get(StatStore, fresh=True).battle_roster()
+            
+        pokemon_ids = range(1, 152)
+        missing = [pokemon_id for pokemon_id in pokemon_ids if pokemon_id not in self.dex_indexer]
+        for pokemon_details in await asyncio.gather(*(self.api_client.get_pokemon_details(str(pokemon_id))
+                                                      for pokemon_id in missing)):
+            if pokemon_details:
+                self.dex_indexer.add(pokemon_details)
+        return self.dex_indexer.get(StatStore, fresh=True).battle_roster(pokemon_ids)
+    
+    async def suggest_pokemon(self, query: str, limit: int = config.SEARCH_SUGGESTION_LIMIT) -> List[str]:
+        """Autocomplete Pokemon names from the local index; see PokemonService.suggest_pokemon"""
+        index = await self.search_index.get()
+        return index.suggest(query, limit) if index is not None else []
+    
+    async def _build_name_index(self) -> Optional[NameIndex]:
+        response = await self.api_client.get_pokemon_list(limit=config.SEARCH_INDEX_LIMIT, offset=0)
+        results = response.get('results', [])
+        if not results:
+            return None
+        return NameIndex((entry['name'], PokemonService._pokemon_id_from_url(entry.get('url'))) for entry in results)
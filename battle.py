@@ -0,0 +1,201 @@
+import random
+from typing import Dict, Optional
+
+# Shown to the player when the computer picks its next action
+ACTION_DESCRIPTIONS = {
+    'attack': "The opponent is preparing to attack!",
+    'defend': "The opponent is taking a defensive stance!",
+    'heal': "The opponent is focusing to recover!",
+    'special': "The opponent is charging up a special move!"
+}
+
+def battle_pokemon_from_details(pokemon_details: Dict, stats: Optional[Dict[str, int]] = None) -> Dict:
+    """
+    Build the battle representation of a Pokemon from its PokeAPI details
+    
+    Args:
+        pokemon_details: Pokemon details as returned by the API client
+        stats: Base stats already extracted (e.g. from the StatStore); parsed from the details if None
+        
+    Returns:
+        Dict with sprites, types, battle stats, up to 4 moves and fresh battle modifiers
+    """
+    # Extract stats for battle
+    if stats is None:
+        stats = {}
+        for stat in pokemon_details.get('stats', []):
+            stat_name = stat['stat']['name']
+            stat_value = stat['base_stat']
+            stats[stat_name] = stat_value
+        
+    # Get moves for special attacks
+    moves = []
+    for move_data in pokemon_details.get('moves', [])[:4]:  # Get first 4 moves
+        move_name = move_data['move']['name']
+        moves.append(move_name)
+        
+    return {
+        'id': pokemon_details.get('id'),
+        'name': pokemon_details.get('name', '').title(),
+        'sprite_url': pokemon_details.get('sprites', {}).get('front_default'),
+        'back_sprite_url': pokemon_details.get('sprites', {}).get('back_default'),
+        'types': [type_info['type']['name'] for type_info in pokemon_details.get('types', [])],
+        'stats': {
+            'hp': stats.get('hp', 50),
+            'attack': stats.get('attack', 50),
+            'defense': stats.get('defense', 50),
+            'special-attack': stats.get('special-attack', 50),
+            'special-defense': stats.get('special-defense', 50),
+            'speed': stats.get('speed', 50)
+        },
+        'moves': moves,
+        'defend_active': False,
+        'attack_multiplier': 1.0,
+        'defense_multiplier': 1.0
+    }
+
+def choose_computer_action(computer_pokemon: Dict, player_pokemon: Dict) -> Dict:
+    """
+    Pick the computer's next action with weighted randomness
+    
+    Args:
+        computer_pokemon: Battle state of the computer's Pokemon
+        player_pokemon: Battle state of the player's Pokemon
+        
+    Returns:
+        Dict with the chosen 'action' and its 'description'
+    """
+    # Calculate HP percentages for decision making
+    computer_hp_percent = computer_pokemon['current_hp'] / computer_pokemon['max_hp']
+    
+    # AI decision logic with weights
+    action_weights = {}
+    
+    # Always can attack
+    action_weights['attack'] = 40
+    
+    # Heal if low on HP (below 35%)
+    if computer_hp_percent < 0.35:
+        action_weights['heal'] = 50
+    else:
+        action_weights['heal'] = 10
+        
+    # Defend if player has high attack stats or computer is low on HP
+    player_attack = player_pokemon['stats']['attack']
+    if player_attack > computer_pokemon['stats']['defense'] or computer_hp_percent < 0.25:
+        action_weights['defend'] = 30
+    else:
+        action_weights['defend'] = 15
+        
+    # Special move if computer has good special attack
+    if computer_pokemon['stats']['special-attack'] > computer_pokemon['stats']['attack']:
+        action_weights['special'] = 35
+    else:
+        action_weights['special'] = 25
+        
+    # Don't heal if already at high HP
+    if computer_hp_percent > 0.8:
+        action_weights['heal'] = 5
+        
+    # Choose action based on weights
+    actions = list(action_weights.keys())
+    weights = list(action_weights.values())
+    
+    chosen_action = random.choices(actions, weights=weights, k=1)[0]
+    
+    return {
+        'action': chosen_action,
+        'description': ACTION_DESCRIPTIONS[chosen_action]
+    }
+
+def simulate_turn(action: str, attacker: Dict, defender: Dict) -> Dict:
+    """
+    Resolve one battle action
+    
+    Args:
+        action: One of 'attack', 'defend', 'heal' or 'special'
+        attacker: Battle state of the acting Pokemon
+        defender: Battle state of the opposing Pokemon
+        
+    Returns:
+        Dict describing the outcome (damage, new HP, battle log line); empty for unknown actions
+    """
+    result = {}
+    
+    if action == 'attack':
+        # Standard attack action
+        base_damage = attacker['stats']['attack'] * attacker.get('attack_multiplier', 1.0)
+        random_factor = random.randint(-5, 5)
+        defense = defender['stats']['defense'] * defender.get('defense_multiplier', 1.0)
+        
+        # Apply defend reduction if defender is defending
+        damage = max(1, int(base_damage + random_factor - defense))
+        if defender.get('defend_active', False):
+            damage = int(damage * 0.5)
+            result['defend_blocked'] = True
+            
+        new_hp = max(0, defender['current_hp'] - damage)
+        
+        result = {
+            'action': 'attack',
+            'damage': damage,
+            'new_hp': new_hp,
+            'is_fainted': new_hp <= 0,
+            'battle_log': f"{attacker['name']} used Tackle! It dealt {damage} damage to {defender['name']}!"
+        }
+        
+    elif action == 'defend':
+        # Defend action - sets up damage reduction for next turn
+        result = {
+            'action': 'defend',
+            'damage': 0,
+            'new_hp': defender['current_hp'],
+            'is_fainted': False,
+            'defend_active': True,
+            'battle_log': f"{attacker['name']} is defending! Incoming damage will be reduced next turn."
+        }
+        
+    elif action == 'heal':
+        # Heal action - restore 20% of max HP
+        heal_amount = int(attacker['max_hp'] * 0.2)
+        new_hp = min(attacker['max_hp'], attacker['current_hp'] + heal_amount)
+        actual_heal = new_hp - attacker['current_hp']
+        
+        result = {
+            'action': 'heal',
+            'damage': 0,
+            'heal_amount': actual_heal,
+            'new_hp': new_hp,
+            'is_fainted': False,
+            'battle_log': f"{attacker['name']} used Heal! Restored {actual_heal} HP."
+        }
+        
+    elif action == 'special':
+        # Special move - enhanced damage using special attack
+        base_damage = attacker['stats']['special-attack'] * attacker.get('attack_multiplier', 1.0)
+        random_factor = random.randint(-3, 8)  # Higher variance for special moves
+        defense = defender['stats']['special-defense'] * defender.get('defense_multiplier', 1.0)
+        
+        # Special moves do 1.3x damage
+        damage = max(1, int((base_damage + random_factor - defense) * 1.3))
+        if defender.get('defend_active', False):
+            damage = int(damage * 0.5)
+            result['defend_blocked'] = True
+            
+        new_hp = max(0, defender['current_hp'] - damage)
+        
+        # Get a random move name if available
+        move_name = "Special Attack"
+        if attacker.get('moves') and len(attacker['moves']) > 0:
+            move_name = attacker['moves'][random.randint(0, len(attacker['moves']) - 1)].replace('-', ' ').title()
+            
+        result = {
+            'action': 'special',
+            'damage': damage,
+            'new_hp': new_hp,
+            'is_fainted': new_hp <= 0,
+            'move_name': move_name,
+            'battle_log': f"{attacker['name']} used {move_name}! It dealt {damage} damage to {defender['name']}!"
+        }
+        
+    return result
@@ -0,0 +1,344 @@
+import random
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+import numpy as np
+import config
+
+# Same order as the weights in battle.choose_computer_action, so the cumulative thresholds match random.choices
+ACTIONS = ('attack', 'heal', 'defend', 'special')
+ATTACK_ROLLS = range(-5, 6)
+SPECIAL_ROLLS = range(-3, 9)
+# A uniform draw in [0, 132) reduced mod 11 or mod 12 is uniform over either roll table, so one draw serves both
+_ROLL_SPAN = len(ATTACK_ROLLS) * len(SPECIAL_ROLLS)
+# Outcome table entries per matchup: one block of rolls per action
+_OUTCOME_SLOTS = len(ACTIONS) * _ROLL_SPAN
+DAMAGE_PERCENTILES = (5, 25, 50, 75, 95)
+# Defense multiplier of a defending Pokemon, as BattleSession.play and the browser set it
+DEFEND_MULTIPLIER = 2.0
+# Defensive state of a move's target, indexing the outcome tables: after its own last action it is either
+# plain or defending; before its first action its incoming state (defend_active, defense_multiplier) applies
+_GUARD_NONE, _GUARD_DEFENDING, _GUARD_INCOMING = 0, 1, 2
+# Battle stats read from the request; max_hp and current_hp are checked separately
+_BOUNDED_STATS = ('attack', 'defense', 'special_attack', 'special_defense', 'speed')
+
+@dataclass(frozen=True)
+class Combatant:
+    """Battle-relevant numbers of one side, taken from a battle Pokemon dict"""
+    name: str
+    max_hp: int
+    current_hp: int
+    attack: int
+    defense: int
+    special_attack: int
+    special_defense: int
+    speed: int
+    # In-battle state carried into a simulation. Like the game, the engine resets a side's multipliers and
+    # defend stance when it starts an action, so they only matter until then: attack_multiplier never
+    # reaches a move, while defense_multiplier and defend_active guard against moves made before it acts
+    attack_multiplier: float = 1.0
+    defense_multiplier: float = 1.0
+    defend_active: bool = False
+    
+    @classmethod
+    def from_battle_pokemon(cls, pokemon: Dict) -> 'Combatant':
+        """
+        Build from the dict /api/battle/pokemon returns, optionally with the
+        browser's in-battle state (max_hp, current_hp, defend_active, multipliers)
+        
+        Raises:
+            ValueError: If stats are missing, not numbers or out of range (HP sizes per-HP lookup tables,
+                so it is capped at BATTLE_STAT_MAX)
+        """
+        try:
+            stats = pokemon['stats']
+            max_hp = int(pokemon.get('max_hp') or stats['hp'])
+            combatant = cls(
+                name=str(pokemon.get('name', '')),
+                max_hp=max_hp,
+                current_hp=int(pokemon.get('current_hp', max_hp)),
+                attack=int(stats['attack']),
+                defense=int(stats['defense']),
+                special_attack=int(stats['special-attack']),
+                special_defense=int(stats['special-defense']),
+                speed=int(stats.get('speed', 50)),
+                attack_multiplier=float(pokemon.get('attack_multiplier', 1.0)),
+                defense_multiplier=float(pokemon.get('defense_multiplier', 1.0)),
+                defend_active=bool(pokemon.get('defend_active', False))
+            )
+        except (KeyError, TypeError, ValueError, OverflowError) as e:
+            raise ValueError(f"Invalid battle Pokemon: {e}")
+        if not 1 <= combatant.max_hp <= config.BATTLE_STAT_MAX:
+            raise ValueError(f"Invalid battle Pokemon: max_hp must be between 1 and {config.BATTLE_STAT_MAX}")
+        if not 0 <= combatant.current_hp <= combatant.max_hp:
+            raise ValueError("Invalid battle Pokemon: current_hp must be between 0 and max_hp")
+        for stat in _BOUNDED_STATS:
+            if not 0 <= getattr(combatant, stat) <= config.BATTLE_STAT_MAX:
+                raise ValueError(f"Invalid battle Pokemon: {stat} must be between 0 and {config.BATTLE_STAT_MAX}")
+        for multiplier in ('attack_multiplier', 'defense_multiplier'):
+            # Also rejects NaN
+            if not 0 < getattr(combatant, multiplier) <= config.BATTLE_MULTIPLIER_MAX:
+                raise ValueError(f"Invalid battle Pokemon: {multiplier} must be above 0 and at most "
+                                 f"{config.BATTLE_MULTIPLIER_MAX}")
+        return combatant
+    
+    def damage_table(self, defender: 'Combatant', action: str, defense_multiplier: float = 1.0,
+                     defending: bool = False) -> np.ndarray:
+        """
+        Damage of an 'attack' or 'special' for every random roll, as battle.simulate_turn computes it
+        
+        The attacker's multipliers were reset when its action started, so its attack counts as is.
+        
+        Args:
+            defender: Target of the move
+            action: 'attack' or 'special'
+            defense_multiplier: Applied to the defender's defense (DEFEND_MULTIPLIER while it defends)
+            defending: Whether the defender's defend stance halves the damage
+        """
+        if action == 'attack':
+            damage = [max(1, int(self.attack + roll - defender.defense * defense_multiplier)) for roll in ATTACK_ROLLS]
+        else:
+            damage = [max(1, int((self.special_attack + roll - defender.special_defense * defense_multiplier) * 1.3))
+                      for roll in SPECIAL_ROLLS]
+        return np.array(damage, dtype=np.int32) // (2 if defending else 1)
+
+@dataclass(frozen=True)
+class BattleOutcomes:
+    """Per-battle results of a batch; side 0 is the player, side 1 the computer"""
+    player: Combatant
+    computer: Combatant
+    max_turns: int
+    # 0 or 1 for the side that won, -1 for a draw at max_turns
+    winner: np.ndarray
+    # Actions taken before the battle ended
+    turns: np.ndarray
+    # (2, battles) damage dealt by each side
+    damage: np.ndarray
+    
+    def summary(self, percentiles: Tuple[float, ...] = DAMAGE_PERCENTILES) -> Dict:
+        """Win rates, turn counts and damage distributions as returned by /api/battle/batch"""
+        battles = len(self.winner)
+        
+        def distribution(values: np.ndarray) -> Dict:
+            if not battles:
+                return {'mean': None, **{f"p{p:g}": None for p in percentiles}}
+            ranks = np.percentile(values, percentiles)
+            return {'mean': round(float(values.mean()), 2),
+                    **{f"p{p:g}": round(float(value), 2) for p, value in zip(percentiles, ranks)}}
+                    
+        sides = {}
+        for side, (label, combatant) in enumerate((('player', self.player), ('computer', self.computer))):
+            wins = int(np.count_nonzero(self.winner == side))
+            sides[label] = {
+                'name': combatant.name,
+                'wins': wins,
+                'win_rate': round(wins / battles, 4) if battles else None,
+                'damage_dealt': distribution(self.damage[side]),
+            }
+        draws = int(np.count_nonzero(self.winner < 0))
+        return {
+            'battles': battles,
+            'max_turns': self.max_turns,
+            **sides,
+            'draws': draws,
+            'draw_rate': round(draws / battles, 4) if battles else None,
+            'turns': {**distribution(self.turns), 'max': int(self.turns.max()) if battles else None},
+        }
+
+def run_battles(player: Combatant, computer: Combatant, battles: int, seed: Optional[int] = None,
+                max_turns: int = config.BATTLE_MAX_TURNS) -> BattleOutcomes:
+    """
+    Simulate `battles` independent full battles between two Pokemon
+    
+    Both sides follow the computer's weighted action choice
+    (battle.choose_computer_action) and actions resolve as in
+    battle.simulate_turn; the player acts first, as in the game, and the
+    sides then alternate. Defending doubles the defender's defense and halves the
+    damage of incoming moves until the defender acts again. The in-battle state
+    a side starts with (defend_active, multipliers) lasts until its first action.
+    
+    Args:
+        player: Side 0
+        computer: Side 1
+        battles: Number of battles
+        seed: Seed for numpy's default generator; the same seed gives the same outcomes
+        max_turns: Actions after which an unfinished battle is a draw
+        
+    Returns:
+        BattleOutcomes with one entry per battle
+    """
+    winner, turns, damage = play_matchups([(player, computer)], battles, np.random.default_rng(seed), max_turns)
+    return BattleOutcomes(player=player, computer=computer, max_turns=max_turns, winner=winner[0], turns=turns[0],
+                          damage=damage[:, 0])
+
+def play_matchups(matchups: Sequence[Tuple[Combatant, Combatant]], battles: int, rng: np.random.Generator,
+                  max_turns: int = config.BATTLE_MAX_TURNS) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Play `battles` battles of every (player, computer) matchup, all at once
+    
+    Rules are those of run_battles. All battles advance together, one action
+    per step, as NumPy operations over arrays of battle state; finished
+    battles are dropped from the arrays. Per-matchup tables are concatenated
+    and each battle indexes its own slice, so one call can cover many pairs.
+    
+    Args:
+        matchups: (player, computer) pairs
+        battles: Battles per matchup
+        rng: Random generator to draw from
+        max_turns: Actions after which an unfinished battle is a draw
+        
+    Returns:
+        (winner, turns, damage): winner is 0 (player), 1 (computer) or -1 (draw) and turns the
+        actions taken, both shaped (matchups, battles); damage dealt by each side is (2, matchups, battles)
+    """
+    count = len(matchups)
+    total_battles = count * battles
+    tables = (_SideTables(matchups), _SideTables([(computer, player) for player, computer in matchups]))
+    single = count == 1
+    
+    winner = np.full(total_battles, -1, dtype=np.int8)
+    turns = np.full(total_battles, max_turns, dtype=np.int32)
+    damage = np.zeros((2, total_battles), dtype=np.int32)
+    
+    # State of the battles still running
+    index = np.arange(total_battles)
+    pair = np.repeat(np.arange(count), battles)
+    hp = np.array([[player.current_hp for player, _ in matchups], [computer.current_hp for _, computer in matchups]],
+                  dtype=np.int32).repeat(battles, axis=1)
+    guard = np.full((2, total_battles), _GUARD_INCOMING, dtype=np.int8)
+    dealt = np.zeros((2, total_battles), dtype=np.int32)
+    
+    # A side already at 0 HP has lost before the first action
+    ended = (hp[0] <= 0) | (hp[1] <= 0)
+    if ended.any():
+        winner[ended] = np.where(hp[0][ended] <= 0, 1, 0)
+        turns[ended] = 0
+        running = ~ended
+        index, pair, hp, guard = index[running], pair[running], hp[:, running], guard[:, running]
+        dealt = dealt[:, running]
+        
+    for turn in range(1, max_turns + 1):
+        if not index.size:
+            break
+        actor, target = (turn - 1) % 2, turn % 2
+        side = tables[actor]
+        actor_hp = hp[actor]
+        row = actor_hp if single else side.offsets[pair] + actor_hp
+        
+        # Weighted action choice as random.choices draws it: attack below 40, then heal, defend, special
+        pick = rng.random(index.size) * side.total[row]
+        attacked = pick >= 40
+        past_heal = pick >= side.heal_cutoff[row]
+        past_defend = pick >= side.defend_cutoff[row]
+        
+        # Row of the outcome table: matchup, action block plus damage roll
+        slot = rng.integers(0, _ROLL_SPAN, index.size, dtype=np.int32)
+        slot += _ROLL_SPAN * attacked
+        slot += _ROLL_SPAN * past_heal
+        slot += _ROLL_SPAN * past_defend
+        if not single:
+            slot += _OUTCOME_SLOTS * pair
+        move_damage = side.outcomes[guard[target], slot]
+        
+        hp[target] = np.maximum(0, hp[target] - move_damage)
+        hp[actor] = np.where(attacked ^ past_heal, side.healed[row], actor_hp)
+        # A defend lasts until the defender's next action; the incoming state is gone once it has acted
+        guard[actor] = past_heal ^ past_defend
+        dealt[actor] += move_damage
+        
+        ended = hp[target] <= 0
+        if ended.any():
+            finished = index[ended]
+            winner[finished] = actor
+            turns[finished] = turn
+            damage[:, finished] = dealt[:, ended]
+            running = ~ended
+            index, pair, hp, guard = index[running], pair[running], hp[:, running], guard[:, running]
+            dealt = dealt[:, running]
+            
+    damage[:, index] = dealt
+    return winner.reshape(count, battles), turns.reshape(count, battles), damage.reshape(2, count, battles)
+
+class _SideTables:
+    """
+    Lookup tables of one side (player or computer) across matchups
+    
+    Action cutoffs and HP after a heal are indexed by `offsets[matchup] + current HP`;
+    move damage by `[target guard state, matchup * _OUTCOME_SLOTS + slot]`.
+    """
+    
+    def __init__(self, sides: Sequence[Tuple[Combatant, Combatant]]):
+        """
+        Args:
+            sides: (this side, its opponent) per matchup
+        """
+        cutoffs = [_action_cutoffs(side, opponent) for side, opponent in sides]
+        lengths = [len(table[0]) for table in cutoffs]
+        self.offsets = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int32)
+        self.heal_cutoff, self.defend_cutoff, self.total, self.healed = (
+            np.concatenate([table[column] for table in cutoffs]) for column in range(4))
+        self.outcomes = np.stack([np.concatenate([_move_damage(side, opponent, guard) for side, opponent in sides])
+                                  for guard in (_GUARD_NONE, _GUARD_DEFENDING, _GUARD_INCOMING)])
+
+def _action_cutoffs(side: Combatant, opponent: Combatant) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Cumulative action weights of battle.choose_computer_action and the result of healing, for every HP value of `side`
+    
+    Returns:
+        (attack + heal, attack + heal + defend, total weight, HP after healing), each indexed by current HP
+    """
+    heal_cutoffs, defend_cutoffs, totals, healed = [], [], [], []
+    heal_amount = int(side.max_hp * 0.2)
+    for current_hp in range(side.max_hp + 1):
+        hp_percent = current_hp / side.max_hp
+        heal = 50 if hp_percent < 0.35 else 10
+        defend = 30 if opponent.attack > side.defense or hp_percent < 0.25 else 15
+        special = 35 if side.special_attack > side.attack else 25
+        if hp_percent > 0.8:
+            heal = 5
+        heal_cutoffs.append(40 + heal)
+        defend_cutoffs.append(40 + heal + defend)
+        totals.append(40 + heal + defend + special)
+        healed.append(min(side.max_hp, current_hp + heal_amount))
+    return (np.array(heal_cutoffs), np.array(defend_cutoffs), np.array(totals, dtype=np.float64),
+            np.array(healed, dtype=np.int32))
+
+def _move_damage(side: Combatant, opponent: Combatant, guard: int) -> np.ndarray:
+    """Damage against an opponent in `guard` state per (action, roll) slot: ACTIONS order, _ROLL_SPAN slots each"""
+    if guard == _GUARD_INCOMING:
+        defense_multiplier, defending = opponent.defense_multiplier, opponent.defend_active
+    else:
+        defending = guard == _GUARD_DEFENDING
+        defense_multiplier = DEFEND_MULTIPLIER if defending else 1.0
+    attack = side.damage_table(opponent, 'attack', defense_multiplier, defending)
+    special = side.damage_table(opponent, 'special', defense_multiplier, defending)
+    slots = np.arange(_ROLL_SPAN)
+    return np.concatenate([
+        attack[slots % len(ATTACK_ROLLS)],
+        np.zeros(_ROLL_SPAN, dtype=np.int32),
+        np.zeros(_ROLL_SPAN, dtype=np.int32),
+        special[slots % len(SPECIAL_ROLLS)],
+    ])
+
+def batch_options(data: Dict) -> Tuple[int, int, int]:
+    """
+    Read battles, seed and max_turns from an /api/battle/batch request body
+    
+    A missing seed is drawn at random, so every response names the seed that reproduces it.
+    
+    Raises:
+        ValueError: On non-integer values or a battle count outside 1..BATTLE_BATCH_MAX
+    """
+    try:
+        battles = int(data.get('battles', config.BATTLE_BATCH_DEFAULT))
+        seed = data.get('seed')
+        seed = int(seed) if seed is not None else random.randrange(2 ** 32)
+        max_turns = int(data.get('max_turns', config.BATTLE_MAX_TURNS))
+    except (TypeError, ValueError):
+        raise ValueError("'battles', 'seed' and 'max_turns' must be integers")
+    if not 1 <= battles <= config.BATTLE_BATCH_MAX:
+        raise ValueError(f"'battles' must be between 1 and {config.BATTLE_BATCH_MAX}")
+    if seed < 0:
+        raise ValueError("'seed' must not be negative")
+    if not 1 <= max_turns <= config.BATTLE_MAX_TURNS:
+        raise ValueError(f"'max_turns' must be between 1 and {config.BATTLE_MAX_TURNS}")
+    return battles, seed, max_turns
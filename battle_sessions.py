@@ -0,0 +1,177 @@
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import config
+from battle import choose_computer_action, simulate_turn
+
+# Sides of a session battle
+PLAYER, COMPUTER = 0, 1
+SIDE_NAMES = ('player', 'computer')
+ACTIONS = ('attack', 'defend', 'heal', 'special')
+
+# simulate_turn result fields sent back with each turn
+RESULT_FIELDS = ('action', 'damage', 'heal_amount', 'move_name', 'defend_blocked', 'battle_log')
+
+class BattleSession:
+    """
+    Server-held state of one player vs computer battle
+    
+    The player always moves first; after each player action the computer's
+    next action is chosen and kept here until the client asks for it to be
+    played, so the client can show it ahead of time without deciding it.
+    """
+    
+    __slots__ = ('sides', 'turn', 'next_side', 'computer_action', 'winner', 'touched')
+    
+    def __init__(self, player: Dict, computer: Dict):
+        """
+        Args:
+            player, computer: Battle Pokemon as battle_pokemon_from_details returns them
+        """
+        # Only what the battle rules read; sprites and types stay with the client
+        self.sides = tuple({'name': pokemon['name'], 'stats': dict(pokemon['stats']), 'moves': list(pokemon.get('moves', [])),
+                            'max_hp': pokemon['stats']['hp'], 'current_hp': pokemon['stats']['hp'],
+                            'defend_active': False, 'attack_multiplier': 1.0, 'defense_multiplier': 1.0}
+                           for pokemon in (player, computer))
+        self.turn = 0
+        self.next_side: Optional[int] = PLAYER
+        self.computer_action: Optional[Dict] = None
+        self.winner: Optional[int] = None
+        self.touched = time.monotonic()
+    
+    def play(self, side: int, action: str) -> Dict:
+        """
+        Resolve one action of `side` and return what changed
+        
+        Returns:
+            Dict with the turn number, the action result, both sides' HP and whose turn is next,
+            plus the computer's chosen action when it moves next and the winner once decided
+        """
+        attacker, defender = self.sides[side], self.sides[1 - side]
+        
+        # A defend stance lasts until the defender's own next action
+        attacker['defend_active'] = False
+        attacker['attack_multiplier'] = 1.0
+        attacker['defense_multiplier'] = 1.0
+        
+        result = simulate_turn(action, attacker, defender)
+        if action == 'heal':
+            attacker['current_hp'] = result['new_hp']
+        elif action == 'defend':
+            attacker['defend_active'] = True
+            attacker['defense_multiplier'] = 2.0
+        else:
+            defender['current_hp'] = result['new_hp']
+            
+        self.turn += 1
+        self.computer_action = None
+        if result.get('is_fainted'):
+            self.winner, self.next_side = side, None
+        else:
+            self.next_side = 1 - side
+            if self.next_side == COMPUTER:
+                self.computer_action = choose_computer_action(self.sides[COMPUTER], self.sides[PLAYER])
+                
+        delta = {
+            'turn': self.turn,
+            'result': {field: result[field] for field in RESULT_FIELDS if field in result},
+            'hp': {name: pokemon['current_hp'] for name, pokemon in zip(SIDE_NAMES, self.sides)},
+            'next': SIDE_NAMES[self.next_side] if self.next_side is not None else None,
+        }
+        if self.computer_action:
+            delta['computer_action'] = self.computer_action
+        if self.winner is not None:
+            delta['winner'] = SIDE_NAMES[self.winner]
+        return delta
+
+class BattleSessionStore:
+    """
+    Battle sessions keyed by an unguessable ID, expiring after `ttl` idle seconds
+    
+    Sessions are kept in least recently used order, so expired ones are
+    dropped from the front on each access and the oldest one makes room
+    when `max_sessions` are open.
+    """
+    
+    def __init__(self, ttl: float = config.BATTLE_SESSION_TTL, max_sessions: int = config.BATTLE_SESSION_MAX):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._lock = threading.Lock()
+        self._sessions: 'OrderedDict[str, BattleSession]' = OrderedDict()
+        self.created = 0
+        self.expired = 0
+        self.evicted = 0
+    
+    def __len__(self) -> int:
+        return len(self._sessions)
+    
+    def create(self, player: Dict, computer: Dict) -> Tuple[str, BattleSession]:
+        """Open a battle between two battle Pokemon; returns (session ID, session)"""
+        session = BattleSession(player, computer)
+        session_id = secrets.token_urlsafe(16)
+        with self._lock:
+            self._expire(session.touched)
+            while len(self._sessions) >= self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evicted += 1
+            self._sessions[session_id] = session
+            self.created += 1
+        return session_id, session
+    
+    def play(self, session_id: str, action: Optional[str] = None) -> Optional[Dict]:
+        """
+        Play the player's `action`, or the computer's chosen action if `action` is None
+        
+        Returns:
+            Turn delta (see BattleSession.play), or None if the session doesn't exist or expired
+            
+        Raises:
+            ValueError: If it isn't that side's turn, the battle is over or the action is unknown
+        """
+        with self._lock:
+            session = self._touch(session_id)
+            if session is None:
+                return None
+            if session.next_side is None:
+                raise ValueError("The battle is over")
+                
+            if action is None:
+                if session.next_side != COMPUTER:
+                    raise ValueError("It is the player's turn")
+                return session.play(COMPUTER, session.computer_action['action'])
+                
+            if session.next_side != PLAYER:
+                raise ValueError("It is the computer's turn")
+            if action not in ACTIONS:
+                raise ValueError(f"'action' must be one of {', '.join(ACTIONS)}")
+            return session.play(PLAYER, action)
+    
+    def end(self, session_id: str) -> bool:
+        """Close a session; returns False if it didn't exist"""
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+    
+    def stats(self) -> Dict:
+        """Open, created, expired and evicted session counts"""
+        with self._lock:
+            self._expire(time.monotonic())
+            return {'open': len(self._sessions), 'created': self.created, 'expired': self.expired, 'evicted': self.evicted}
+    
+    def _touch(self, session_id: str) -> Optional[BattleSession]:
+        now = time.monotonic()
+        self._expire(now)
+        session = self._sessions.get(session_id)
+        if session is not None:
+            session.touched = now
+            self._sessions.move_to_end(session_id)
+        return session
+    
+    def _expire(self, now: float):
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if now - session.touched < self.ttl:
+                break
+            del self._sessions[session_id]
+            self.expired += 1
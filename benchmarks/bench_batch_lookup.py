@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: loading a team of Pokemon, one GET per Pokemon vs one /api/pokemon/batch request
+
+Loads the same team through the Flask app of web_app.py against the stub
+PokeAPI, first with empty caches (a new service per run) and then warm. The
+per-Pokemon mode sends GET /api/pokemon/<name> once per team member, one after
+the other, as a page without a batch endpoint has to; the batch mode sends a
+single POST. --rtt adds a simulated client round trip to every request, so
+the total shows what a browser on a slow link would wait.
+
+Usage:
+    python benchmarks/bench_batch_lookup.py --team-size 6 --latency 0.05 --rtt 0.05 --runs 5
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stub_server import StubDex, StubPokeAPI
+from cache import MemoryCache
+from http_cache import ResponseCache
+from pokemon_api import PokeAPIClient
+from pokemon_service import PokemonService
+from rate_limiter import TokenBucket
+import web_app
+
+def fresh_service(stub: StubPokeAPI) -> PokemonService:
+    client = PokeAPIClient(base_url=stub.base_url, rate_limiter=TokenBucket(rate=0), cache=MemoryCache())
+    service = PokemonService(page_size=12, api_client=client, prefetch=False)
+    # Build the name index up front so both modes pay the same for it
+    service.search_index.get()
+    return service
+
+def one_by_one(client, team, rtt: float) -> int:
+    for pokemon_id in team:
+        time.sleep(rtt)
+        assert client.get(f'/api/pokemon/{pokemon_id}').status_code == 200
+    return len(team)
+
+def batch(client, team, rtt: float) -> int:
+    time.sleep(rtt)
+    response = client.post('/api/pokemon/batch', json={'pokemon': team})
+    assert all(result['found'] for result in response.get_json()['results'])
+    return 1
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--team-size", type=int, default=6)
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub PokeAPI latency per request (seconds)")
+    parser.add_argument("--rtt", type=float, default=0.05, help="Simulated client round trip per API request (seconds)")
+    parser.add_argument("--runs", type=int, default=5, help="Teams loaded per mode")
+    args = parser.parse_args()
+    
+    with StubPokeAPI(StubDex(count=args.team_size * args.runs), latency=args.latency) as stub:
+        client = web_app.app.test_client()
+        print(f"{'mode':<14} {'caches':<6} {'round trips':>12} {'median ms':>10}")
+        for mode, load in (('one by one', one_by_one), ('batch', batch)):
+            cold, warm = [], []
+            for run in range(args.runs):
+                team = list(range(run * args.team_size + 1, (run + 1) * args.team_size + 1))
+                web_app.pokemon_service = fresh_service(stub)
+                web_app.response_cache = ResponseCache()
+                for times in (cold, warm):
+                    start = time.perf_counter()
+                    round_trips = load(client, team, args.rtt)
+                    times.append(time.perf_counter() - start)
+            for caches, times in (('cold', cold), ('warm', warm)):
+                print(f"{mode:<14} {caches:<6} {round_trips:>12} {statistics.median(times) * 1000:>10.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark: full-battle throughput, vectorized batch engine vs turn-by-turn Python
+
+Draws random matchups with base stats in the ranges real Pokemon have and
+runs the same number of battles for each with battle_engine.run_battles
+(what /api/battle/batch uses) and with a loop over
+battle.choose_computer_action / battle.simulate_turn, the functions behind
+the one-turn-per-request endpoints. Win rates of the two are printed side
+by side as a sanity check. A parity check then starts both from random
+mid-battle states (HP, defend stance, multipliers) and exits with an error
+when a seeded batch's win rate is off the Python loop's by more than
+sampling noise.
+
+Usage:
+    python benchmarks/bench_battle_batch.py --matchups 20 --battles 100000 --check-states 10
+"""
+
+import argparse
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from battle import choose_computer_action, simulate_turn
+from battle_engine import Combatant, run_battles
+import config
+
+# (low, high) base stat ranges, roughly those of the real dex
+STAT_RANGES = {'hp': (20, 160), 'attack': (20, 135), 'defense': (20, 160),
+               'special-attack': (20, 155), 'special-defense': (20, 130), 'speed': (15, 140)}
+
+def random_pokemon(rng: random.Random, name: str):
+    return {'name': name, 'moves': [], 'defend_active': False, 'attack_multiplier': 1.0, 'defense_multiplier': 1.0,
+            'stats': {stat: rng.randint(low, high) for stat, (low, high) in STAT_RANGES.items()}}
+
+def mid_battle(rng: random.Random, pokemon):
+    """The Pokemon part way through a battle: some HP lost, maybe defending, with multipliers carried over"""
+    hp = pokemon['stats']['hp']
+    defending = rng.random() < 0.5
+    return dict(pokemon, max_hp=hp, current_hp=rng.randint(1, hp), defend_active=defending,
+                defense_multiplier=2.0 if defending else rng.choice((1.0, 1.5)),
+                attack_multiplier=rng.choice((1.0, 2.0, 3.0)))
+
+def python_battle(player, computer, max_turns: int) -> int:
+    """One battle turn by turn with the endpoint functions; returns the winning side or -1"""
+    sides = [dict(pokemon, max_hp=pokemon.get('max_hp', pokemon['stats']['hp']),
+                  current_hp=pokemon.get('current_hp', pokemon['stats']['hp'])) for pokemon in (player, computer)]
+    for turn in range(1, max_turns + 1):
+        # The player always moves first
+        actor, target = (turn - 1) % 2, turn % 2
+        # As BattleSession.play: modifiers and a defend stance last until the side's own next action
+        sides[actor].update(defend_active=False, attack_multiplier=1.0, defense_multiplier=1.0)
+        action = choose_computer_action(sides[actor], sides[target])['action']
+        result = simulate_turn(action, sides[actor], sides[target])
+        if action in ('attack', 'special'):
+            sides[target]['current_hp'] = result['new_hp']
+        elif action == 'heal':
+            sides[actor]['current_hp'] = result['new_hp']
+        else:
+            sides[actor].update(defend_active=True, defense_multiplier=2.0)
+        if sides[target]['current_hp'] <= 0:
+            return actor
+    return -1
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--matchups", type=int, default=20)
+    parser.add_argument("--battles", type=int, default=100000, help="Battles per matchup for the batch engine")
+    parser.add_argument("--python-battles", type=int, default=500, help="Battles per matchup for the Python loop")
+    parser.add_argument("--max-turns", type=int, default=config.BATTLE_MAX_TURNS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--check-states", type=int, default=10, help="Mid-battle states in the parity check")
+    parser.add_argument("--check-battles", type=int, default=2000, help="Python battles per parity check state")
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    batch_time = python_time = 0.0
+    batch_turns = 0
+    print(f"{'matchup':<12} {'batch win/draw':>16} {'python win/draw':>16} {'mean turns':>11}")
+    for number in range(args.matchups):
+        player, computer = random_pokemon(rng, f"a{number}"), random_pokemon(rng, f"b{number}")
+        
+        start = time.perf_counter()
+        outcomes = run_battles(Combatant.from_battle_pokemon(player), Combatant.from_battle_pokemon(computer),
+                               args.battles, seed=number, max_turns=args.max_turns)
+        batch_time += time.perf_counter() - start
+        batch_turns += int(outcomes.turns.sum())
+        
+        start = time.perf_counter()
+        winners = [python_battle(player, computer, args.max_turns) for _ in range(args.python_battles)]
+        python_time += time.perf_counter() - start
+        
+        print(f"{number:<12} {(outcomes.winner == 0).mean():>9.3f}/{(outcomes.winner < 0).mean():.3f} "
+              f"{winners.count(0) / len(winners):>9.3f}/{winners.count(-1) / len(winners):.3f} "
+              f"{outcomes.turns.mean():>11.1f}")
+              
+    batch_rate = args.matchups * args.battles / batch_time
+    python_rate = args.matchups * args.python_battles / python_time
+    print(f"\nbatch engine: {batch_rate:12,.0f} battles/s ({batch_turns / batch_time:,.0f} actions/s)")
+    print(f"python loop:  {python_rate:12,.0f} battles/s  ({batch_rate / python_rate:,.0f}x slower)")
+    
+    print(f"\n{'mid-battle':<12} {'batch win':>10} {'python win':>11} {'limit':>7}")
+    failures = 0
+    for number in range(args.check_states):
+        player = mid_battle(rng, random_pokemon(rng, f"c{number}"))
+        computer = mid_battle(rng, random_pokemon(rng, f"d{number}"))
+        outcomes = run_battles(Combatant.from_battle_pokemon(player), Combatant.from_battle_pokemon(computer),
+                               args.battles, seed=args.seed + number, max_turns=args.max_turns)
+        batch_win = float((outcomes.winner == 0).mean())
+        winners = [python_battle(player, computer, args.max_turns) for _ in range(args.check_battles)]
+        python_win = winners.count(0) / len(winners)
+        # Five standard errors of the difference, plus a little slack for win rates near 0 or 1
+        share = (batch_win + python_win) / 2
+        limit = 5 * math.sqrt(share * (1 - share) * (1 / args.battles + 1 / args.check_battles)) + 0.005
+        failed = abs(batch_win - python_win) > limit
+        failures += failed
+        print(f"{number:<12} {batch_win:>10.3f} {python_win:>11.3f} {limit:>7.3f}{'  MISMATCH' if failed else ''}")
+    if failures:
+        raise SystemExit(f"{failures} of {args.check_states} mid-battle states differ from battle.simulate_turn play")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-turn request size and server time, stateless battle endpoints vs sessions
+
+Plays the same number of battles through the Flask app (in process, no
+network) twice: the old way, where every turn POSTs both battle Pokemon to
+/api/battle/computer-action and /api/battle/simulate, and with a server-side
+session, where a turn POSTs only the action to /api/battle/sessions/<id>/turn.
+Battle Pokemon are loaded once from the local stub PokeAPI before timing.
+Reports bytes sent and received per turn and the time spent in the view
+functions per turn (request parsing, battle rules and JSON encoding, without
+the test client's own overhead).
+
+Usage:
+    python benchmarks/bench_battle_sessions.py --battles 200
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stub_server import StubDex, StubPokeAPI
+from pokemon_api import PokeAPIClient
+from pokemon_service import PokemonService
+from rate_limiter import TokenBucket
+import web_app
+
+# Seconds spent inside the timed view functions
+view_seconds = []
+
+def timed_view(view):
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return view(*args, **kwargs)
+        finally:
+            view_seconds.append(time.perf_counter() - start)
+    return wrapper
+
+def post(client, url: str, body, stats):
+    payload = json.dumps(body).encode()
+    response = client.post(url, data=payload, content_type='application/json')
+    stats['request_bytes'] += len(payload)
+    stats['response_bytes'] += len(response.data)
+    return response.get_json()
+
+def stateless_battle(client, player, computer, stats):
+    """One battle the way the browser played it before sessions: full state in every request"""
+    sides = [dict(pokemon, max_hp=pokemon['stats']['hp'], current_hp=pokemon['stats']['hp']) for pokemon in (player, computer)]
+    for turn in range(web_app.config.BATTLE_MAX_TURNS):
+        stats['turns'] += 1
+        actor, target = turn % 2, 1 - turn % 2
+        if actor == 0:
+            action = random.choice(('attack', 'defend', 'heal', 'special'))
+        else:
+            action = post(client, '/api/battle/computer-action',
+                          {'computer_pokemon': sides[1], 'player_pokemon': sides[0]}, stats)['action']
+        sides[actor].update(defend_active=False, attack_multiplier=1.0, defense_multiplier=1.0)
+        result = post(client, '/api/battle/simulate', {'action': action, 'attacker': sides[actor], 'defender': sides[target]}, stats)
+        if action == 'heal':
+            sides[actor]['current_hp'] = result['new_hp']
+        elif action == 'defend':
+            sides[actor].update(defend_active=True, defense_multiplier=2.0)
+        else:
+            sides[target]['current_hp'] = result['new_hp']
+            if result['is_fainted']:
+                return
+
+def session_battle(client, player, computer, stats):
+    """One battle through a server-side session: only the action travels"""
+    response = client.post('/api/battle/sessions', json={'player': player['id'], 'computer': computer['id']})
+    session_id = response.get_json()['session_id']
+    delta = {'next': 'player', 'turn': 0}
+    while delta['next'] and delta['turn'] < web_app.config.BATTLE_MAX_TURNS:
+        body = {'action': random.choice(('attack', 'defend', 'heal', 'special'))} if delta['next'] == 'player' else {}
+        delta = post(client, f'/api/battle/sessions/{session_id}/turn', body, stats)
+        stats['turns'] += 1
+    client.delete(f'/api/battle/sessions/{session_id}')
+
+def report(label: str, stats, battles: int):
+    turns = stats['turns']
+    print(f"{label:<10} {turns / battles:>11.1f} {stats['request_bytes'] / turns:>10.0f} "
+          f"{stats['response_bytes'] / turns:>10.0f} {sum(view_seconds) / turns * 1e6:>13.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--battles", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    with StubPokeAPI(StubDex(count=50), latency=0) as stub:
+        client = PokeAPIClient(base_url=stub.base_url, rate_limiter=TokenBucket(rate=0))
+        web_app.pokemon_service = PokemonService(page_size=12, api_client=client, prefetch=False)
+        app_client = web_app.app.test_client()
+        for endpoint in ('get_computer_action', 'simulate_battle', 'play_battle_turn'):
+            web_app.app.view_functions[endpoint] = timed_view(web_app.app.view_functions[endpoint])
+        roster = [app_client.get(f'/api/battle/pokemon/{pokemon_id}').get_json() for pokemon_id in range(1, 51)]
+        
+        rng = random.Random(args.seed)
+        pairs = [rng.sample(roster, 2) for _ in range(args.battles)]
+        print(f"{'per turn':<10} {'turns/battle':>11} {'sent':>10} {'received':>10} {'view time us':>13}")
+        for label, battle in (('stateless', stateless_battle), ('session', session_battle)):
+            random.seed(args.seed)
+            view_seconds.clear()
+            stats = {'turns': 0, 'request_bytes': 0, 'response_bytes': 0}
+            for player, computer in pairs:
+                battle(app_client, player, computer, stats)
+            report(label, stats, args.battles)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: bytes on the wire and server CPU per response, by body layout and content coding
+
+Builds /api/pokemon pages and the /api/pokemon-list body from stub PokeAPI
+documents (no server involved) in three layouts: pretty-printed JSON (what
+jsonify sent in debug mode), the compact object-per-Pokemon body and the
+format=columns body. Each is sent identity, gzip and, when the brotli
+package is installed, br. CPU is the time to compress one body, and the
+time to answer from a RenderedResponse whose variants are already built.
+
+Usage:
+    python benchmarks/bench_compression.py --page-sizes 12 50 --repeat 200
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from api_responses import encode_json, pokemon_columns_body, pokemon_page_body, pagination_fields
+from benchmarks.stub_server import StubDex
+from compression import available_encodings, compress
+from http_cache import RenderedResponse, content_etag
+from models import PaginationInfo
+from pokemon_service import PokemonService
+
+BASE_URL = "http://stub/api/v2"
+
+def timed(fn, repeat: int) -> float:
+    """Mean microseconds per call"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+def bodies(dex: StubDex, page_size: int):
+    pokemon_list = [PokemonService._build_pokemon(dex.pokemon(pokemon_id, BASE_URL), dex.species(pokemon_id, BASE_URL))
+                    for pokemon_id in range(1, page_size + 1)]
+    pagination_info = PaginationInfo(count=dex.count, next_url=f"{BASE_URL}/pokemon?offset={page_size}", previous_url=None,
+                                     current_offset=0, current_limit=page_size)
+    pretty = {'pokemon': [pokemon.to_dict() for pokemon in pokemon_list],
+              'pagination': pagination_fields(pagination_info, len(pokemon_list))}
+    return [
+        (f"page {page_size}, pretty", json.dumps(pretty, indent=2).encode()),
+        (f"page {page_size}, objects", pokemon_page_body(pokemon_list, pagination_info)),
+        (f"page {page_size}, columns", pokemon_columns_body(pokemon_list, pagination_info)),
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[12, 50])
+    parser.add_argument("--repeat", type=int, default=200, help="Timed repetitions per measurement")
+    args = parser.parse_args()
+    
+    dex = StubDex(count=max(151, max(args.page_sizes)))
+    names = {'pokemon': [dex.names[index] for index in range(151)]}
+    cases = [body for page_size in args.page_sizes for body in bodies(dex, page_size)]
+    cases += [("pokemon-list, pretty", json.dumps(names, indent=2).encode()), ("pokemon-list, compact", encode_json(names))]
+    
+    encodings = available_encodings()
+    if 'br' not in encodings:
+        print("brotli is not installed: br is skipped\n")
+    print(f"{'body':<24} {'coding':<8} {'bytes':>8} {'compress µs':>12} {'cached µs':>10}")
+    for label, body in cases:
+        rendered = RenderedResponse(body, content_etag(body))
+        rendered.precompress()
+        print(f"{label:<24} {'identity':<8} {len(body):>8,} {'-':>12} "
+              f"{timed(lambda: rendered.response_parts(None, 'identity'), args.repeat):>10.1f}")
+        for encoding in encodings:
+            compress_time = timed(lambda: compress(body, encoding), args.repeat)
+            cached_time = timed(lambda: rendered.response_parts(None, encoding), args.repeat)
+            print(f"{'':<24} {encoding:<8} {len(rendered.encoded(encoding)):>8,} {compress_time:>12.1f} {cached_time:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark: filtered and sorted dex queries, attribute index vs a linear scan
+
+Builds a DexIndex over synthetic Pokemon details (1k and 100k records by
+default) and times a mix of type, ability and stat range filters with
+different sort orders, as /api/pokemon?type=fire&min_speed=100&sort=-base_experience
+would issue them. The same queries are answered by scanning and sorting
+the raw records for comparison.
+
+Usage:
+    python benchmarks/bench_dex_filters.py --sizes 1000 100000
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dex_index import STAT_FIELDS, DexIndex, DexQuery
+
+TYPES = ('normal', 'fire', 'water', 'grass', 'electric', 'ice', 'fighting', 'poison', 'ground',
+         'flying', 'psychic', 'bug', 'rock', 'ghost', 'dragon', 'dark', 'steel', 'fairy')
+
+QUERIES = (
+    DexQuery(types=('fire',), ranges=(('speed', 100, None),), sort='-base_experience'),
+    DexQuery(types=('water', 'ice')),
+    DexQuery(ranges=(('attack', 120, None), ('defense', None, 60)), sort='-attack'),
+    DexQuery(abilities=('ability-7',), sort='name'),
+    DexQuery(ranges=(('hp', 50, 80),), sort='speed'),
+    DexQuery(sort='-weight'),
+)
+
+def synthetic_details(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    for pokemon_id in range(1, count + 1):
+        yield {
+            'id': pokemon_id,
+            'name': f"pokemon-{rng.randrange(16 ** 8):08x}-{pokemon_id}",
+            'height': rng.randint(1, 200),
+            'weight': rng.randint(1, 9999),
+            'base_experience': rng.randint(30, 400),
+            'types': [{'type': {'name': name}} for name in rng.sample(TYPES, rng.randint(1, 2))],
+            'abilities': [{'ability': {'name': f"ability-{rng.randint(1, 300)}"}} for _ in range(rng.randint(1, 3))],
+            'stats': [{'base_stat': rng.randint(5, 255), 'stat': {'name': stat}} for stat in STAT_FIELDS],
+        }
+
+def scan(details, query: DexQuery, limit: int):
+    """Reference implementation: filter and sort the raw documents"""
+    matches = []
+    for document in details:
+        types = {info['type']['name'] for info in document['types']}
+        abilities = {info['ability']['name'] for info in document['abilities']}
+        values = {stat['stat']['name']: stat['base_stat'] for stat in document['stats']}
+        values.update(id=document['id'], height=document['height'], weight=document['weight'],
+                      base_experience=document['base_experience'])
+        if not all(name in types for name in query.types) or not all(name in abilities for name in query.abilities):
+            continue
+        if any((low is not None and values[field] < low) or (high is not None and values[field] > high)
+               for field, low, high in query.ranges):
+            continue
+        matches.append((values, document['name']))
+        
+    field = query.sort.lstrip('-')
+    matches.sort(key=(lambda match: match[1]) if field == 'name' else (lambda match: match[0][field]),
+                 reverse=query.sort.startswith('-'))
+    return [name for _, name in matches[:limit]], len(matches)
+
+def time_calls(fn, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs of each query")
+    parser.add_argument("--limit", type=int, default=12)
+    args = parser.parse_args()
+    
+    for size in args.sizes:
+        details = list(synthetic_details(size))
+        start = time.perf_counter()
+        index = DexIndex(details)
+        build = time.perf_counter() - start
+        
+        indexed, scanned = [], []
+        for query in QUERIES:
+            names, total = index.query(query, 0, args.limit)
+            expected, expected_total = scan(details, query, args.limit)
+            if total != expected_total or len(names) != len(expected):
+                raise SystemExit(f"Mismatch for {query}: {total} vs {expected_total} matches")
+            indexed += time_calls(lambda: index.query(query, 0, args.limit), args.repeat)
+            scanned += time_calls(lambda: scan(details, query, args.limit), max(1, args.repeat // 10))
+            
+        print(f"{size:>7} records  build={build:6.2f}s  "
+              f"index p50={statistics.median(indexed) * 1000:7.3f}ms max={max(indexed) * 1000:7.3f}ms  "
+              f"scan p50={statistics.median(scanned) * 1000:8.2f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory and time of bulk export, streamed NDJSON vs one JSON array
+
+Exports growing ranges of the stub dex through PokemonService.export_pokemon
+(what /api/export/pokemon streams) and, for comparison, loads the same range
+page by page into one list and encodes it as a single JSON array, as a
+non-streaming endpoint would have to. Peak traced memory above what the
+export leaves behind (the dex index keeps every loaded Pokemon either way)
+should stay flat for the stream and grow with the range for the array.
+
+Usage:
+    python benchmarks/bench_export.py --counts 100 500 2000 --latency 0
+"""
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from api_responses import pokemon_page_body
+from benchmarks.stub_server import StubDex, StubPokeAPI
+from cache import MemoryCache
+from models import PaginationInfo
+from pokemon_api import PokeAPIClient
+from pokemon_service import PokemonService
+from rate_limiter import TokenBucket
+import config
+
+def fresh_service(stub: StubPokeAPI) -> PokemonService:
+    # A small upstream cache, so what is measured is the export itself rather than cached documents
+    client = PokeAPIClient(base_url=stub.base_url, rate_limiter=TokenBucket(rate=0), cache=MemoryCache(max_entries=64))
+    return PokemonService(page_size=config.MAX_PAGE_SIZE, api_client=client, prefetch=False)
+
+def stream_export(service: PokemonService, count: int) -> int:
+    size = 0
+    for pokemon in service.export_pokemon(0, count):
+        size += len(pokemon.to_json()) + 1
+    return size
+
+def array_export(service: PokemonService, count: int) -> int:
+    pokemon_list = []
+    for offset in range(0, count, config.MAX_PAGE_SIZE):
+        page, _ = service._fetch_page(offset, min(config.MAX_PAGE_SIZE, count - offset), log=False)
+        pokemon_list.extend(page)
+    body = pokemon_page_body(pokemon_list, PaginationInfo(count=count, next_url=None, previous_url=None,
+                                                          current_offset=0, current_limit=count))
+    return len(body)
+
+def measure(export, stub: StubPokeAPI, count: int):
+    """(seconds, body bytes, transient peak bytes, retained bytes)"""
+    service = fresh_service(stub)
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    size = export(service, count)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    retained = current - base
+    return elapsed, size, peak - base - retained, retained
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--latency", type=float, default=0.0, help="Stub PokeAPI latency per request (seconds)")
+    args = parser.parse_args()
+    
+    with StubPokeAPI(StubDex(count=max(args.counts)), latency=args.latency) as stub:
+        # The stub builds each document on first request and keeps it; do that before anything is measured
+        stream_export(fresh_service(stub), max(args.counts))
+        
+        print(f"{'Pokemon':>8} {'mode':<8} {'seconds':>8} {'body KB':>9} {'peak KB':>9} {'retained KB':>12}")
+        for count in args.counts:
+            for mode, export in (('stream', stream_export), ('array', array_export)):
+                elapsed, size, peak, retained = measure(export, stub, count)
+                print(f"{count:>8} {mode:<8} {elapsed:>8.2f} {size / 1024:>9.0f} {peak / 1024:>9.0f} {retained / 1024:>12.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cost of repeat API requests with the rendered response cache and ETags
+
+Warms the service caches of web_app.py against the stub PokeAPI, then times
+repeat GETs of a page, a Pokemon and a battle Pokemon through the Flask test
+client three ways: with the rendered response cache off (the body is
+re-encoded and re-hashed every time), served from the rendered response
+cache, and revalidated with If-None-Match (304, no body).
+
+Usage:
+    python benchmarks/bench_http_cache.py --requests 2000
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stub_server import StubDex, StubPokeAPI
+from cache import MemoryCache
+from http_cache import ResponseCache
+from pokemon_api import PokeAPIClient
+from pokemon_service import PokemonService
+from rate_limiter import TokenBucket
+import web_app
+
+URLS = ('/api/pokemon?page=2&limit=12', '/api/pokemon/25', '/api/battle/pokemon/25')
+
+def measure(url: str, count: int, headers=None):
+    """Median microseconds of request dispatch (no WSGI or test client overhead) and body bytes per request"""
+    times, size = [], 0
+    for _ in range(count):
+        with web_app.app.test_request_context(url, headers=headers):
+            start = time.perf_counter()
+            response = web_app.app.full_dispatch_request()
+            times.append(time.perf_counter() - start)
+        size = len(response.get_data())
+    return statistics.median(times) * 1e6, size
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per URL and mode")
+    args = parser.parse_args()
+    
+    with StubPokeAPI(StubDex(count=200), latency=0.0) as stub:
+        api_client = PokeAPIClient(base_url=stub.base_url, rate_limiter=TokenBucket(rate=0), cache=MemoryCache())
+        web_app.pokemon_service = PokemonService(page_size=12, api_client=api_client, prefetch=False)
+        client = web_app.app.test_client()
+        
+        print(f"{'url':<30} {'mode':<18} {'median µs':>10} {'body bytes':>11}")
+        for url in URLS:
+            etag = client.get(url).headers['ETag']
+            
+            web_app.response_cache = ResponseCache(ttl=0)
+            rows = [('no response cache', measure(url, args.requests))]
+            web_app.response_cache = ResponseCache()
+            client.get(url)
+            rows.append(('response cache', measure(url, args.requests)))
+            rows.append(('If-None-Match 304', measure(url, args.requests, {'If-None-Match': etag})))
+            
+            for mode, (micros, size) in rows:
+                print(f"{url:<30} {mode:<18} {micros:>10.0f} {size:>11,}")
+
+if __name__ == "__main__":
+    main()
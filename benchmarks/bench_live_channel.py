@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark: time to first card and battle turn latency, HTTP vs the /ws live channel
+
+Serves web_app.py on a local port (werkzeug, threaded) against the stub
+PokeAPI and loads uncached pages both ways: GET /api/pokemon, where the
+first card can only be drawn once the whole page has arrived, and a `page`
+message on /ws, where cards arrive as each Pokemon loads. Then plays battle
+turns through a session over HTTP (one keep-alive request per turn) and
+over the open WebSocket.
+
+Usage:
+    python benchmarks/bench_live_channel.py --pages 10 --latency 0.05 --turns 200
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import requests
+from websockets.sync.client import connect
+from werkzeug.serving import make_server
+
+from benchmarks.stub_server import StubDex, StubPokeAPI
+from cache import MemoryCache
+from pokemon_api import PokeAPIClient
+from pokemon_service import PokemonService
+from rate_limiter import TokenBucket
+import web_app
+
+PAGE_SIZE = 12
+
+def use_fresh_service(stub: StubPokeAPI):
+    """Point the app at the stub with empty caches, so every page is loaded from upstream"""
+    client = PokeAPIClient(base_url=stub.base_url, rate_limiter=TokenBucket(rate=0), cache=MemoryCache())
+    web_app.pokemon_service = PokemonService(page_size=PAGE_SIZE, api_client=client, prefetch=False)
+
+def http_pages(base_url: str, pages):
+    first, full = [], []
+    with requests.Session() as session:
+        for page in pages:
+            start = time.perf_counter()
+            session.get(f"{base_url}/api/pokemon", params={'page': page, 'limit': PAGE_SIZE}).json()
+            full.append(time.perf_counter() - start)
+            first.append(full[-1])
+    return first, full
+
+def socket_pages(ws_url: str, pages):
+    first, full = [], []
+    with connect(ws_url) as ws:
+        for message_id, page in enumerate(pages):
+            start = time.perf_counter()
+            ws.send(json.dumps({'id': message_id, 'type': 'page', 'page': page, 'limit': PAGE_SIZE}))
+            while True:
+                message = json.loads(ws.recv())
+                if message['type'] == 'pokemon' and len(first) == len(full):
+                    first.append(time.perf_counter() - start)
+                if message['type'] in ('done', 'error'):
+                    break
+            full.append(time.perf_counter() - start)
+    return first, full
+
+def http_turns(base_url: str, turns: int):
+    latencies = []
+    with requests.Session() as session:
+        while len(latencies) < turns:
+            session_id = session.post(f"{base_url}/api/battle/sessions", json={'player': 1, 'computer': 2}).json()['session_id']
+            delta = {'next': 'player'}
+            while delta.get('next') and len(latencies) < turns:
+                body = {'action': random.choice(('attack', 'special'))} if delta['next'] == 'player' else {}
+                start = time.perf_counter()
+                delta = session.post(f"{base_url}/api/battle/sessions/{session_id}/turn", json=body).json()
+                latencies.append(time.perf_counter() - start)
+    return latencies
+
+def socket_turns(ws_url: str, turns: int):
+    latencies = []
+    with connect(ws_url) as ws:
+        while len(latencies) < turns:
+            ws.send(json.dumps({'id': 0, 'type': 'battle_start', 'player': 1, 'computer': 2}))
+            session_id = json.loads(ws.recv())['session_id']
+            delta = {'next': 'player'}
+            while delta.get('next') and len(latencies) < turns:
+                message = {'id': 1, 'type': 'turn', 'session_id': session_id}
+                if delta['next'] == 'player':
+                    message['action'] = random.choice(('attack', 'special'))
+                start = time.perf_counter()
+                ws.send(json.dumps(message))
+                delta = json.loads(ws.recv())
+                latencies.append(time.perf_counter() - start)
+    return latencies
+
+def ms(values) -> str:
+    return f"p50={statistics.median(values) * 1000:7.1f}ms p95={statistics.quantiles(values, n=20)[-1] * 1000:7.1f}ms"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub PokeAPI latency per request in seconds")
+    parser.add_argument("--turns", type=int, default=200)
+    args = parser.parse_args()
+    
+    pages = list(range(1, args.pages + 1))
+    with StubPokeAPI(StubDex(count=PAGE_SIZE * args.pages), latency=args.latency) as stub:
+        server = make_server('127.0.0.1', 0, web_app.app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_port}"
+        ws_url = f"ws://127.0.0.1:{server.server_port}/ws"
+        try:
+            use_fresh_service(stub)
+            http_first, http_full = http_pages(base_url, pages)
+            use_fresh_service(stub)
+            socket_first, socket_full = socket_pages(ws_url, pages)
+            print(f"first card  http {ms(http_first)}   ws {ms(socket_first)}")
+            print(f"full page   http {ms(http_full)}   ws {ms(socket_full)}")
+            
+            random.seed(0)
+            print(f"battle turn http {ms(http_turns(base_url, args.turns))}   ws {ms(socket_turns(ws_url, args.turns))}")
+        finally:
+            server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory footprint of the Pokemon model
+
+Builds N instances (with descriptions) of the previous plain dataclass
+and of the current frozen, slotted Pokemon, and reports the traced
+allocation size of each, plus the cost of caching pre-encoded JSON.
+
+Usage:
+    python benchmarks/bench_model_memory.py --count 10000
+"""
+
+import argparse
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models import Pokemon
+
+@dataclass
+class LegacyPokemon:
+    """The previous models.Pokemon definition, kept for comparison"""
+    id: int
+    name: str
+    height: int
+    weight: int
+    types: List[str]
+    abilities: List[str]
+    base_experience: int
+    sprite_url: Optional[str] = None
+    description: Optional[str] = None
+
+def make_fields(index: int) -> dict:
+    # Build fresh strings per instance, as decoding API responses would
+    return dict(
+        id=index,
+        name=f"Pokemon{index}",
+        height=index % 40,
+        weight=index % 2000,
+        base_experience=index % 300,
+        sprite_url=f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{index}.png",
+        description=f"Pokemon number {index} is a synthetic entry with a typical Pokedex-length description.",
+    )
+
+def measure(label: str, build):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    print(f"{label:<36} {size / 1024 / 1024:8.2f} MB  ({size / len(objects):6.0f} B/instance)")
+    return size
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=10000)
+    args = parser.parse_args()
+    
+    types = ["grass", "poison"]
+    abilities = ["overgrow", "chlorophyll"]
+    
+    def build_legacy():
+        return [LegacyPokemon(types=list(types), abilities=list(abilities), **make_fields(i))
+                for i in range(args.count)]
+    
+    def build_slotted():
+        return [Pokemon(types=tuple(types), abilities=tuple(abilities), **make_fields(i))
+                for i in range(args.count)]
+    
+    def build_slotted_encoded():
+        objects = build_slotted()
+        for pokemon in objects:
+            pokemon.to_json()
+        return objects
+    
+    print(f"\n{args.count} Pokemon instances")
+    legacy = measure("plain @dataclass (before)", build_legacy)
+    slotted = measure("frozen slotted Pokemon (after)", build_slotted)
+    measure("after + cached JSON bytes", build_slotted_encoded)
+    print(f"\nSlotted model saves {(legacy - slotted) / 1024 / 1024:.2f} MB ({(1 - slotted / legacy) * 100:.0f}%)")
+
+if __name__ == "__main__":
+    main()
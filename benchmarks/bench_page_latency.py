@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark: page latency of PokemonService.load_pokemon_page
+
+Compares the old one-at-a-time loop (details, species, sleep 0.1s per
+Pokemon) with the concurrent fan-out against a local stub PokeAPI and
+prints p50/p95 page latency for both.
+
+Usage:
+    python benchmarks/bench_page_latency.py --pages 20 --latency 0.05
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stub_server import StubDex, StubPokeAPI
+from models import Pokemon
+from pokemon_api import PokeAPIClient
+from pokemon_service import PokemonService
+from rate_limiter import TokenBucket
+import config
+
+def load_page_sequential(client: PokeAPIClient, offset: int, page_size: int):
+    """The pre-concurrency implementation of load_pokemon_page, kept for comparison"""
+    response = client.get_pokemon_list(limit=page_size, offset=offset)
+    pokemon_list = []
+    for pokemon_basic in response.get('results', []):
+        pokemon_details = client.get_pokemon_details(pokemon_basic['name'])
+        if pokemon_details:
+            pokemon = Pokemon.from_api_response(pokemon_details)
+            client.get_pokemon_species(pokemon.id)
+            pokemon_list.append(pokemon)
+        time.sleep(0.1)
+    return pokemon_list
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+def report(label, samples):
+    print(f"{label:<28} p50={percentile(samples, 0.50) * 1000:8.1f}ms  "
+          f"p95={percentile(samples, 0.95) * 1000:8.1f}ms  mean={statistics.mean(samples) * 1000:8.1f}ms")
+
+def time_concurrent_pages(stub, limiter, args):
+    service = PokemonService(page_size=args.page_size,
+                             api_client=PokeAPIClient(base_url=stub.base_url, rate_limiter=limiter))
+    samples = []
+    for page in range(args.pages):
+        start = time.perf_counter()
+        service.load_pokemon_page(offset=page * args.page_size)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--page-size", type=int, default=12)
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub upstream latency in seconds")
+    args = parser.parse_args()
+    
+    with StubPokeAPI(StubDex(), latency=args.latency) as stub:
+        # Unlimited limiter for the sequential path: its politeness came from the sleeps
+        sequential_client = PokeAPIClient(base_url=stub.base_url, rate_limiter=TokenBucket(rate=0))
+        before = []
+        for page in range(args.pages):
+            start = time.perf_counter()
+            load_page_sequential(sequential_client, page * args.page_size, args.page_size)
+            before.append(time.perf_counter() - start)
+        
+        limiter = TokenBucket.from_delay(config.REQUEST_DELAY, capacity=config.RATE_LIMIT_BURST)
+        after = time_concurrent_pages(stub, limiter, args)
+        unlimited = time_concurrent_pages(stub, TokenBucket(rate=0), args)
+    
+    print(f"\n{args.pages} pages of {args.page_size}, stub latency {args.latency * 1000:.0f}ms, "
+          f"REQUEST_DELAY={config.REQUEST_DELAY}s, burst={config.RATE_LIMIT_BURST}")
+    report("sequential + sleep (before)", before)
+    report("concurrent + limiter (after)", after)
+    report("concurrent, limiter off", unlimited)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Next-page latency with and without adjacent page prefetching
+
+Simulates a user browsing the dex page by page: load a page, spend
+--think seconds looking at it, press Next. Every --jump-every pages the
+user jumps to a random page instead, which must cancel the queued
+prefetch. Reports page latency and the prefetcher's hit rate.
+
+Usage:
+    python benchmarks/bench_prefetch.py --pages 30 --think 0.5 --latency 0.05
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stub_server import StubDex, StubPokeAPI
+from cache import MemoryCache
+from pokemon_api import PokeAPIClient
+from pokemon_service import PokemonService
+from rate_limiter import TokenBucket
+
+PAGE_SIZE = 12
+DEX_COUNT = 1300
+
+def browse(stub: StubPokeAPI, args, prefetch: bool):
+    client = PokeAPIClient(base_url=stub.base_url, rate_limiter=TokenBucket(rate=0), cache=MemoryCache())
+    service = PokemonService(page_size=PAGE_SIZE, api_client=client, prefetch=prefetch)
+    rng = random.Random(0)
+    latencies = []
+    
+    _, pagination_info = service.load_pokemon_page(offset=0)
+    for step in range(1, args.pages + 1):
+        time.sleep(args.think)
+        start = time.perf_counter()
+        if args.jump_every and step % args.jump_every == 0:
+            page = rng.randint(1, pagination_info.total_pages)
+            _, pagination_info = service.load_pokemon_page(offset=(page - 1) * PAGE_SIZE)
+        else:
+            _, pagination_info = service.load_next_page(pagination_info)
+        latencies.append(time.perf_counter() - start)
+        
+    stats = service.prefetcher.stats() if service.prefetcher is not None else None
+    if service.prefetcher is not None:
+        service.prefetcher.shutdown()
+    return latencies, stats
+
+def report(label: str, latencies, stats):
+    ordered = sorted(latencies)
+    print(f"{label:<12} p50={statistics.median(ordered) * 1000:7.2f}ms  mean={statistics.fmean(ordered) * 1000:7.2f}ms  "
+          f"max={ordered[-1] * 1000:7.2f}ms")
+    if stats is not None:
+        print(f"{'':<12} prefetch: issued={stats['issued']} completed={stats['completed']} hits={stats['hits']} "
+              f"late={stats['late']} not_stored={stats['failed']} cancelled={stats['cancelled']} hit_rate={stats['hit_rate']}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=30, help="Page turns per run")
+    parser.add_argument("--think", type=float, default=0.5, help="Seconds spent on each page before moving on")
+    parser.add_argument("--jump-every", type=int, default=5, help="Jump to a random page every N turns (0: never)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub upstream latency in seconds")
+    args = parser.parse_args()
+    
+    with StubPokeAPI(StubDex(count=DEX_COUNT, moves_per_pokemon=4, flavor_entries=3), latency=args.latency) as stub:
+        print(f"{args.pages} page turns, think time {args.think * 1000:.0f}ms, jump every {args.jump_every}, "
+              f"stub latency {args.latency * 1000:.0f}ms")
+        # The service logs every page load; keep the report readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            without = browse(stub, args, prefetch=False)
+            with_prefetch = browse(stub, args, prefetch=True)
+        report("no prefetch", *without)
+        report("prefetch", *with_prefetch)
+
+if __name__ == "__main__":
+    main()
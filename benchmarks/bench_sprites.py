@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark: loading a page of sprites from the origin, through the /sprites proxy and as one sheet
+
+Fetches the sprites of one grid page (12 Pokemon by default) from the stub
+sprite origin directly, as the cards used to, and through the Flask app of
+web_app.py: one /sprites/<id>/front request per card with an empty sprite
+store, again from the store on disk after a restart, revalidated with
+If-None-Match, and as a single /sprites/sheet request. --rtt adds a simulated
+client round trip to every request the browser would make. Thumbnails and
+sheets need Pillow; without it those rows are skipped.
+
+Usage:
+    python benchmarks/bench_sprites.py --page-size 12 --latency 0.1 --rtt 0.03
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import requests
+from benchmarks.stub_server import StubDex, StubPokeAPI
+from sprites import SpriteStore, thumbnails_available
+import web_app
+
+def timed(fn, rtt: float, count: int):
+    """(milliseconds, bytes received) of `count` requests made by fn(index)"""
+    start, size = time.perf_counter(), 0
+    for index in range(count):
+        time.sleep(rtt)
+        size += fn(index)
+    return (time.perf_counter() - start) * 1000, size
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--page-size", type=int, default=12)
+    parser.add_argument("--latency", type=float, default=0.1, help="Stub sprite origin latency per request (seconds)")
+    parser.add_argument("--rtt", type=float, default=0.03, help="Simulated client round trip per request (seconds)")
+    args = parser.parse_args()
+    
+    ids = list(range(1, args.page_size + 1))
+    sheet_url = '/sprites/sheet?ids=' + ','.join(map(str, ids))
+    with StubPokeAPI(StubDex(count=args.page_size), latency=args.latency) as stub, tempfile.TemporaryDirectory() as directory:
+        client = web_app.app.test_client()
+        session = requests.Session()
+        etags = {}
+        
+        def origin(index: int) -> int:
+            return len(session.get(f"{stub.sprite_base_url}/{ids[index]}.png").content)
+        
+        def proxied(index: int, headers=None, size: str = '') -> int:
+            response = client.get(f'/sprites/{ids[index]}/front{size}', headers=headers)
+            etags[index] = response.headers['ETag']
+            return len(response.data)
+        
+        def sheet(index: int) -> int:
+            return len(client.get(sheet_url).data)
+        
+        def restart(store_directory: str):
+            web_app.sprite_store = SpriteStore(directory=store_directory, base_url=stub.sprite_base_url)
+            stub.reset_counters()
+            
+        rows = []
+        restart(directory)
+        rows.append(('origin, per sprite', args.page_size, *timed(origin, args.rtt, args.page_size), stub.total_requests))
+        restart(directory)
+        rows.append(('proxy, empty store', args.page_size, *timed(proxied, args.rtt, args.page_size), stub.total_requests))
+        restart(directory)
+        rows.append(('proxy, from disk', args.page_size, *timed(proxied, args.rtt, args.page_size), stub.total_requests))
+        rows.append(('proxy, 304', args.page_size, *timed(lambda index: proxied(index, {'If-None-Match': etags[index]}),
+                                                          args.rtt, args.page_size), stub.total_requests))
+        if thumbnails_available():
+            rows.append(('proxy, size=48', args.page_size, *timed(lambda index: proxied(index, size='?size=48'),
+                                                                  args.rtt, args.page_size), stub.total_requests))
+            with tempfile.TemporaryDirectory() as sheet_directory:
+                restart(sheet_directory)
+                rows.append(('sheet, empty store', 1, *timed(sheet, args.rtt, 1), stub.total_requests))
+                restart(sheet_directory)
+                rows.append(('sheet, from disk', 1, *timed(sheet, args.rtt, 1), stub.total_requests))
+        else:
+            print("Pillow is not installed: thumbnails and sheets are skipped\n")
+            
+        print(f"{'mode':<20} {'requests':>9} {'ms':>8} {'bytes':>8} {'upstream requests':>18}")
+        for mode, count, millis, size, upstream in rows:
+            print(f"{mode:<20} {count:>9} {millis:>8.0f} {size:>8,} {upstream:>18}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /api/pokemon tail latency across cache expiry, with and without stale serving
+
+Drives the Flask endpoint with a steady stream of requests for a few hot
+pages while the cache TTL is short, so entries keep expiring during the
+run. With MAX_STALENESS at 0 every expiry puts a full upstream page load
+on some request's path; with stale-while-revalidate that reload happens on
+the background refresh pool and request latency stays flat.
+
+Usage:
+    python benchmarks/bench_stale_latency.py --ttl 1 --duration 10 --latency 0.05
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stub_server import StubDex, StubPokeAPI
+from cache import MemoryCache
+from pokemon_api import PokeAPIClient
+from pokemon_service import PokemonService
+from rate_limiter import TokenBucket
+import web_app
+
+PAGE_SIZE = 12
+
+def run(stub: StubPokeAPI, args, max_staleness: float):
+    client = PokeAPIClient(base_url=stub.base_url, rate_limiter=TokenBucket(rate=0),
+                           cache=MemoryCache(), cache_ttl=args.ttl)
+    service = PokemonService(page_size=PAGE_SIZE, api_client=client, cache_ttl=args.ttl, max_staleness=max_staleness)
+    web_app.pokemon_service = service
+    test_client = web_app.app.test_client()
+    rng = random.Random(0)
+    
+    # Warm every page once so the run only measures behaviour around expiry
+    for page in range(1, args.pages + 1):
+        test_client.get(f'/api/pokemon?page={page}&limit={PAGE_SIZE}')
+        
+    latencies = []
+    stale = 0
+    deadline = time.perf_counter() + args.duration
+    while time.perf_counter() < deadline:
+        page = rng.randint(1, args.pages)
+        start = time.perf_counter()
+        data = test_client.get(f'/api/pokemon?page={page}&limit={PAGE_SIZE}').get_json()
+        latencies.append(time.perf_counter() - start)
+        stale += data['pagination']['stale']
+        
+    service.refresh_executor.shutdown(wait=True)
+    return latencies, stale
+
+def report(label: str, latencies, stale: int):
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))]
+    print(f"{label:<22} requests={len(ordered):6d}  p50={statistics.median(ordered) * 1000:7.2f}ms  "
+          f"p99={p99 * 1000:7.2f}ms  max={ordered[-1] * 1000:7.2f}ms  served stale={stale}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ttl", type=float, default=1.0, help="Cache TTL in seconds")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to drive each configuration")
+    parser.add_argument("--pages", type=int, default=4, help="Distinct hot pages")
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub upstream latency in seconds")
+    args = parser.parse_args()
+    
+    with StubPokeAPI(StubDex(count=args.pages * PAGE_SIZE), latency=args.latency) as stub:
+        print(f"TTL {args.ttl}s, {args.pages} pages, stub latency {args.latency * 1000:.0f}ms, "
+              f"{args.duration:.0f}s per configuration")
+        # The service logs every page load; keep the report readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            blocking = run(stub, args, max_staleness=0)
+            revalidating = run(stub, args, max_staleness=60)
+        report("refresh on request", *blocking)
+        report("stale-while-revalidate", *revalidating)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /api/stats aggregates, columnar NumPy store vs loops over the documents
+
+Builds a StatStore over synthetic Pokemon details (1k and 100k records by
+default) and times the full report behind /api/stats (summaries with
+percentiles, top 10 and per-type averages for every stat), with and
+without a type filter. The same report is computed by looping over the
+raw documents in Python for comparison.
+
+Usage:
+    python benchmarks/bench_stat_store.py --sizes 1000 100000
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_dex_filters import synthetic_details, time_calls
+from stat_store import STAT_COLUMNS, StatsQuery, StatStore
+
+QUERIES = (
+    StatsQuery(),
+    StatsQuery(types=('fire',)),
+    StatsQuery(stats=('speed',), types=('water', 'ice'), percentiles=(50, 99), top=5),
+)
+
+def loop_report(details, query: StatsQuery):
+    """Reference implementation: loop over the documents, then over the selection per stat"""
+    selected = []
+    for document in details:
+        types = {info['type']['name'] for info in document['types']}
+        if all(name in types for name in query.types):
+            values = {stat['stat']['name']: stat['base_stat'] for stat in document['stats']}
+            values['base_experience'] = document['base_experience']
+            selected.append((document, types, values))
+            
+    summary, top = {}, {}
+    for stat in query.stats:
+        column = sorted(values[stat] for _, _, values in selected)
+        summary[stat] = {
+            'mean': statistics.fmean(column) if column else None,
+            'std': statistics.pstdev(column) if column else None,
+            'percentiles': statistics.quantiles(column, n=100) if len(column) > 1 else None,
+        }
+        top[stat] = sorted(selected, key=lambda entry: (-entry[2][stat], entry[0]['id']))[:query.top]
+        
+    by_type = {}
+    for _, types, values in selected:
+        for name in types:
+            totals = by_type.setdefault(name, dict.fromkeys(query.stats, 0) | {'count': 0})
+            totals['count'] += 1
+            for stat in query.stats:
+                totals[stat] += values[stat]
+    return len(selected), summary, top, by_type
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs of each report")
+    args = parser.parse_args()
+    
+    print(f"Stats: {', '.join(STAT_COLUMNS)}")
+    for size in args.sizes:
+        details = list(synthetic_details(size))
+        start = time.perf_counter()
+        store = StatStore(details)
+        build = time.perf_counter() - start
+        
+        vectorized, looped = [], []
+        for query in QUERIES:
+            report = store.report(query)
+            count, _, top, _ = loop_report(details, query)
+            expected_top = {stat: [entry[0]['id'] for entry in entries] for stat, entries in top.items()}
+            if report['count'] != count or {stat: [entry['id'] for entry in entries]
+                                            for stat, entries in report['top'].items()} != expected_top:
+                raise SystemExit(f"Mismatch for {query}")
+            vectorized += time_calls(lambda: store.report(query), args.repeat)
+            looped += time_calls(lambda: loop_report(details, query), max(1, args.repeat // 10))
+            
+        print(f"{size:>7} records  build={build:6.2f}s  "
+              f"numpy p50={statistics.median(vectorized) * 1000:7.2f}ms  "
+              f"loops p50={statistics.median(looped) * 1000:8.2f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark: streaming (selective) JSON parsing vs response.json() + trimming
+
+For /pokemon and /pokemon-species payloads from the local stub dex, compares
+CPU time, peak traced allocations and bytes consumed between decoding the
+whole document and the incremental parser used for STREAMING_ENDPOINTS.
+
+Usage:
+    python benchmarks/bench_streaming_parse.py --repeat 200
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stub_server import StubDex
+from json_stream import parse_selected
+from payloads import POKEMON_DETAILS_SPEC, POKEMON_SPECIES_SPEC, trim_pokemon_details, trim_pokemon_species
+
+CHUNK_SIZE = 16384
+
+class CountingChunks:
+    """Iterate over a body in network-sized chunks, counting the bytes handed out"""
+    
+    def __init__(self, body: bytes):
+        self.body = body
+        self.consumed = 0
+    
+    def __iter__(self):
+        for start in range(0, len(self.body), CHUNK_SIZE):
+            chunk = self.body[start:start + CHUNK_SIZE]
+            self.consumed += len(chunk)
+            yield chunk
+
+def full_parse(body: bytes, trim):
+    return trim(json.loads(body)), len(body)
+
+def stream_parse(body: bytes, trim, spec):
+    chunks = CountingChunks(body)
+    return trim(parse_selected(chunks, spec)), chunks.consumed
+
+def measure(label: str, bodies, parse):
+    start = time.process_time()
+    for body in bodies:
+        parse(body)
+    cpu_ms = (time.process_time() - start) / len(bodies) * 1000
+    
+    tracemalloc.start()
+    peak = 0
+    consumed = 0
+    for body in bodies[:20]:
+        tracemalloc.reset_peak()
+        _, used = parse(body)
+        consumed += used
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+    
+    print(f"  {label:<22} CPU {cpu_ms:7.3f} ms/doc   peak alloc {peak / 1024:8.1f} KB   "
+          f"read {consumed / min(20, len(bodies)) / 1024:7.1f} KB/doc")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200, help="Documents parsed per measurement")
+    args = parser.parse_args()
+    
+    dex = StubDex(count=args.repeat)
+    ids = range(1, args.repeat + 1)
+    details = [dex.encoded("pokemon", pokemon_id, "http://stub") for pokemon_id in ids]
+    species = [dex.encoded("pokemon-species", pokemon_id, "http://stub") for pokemon_id in ids]
+    
+    print(f"\n/pokemon ({sum(map(len, details)) / len(details) / 1024:.0f} KB/doc)")
+    measure("response.json() + trim", details, lambda body: full_parse(body, trim_pokemon_details))
+    measure("streaming", details, lambda body: stream_parse(body, trim_pokemon_details, POKEMON_DETAILS_SPEC))
+    
+    print(f"\n/pokemon-species ({sum(map(len, species)) / len(species) / 1024:.0f} KB/doc)")
+    measure("response.json() + trim", species, lambda body: full_parse(body, trim_pokemon_species))
+    measure("streaming", species, lambda body: stream_parse(body, trim_pokemon_species, POKEMON_SPECIES_SPEC))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: round-robin tournament scaling with the number of worker processes
+
+Builds a synthetic roster (151 Pokemon by default, the size of
+/api/battle/tournament?set=151) and computes the full win-probability
+matrix with tournament.run_tournament for 1, 2, 4 ... workers up to the
+core count. Prints wall time, pairs per second, speedup and parallel
+efficiency for each worker count, and checks that every run produced the
+same matrix (chunks use their own seeded generators, so results don't
+depend on how work is spread over processes).
+
+Usage:
+    python benchmarks/bench_tournament_scaling.py --pokemon 151 --battles 200
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from benchmarks.bench_battle_batch import random_pokemon
+from dex_index import STAT_FIELDS
+from tournament import run_tournament
+import config
+
+def worker_counts(cores: int):
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cores:
+        counts.append(cores)
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pokemon", type=int, default=151)
+    parser.add_argument("--battles", type=int, default=200, help="Battles per pair")
+    parser.add_argument("--workers", type=int, nargs="+", help="Worker counts to time (default: 1, 2, 4 ... cores)")
+    parser.add_argument("--chunk-pairs", type=int, default=config.TOURNAMENT_CHUNK_PAIRS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    roster = [random_pokemon(rng, f"p{number}") for number in range(args.pokemon)]
+    names = [pokemon['name'] for pokemon in roster]
+    stats = np.array([[pokemon['stats'][field] for field in STAT_FIELDS] for pokemon in roster], dtype=np.int32)
+    pairs = args.pokemon * (args.pokemon - 1) // 2
+    
+    cores = os.cpu_count() or 1
+    print(f"{args.pokemon} Pokemon, {pairs:,} pairs x {args.battles} battles, {cores} cores")
+    print(f"{'workers':>7} {'seconds':>8} {'pairs/s':>10} {'speedup':>8} {'efficiency':>11}")
+    baseline = reference = None
+    for workers in args.workers or worker_counts(cores):
+        start = time.perf_counter()
+        result = run_tournament(names, stats, args.battles, seed=args.seed, workers=workers,
+                                chunk_pairs=args.chunk_pairs)
+        elapsed = time.perf_counter() - start
+        
+        if reference is None:
+            baseline, reference = elapsed, result
+        elif not (np.array_equal(result.wins, reference.wins, equal_nan=True) and
+                  np.array_equal(result.draws, reference.draws, equal_nan=True)):
+            raise SystemExit(f"Matrix with {workers} workers differs from the first run")
+            
+        speedup = baseline / elapsed
+        print(f"{workers:>7} {elapsed:>8.2f} {pairs / elapsed:>10,.0f} {speedup:>7.2f}x {speedup / workers:>10.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: peak RSS with and without payload trimming
+
+Fetches every Pokemon (details + species) from a local stub PokeAPI into
+an in-memory cache, once with full responses and once with the trimming
+stage, each in a fresh child process, and reports peak RSS, cached bytes
+and fetch time.
+
+Usage:
+    python benchmarks/bench_trim_rss.py --count 1300
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+def run_child(base_url: str, count: int, trim: bool):
+    """Fetch the whole stub dex and print measurements as JSON"""
+    from cache import MemoryCache
+    from pokemon_api import PokeAPIClient
+    from rate_limiter import TokenBucket
+    
+    cache = MemoryCache(max_entries=10 * count, max_bytes=1 << 40)
+    client = PokeAPIClient(base_url=base_url, rate_limiter=TokenBucket(rate=0), cache=cache, trim_payloads=trim)
+    
+    def fetch(pokemon_id):
+        client.get_pokemon_details(str(pokemon_id))
+        client.get_pokemon_species(pokemon_id)
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(fetch, range(1, count + 1)))
+    elapsed = time.perf_counter() - start
+    
+    print(json.dumps({
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'cache_mb': cache.stats()['bytes'] / 1024 / 1024,
+        'seconds': elapsed,
+    }))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=1300)
+    parser.add_argument("--child", choices=["full", "trim"], help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        run_child(args.base_url, args.count, args.child == "trim")
+        return
+    
+    from benchmarks.stub_server import StubDex, StubPokeAPI
+    
+    with StubPokeAPI(StubDex(count=args.count), latency=0) as stub:
+        print(f"\nFetching {args.count} Pokemon (details + species) into the in-memory cache")
+        for mode in ("full", "trim"):
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", mode, "--base-url", stub.base_url, "--count", str(args.count)],
+                capture_output=True, text=True, check=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{'without trimming' if mode == 'full' else 'with trimming':<18} "
+                  f"peak RSS {result['peak_rss_mb']:7.1f} MB   cached {result['cache_mb']:7.1f} MB   "
+                  f"{result['seconds']:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Load test: Flask (web_app.py) vs ASGI (asgi_app.py) under many concurrent page loads
+
+Runs a local stub PokeAPI and each app in its own process (threaded
+Werkzeug server and uvicorn), then drives both with the same number of
+concurrent /api/pokemon requests for random pages. Response caching is
+off by default so every page load really waits on upstream I/O, and the
+stub serves small documents so the run measures I/O concurrency rather
+than JSON decoding.
+
+Requires the optional ASGI dependencies (starlette, httpx, uvicorn).
+
+Usage:
+    python benchmarks/load_test_stacks.py --concurrency 200 --requests 1000 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from cache import MemoryCache
+from rate_limiter import TokenBucket
+
+PAGE_SIZE = 12
+DEX_COUNT = 1300
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def wait_until_up(url: str, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(url, timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise RuntimeError(f"{url} did not come up")
+
+def serve_flask(base_url: str, port: int, cache_enabled: bool):
+    from werkzeug.serving import run_simple
+    from pokemon_api import PokeAPIClient
+    from pokemon_service import PokemonService
+    import web_app
+    
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    logging.getLogger('urllib3').setLevel(logging.ERROR)
+    client = PokeAPIClient(base_url=base_url, rate_limiter=TokenBucket(rate=0))
+    # Passing cache=None would fall back to the shared default cache
+    client.cache = MemoryCache() if cache_enabled else None
+    web_app.pokemon_service = PokemonService(page_size=PAGE_SIZE, api_client=client)
+    # The service logs every page load
+    sys.stdout = open(os.devnull, 'w')
+    run_simple('127.0.0.1', port, web_app.app, threaded=True)
+
+def serve_asgi(base_url: str, port: int, cache_enabled: bool):
+    import uvicorn
+    from async_pokemon_api import AsyncPokeAPIClient
+    from async_pokemon_service import AsyncPokemonService
+    import asgi_app
+    
+    logging.getLogger('httpx').setLevel(logging.WARNING)
+    client = AsyncPokeAPIClient(base_url=base_url, rate_limiter=TokenBucket(rate=0))
+    client.cache = MemoryCache() if cache_enabled else None
+    asgi_app.pokemon_service = AsyncPokemonService(page_size=PAGE_SIZE, api_client=client)
+    sys.stdout = open(os.devnull, 'w')
+    uvicorn.run(asgi_app.app, host='127.0.0.1', port=port, log_level='warning', backlog=4096)
+
+async def drive(app_url: str, args):
+    """Fire args.requests page loads with args.concurrency in flight; return latencies and errors"""
+    rng = random.Random(0)
+    queue = [rng.randint(1, DEX_COUNT // PAGE_SIZE) for _ in range(args.requests)]
+    latencies = []
+    errors = 0
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    
+    async with httpx.AsyncClient(base_url=app_url, limits=limits, timeout=300) as client:
+        async def worker():
+            nonlocal errors
+            while queue:
+                page = queue.pop()
+                start = time.perf_counter()
+                try:
+                    response = await client.get(f'/api/pokemon?page={page}&limit={PAGE_SIZE}')
+                    if response.status_code != 200 or len(response.json()['pokemon']) != PAGE_SIZE:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+                
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+        
+    return latencies, errors, elapsed
+
+def run_stack(label: str, target, stub_url: str, args):
+    port = free_port()
+    process = multiprocessing.Process(target=target, args=(stub_url, port, args.cache), daemon=True)
+    process.start()
+    app_url = f"http://127.0.0.1:{port}"
+    try:
+        wait_until_up(f"{app_url}/api/cache/stats")
+        latencies, errors, elapsed = asyncio.run(drive(app_url, args))
+        upstream = httpx.get(f"{app_url}/api/cache/stats").json()['coalescing']['executed']
+    finally:
+        process.terminate()
+        process.join()
+        
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+    print(f"{label:<18} {len(latencies) / elapsed:8.1f} pages/s  p50={statistics.median(ordered) * 1000:8.1f}ms  "
+          f"p95={p95 * 1000:8.1f}ms  errors={errors}  upstream requests={upstream}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=200, help="Page loads in flight at once")
+    parser.add_argument("--requests", type=int, default=1000, help="Page loads per stack")
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub upstream latency in seconds")
+    parser.add_argument("--cache", action="store_true", help="Enable the response cache in both stacks")
+    args = parser.parse_args()
+    
+    stub_port = free_port()
+    stub = subprocess.Popen([
+        sys.executable, str(ROOT / 'benchmarks' / 'stub_server.py'), '--port', str(stub_port),
+        '--latency', str(args.latency), '--count', str(DEX_COUNT), '--moves', '4', '--flavor-entries', '3'
+    ], stdout=subprocess.DEVNULL)
+    stub_url = f"http://127.0.0.1:{stub_port}/api/v2"
+    
+    try:
+        wait_until_up(f"{stub_url}/pokemon/1")
+        print(f"{args.requests} page loads, {args.concurrency} concurrent, page size {PAGE_SIZE}, "
+              f"stub latency {args.latency * 1000:.0f}ms, cache {'on' if args.cache else 'off'}")
+        run_stack("flask (threads)", serve_flask, stub_url, args)
+        run_stack("asgi (asyncio)", serve_asgi, stub_url, args)
+    finally:
+        stub.terminate()
+        stub.wait()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Stress test: many threads loading different pages from one shared PokemonService
+
+Every thread requests random pages, both directly from the service and
+through the Flask /api/pokemon endpoint, and checks that the Pokemon and
+pagination metadata it gets back belong to the page it asked for. Exits
+non-zero if any response belongs to another page.
+
+Usage:
+    python benchmarks/stress_service_threads.py --threads 32 --requests 20
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stub_server import StubDex, StubPokeAPI
+from cache import MemoryCache
+from pokemon_api import PokeAPIClient
+from pokemon_service import PokemonService
+from rate_limiter import TokenBucket
+import web_app
+
+def check_service_page(service: PokemonService, page: int, page_size: int) -> bool:
+    offset = (page - 1) * page_size
+    pokemon_list, pagination_info = service.load_pokemon_page(offset=offset, limit=page_size)
+    expected_ids = list(range(offset + 1, offset + 1 + len(pokemon_list)))
+    return pagination_info.current_page == page and [p.id for p in pokemon_list] == expected_ids
+
+def check_http_page(client, page: int, page_size: int) -> bool:
+    data = client.get(f'/api/pokemon?page={page}&limit={page_size}').get_json()
+    offset = (page - 1) * page_size
+    expected_ids = list(range(offset + 1, offset + 1 + len(data['pokemon'])))
+    return data['pagination']['current_page'] == page and [p['id'] for p in data['pokemon']] == expected_ids
+
+def run_worker(service: PokemonService, args, seed: int):
+    rng = random.Random(seed)
+    client = web_app.app.test_client()
+    failures = 0
+    for _ in range(args.requests):
+        page = rng.randint(1, args.pages)
+        if not check_service_page(service, page, args.page_size):
+            failures += 1
+        if not check_http_page(client, page, args.page_size):
+            failures += 1
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=20, help="Page loads per thread (each checked twice)")
+    parser.add_argument("--pages", type=int, default=20, help="Distinct pages to choose from")
+    parser.add_argument("--page-size", type=int, default=12)
+    parser.add_argument("--latency", type=float, default=0.01, help="Stub upstream latency in seconds")
+    args = parser.parse_args()
+    
+    with StubPokeAPI(StubDex(count=args.pages * args.page_size), latency=args.latency) as stub:
+        client = PokeAPIClient(base_url=stub.base_url, rate_limiter=TokenBucket(rate=0), cache=MemoryCache())
+        service = PokemonService(page_size=args.page_size, api_client=client)
+        web_app.pokemon_service = service
+        
+        start = time.perf_counter()
+        # The service logs every page load; keep the report readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            with ThreadPoolExecutor(max_workers=args.threads) as pool:
+                failures = sum(pool.map(lambda seed: run_worker(service, args, seed), range(args.threads)))
+        elapsed = time.perf_counter() - start
+        
+    checks = args.threads * args.requests * 2
+    print(f"{args.threads} threads x {args.requests} pages ({checks} checks) in {elapsed:.1f}s, "
+          f"{stub.total_requests} upstream requests")
+    print(f"Responses for the wrong page: {failures}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
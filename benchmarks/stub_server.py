@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the PokeAPI used by the benchmark scripts
+
+Serves deterministic, realistically sized /pokemon, /pokemon-species and
+list payloads with a configurable artificial latency, and counts every
+request so benchmarks can report how many upstream calls were made.
+Sprite PNGs are served under /api/v2/sprites in the layout of PokeAPI's
+sprite repository (set SPRITE_BASE_URL to `sprite_base_url`).
+
+Usage:
+    python benchmarks/stub_server.py --port 8001 --latency 0.05
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import struct
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+TYPES = [
+    "normal", "fire", "water", "grass", "electric", "ice", "fighting", "poison", "ground",
+    "flying", "psychic", "bug", "rock", "ghost", "dragon", "dark", "steel", "fairy"
+]
+SYLLABLES = ["pi", "ka", "chu", "char", "man", "der", "bul", "ba", "saur", "squir", "tle",
+             "mew", "two", "eev", "ee", "ra", "ich", "snor", "lax", "gen", "gar", "ony", "x"]
+LANGUAGES = ["ja-Hrkt", "ko", "zh-Hant", "fr", "de", "es", "it", "ja", "zh-Hans", "en"]
+STAT_NAMES = ["hp", "attack", "defense", "special-attack", "special-defense", "speed"]
+SPRITE_PATHS = {"": "front", "back": "back", "shiny": "shiny"}
+
+def png(width: int, height: int, rows) -> bytes:
+    """Encode RGBA rows (bytes of width * 4) as a PNG without any imaging library"""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    raw = b"".join(b"\x00" + row for row in rows)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)) +
+            chunk(b"IDAT", zlib.compress(raw, 9)) + chunk(b"IEND", b""))
+
+class StubDex:
+    """Deterministic synthetic Pokedex with PokeAPI-shaped payloads"""
+    
+    def __init__(self, count: int = 1300, moves_per_pokemon: int = 80, flavor_entries: int = 120):
+        self.count = count
+        self.moves_per_pokemon = moves_per_pokemon
+        self.flavor_entries = flavor_entries
+        self.names = self._generate_names(count)
+        self.ids_by_name = {name: index + 1 for index, name in enumerate(self.names)}
+        self._payload_cache: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _generate_names(count: int):
+        rng = random.Random(1996)
+        names, seen = [], set()
+        while len(names) < count:
+            name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+            if name in seen:
+                name = f"{name}-{len(names)}"
+            seen.add(name)
+            names.append(name)
+        return names
+    
+    def resolve(self, name_or_id: str) -> Optional[int]:
+        if name_or_id.isdigit():
+            pokemon_id = int(name_or_id)
+            return pokemon_id if 1 <= pokemon_id <= self.count else None
+        return self.ids_by_name.get(name_or_id)
+    
+    def pokemon(self, pokemon_id: int, base_url: str) -> Dict:
+        rng = random.Random(pokemon_id)
+        name = self.names[pokemon_id - 1]
+        types = rng.sample(TYPES, rng.randint(1, 2))
+        return {
+            "id": pokemon_id,
+            "name": name,
+            "height": rng.randint(2, 40),
+            "weight": rng.randint(10, 2000),
+            "base_experience": rng.randint(40, 340),
+            "order": pokemon_id,
+            "is_default": True,
+            "location_area_encounters": f"{base_url}/pokemon/{pokemon_id}/encounters",
+            "species": {"name": name, "url": f"{base_url}/pokemon-species/{pokemon_id}/"},
+            "types": [
+                {"slot": slot + 1, "type": {"name": t, "url": f"{base_url}/type/{TYPES.index(t) + 1}/"}}
+                for slot, t in enumerate(types)
+            ],
+            "abilities": [
+                {"ability": {"name": f"ability-{rng.randint(1, 300)}", "url": f"{base_url}/ability/1/"},
+                 "is_hidden": hidden, "slot": slot + 1}
+                for slot, hidden in enumerate([False, True][:rng.randint(1, 2)])
+            ],
+            "stats": [
+                {"base_stat": rng.randint(20, 180), "effort": 0,
+                 "stat": {"name": stat, "url": f"{base_url}/stat/{index + 1}/"}}
+                for index, stat in enumerate(STAT_NAMES)
+            ],
+            "moves": [
+                {
+                    "move": {"name": f"move-{rng.randint(1, 900)}", "url": f"{base_url}/move/{m}/"},
+                    "version_group_details": [
+                        {"level_learned_at": rng.randint(1, 60),
+                         "move_learn_method": {"name": "level-up", "url": f"{base_url}/move-learn-method/1/"},
+                         "version_group": {"name": f"version-group-{v}", "url": f"{base_url}/version-group/{v}/"}}
+                        for v in range(1, 12)
+                    ],
+                }
+                for m in range(self.moves_per_pokemon)
+            ],
+            "sprites": {
+                "front_default": f"{base_url}/sprites/{pokemon_id}.png",
+                "back_default": f"{base_url}/sprites/back/{pokemon_id}.png",
+                "front_shiny": f"{base_url}/sprites/shiny/{pokemon_id}.png",
+                "other": {"official-artwork": {"front_default": f"{base_url}/sprites/art/{pokemon_id}.png"}},
+                "versions": {
+                    f"generation-{g}": {"game": {"front_default": f"{base_url}/sprites/g{g}/{pokemon_id}.png"}}
+                    for g in range(1, 9)
+                },
+            },
+            "game_indices": [{"game_index": pokemon_id, "version": {"name": f"v{v}", "url": ""}} for v in range(20)],
+        }
+    
+    def species(self, pokemon_id: int, base_url: str) -> Dict:
+        rng = random.Random(-pokemon_id)
+        name = self.names[pokemon_id - 1]
+        entries = []
+        for index in range(self.flavor_entries):
+            language = LANGUAGES[index % len(LANGUAGES)]
+            entries.append({
+                "flavor_text": f"{name.title()} entry {index}\nin {language}.\fIt is a synthetic Pokemon "
+                               f"used for local benchmarks ({rng.random():.6f}).",
+                "language": {"name": language, "url": f"{base_url}/language/{index % 10 + 1}/"},
+                "version": {"name": f"version-{index}", "url": f"{base_url}/version/{index}/"},
+            })
+        return {
+            "id": pokemon_id,
+            "name": name,
+            "base_happiness": 70,
+            "capture_rate": rng.randint(3, 255),
+            "color": {"name": "yellow", "url": f"{base_url}/pokemon-color/10/"},
+            "flavor_text_entries": entries,
+            "genera": [{"genus": "Stub Pokemon", "language": {"name": lang, "url": ""}} for lang in LANGUAGES],
+            "names": [{"name": name.title(), "language": {"name": lang, "url": ""}} for lang in LANGUAGES],
+            "varieties": [{"is_default": True, "pokemon": {"name": name, "url": f"{base_url}/pokemon/{pokemon_id}/"}}],
+        }
+    
+    def sprite(self, pokemon_id: int, variant: str) -> bytes:
+        """96x96 pixel-art PNG (about 1KB): a mirrored blob of 2px blocks on a transparent background, like a sprite"""
+        key = f"sprite:{variant}:{pokemon_id}"
+        with self._lock:
+            body = self._payload_cache.get(key)
+        if body is None:
+            rng = random.Random(f"{variant}:{pokemon_id}")
+            palette = [bytes([rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255), 255]) for _ in range(4)]
+            blank = bytes(4)
+            # Left half of a 48x48 block grid inside an 8-block margin, mirrored to the right
+            half = [[rng.choice(palette) if 8 <= y < 40 and x >= 8 and rng.random() < 0.7 else blank
+                     for x in range(24)] for y in range(48)]
+            rows = [b"".join(block * 2 for block in row + row[::-1]) for row in half for _ in range(2)]
+            body = png(96, 96, rows)
+            with self._lock:
+                self._payload_cache[key] = body
+        return body
+    
+    def encoded(self, kind: str, pokemon_id: int, base_url: str) -> bytes:
+        key = f"{kind}:{pokemon_id}"
+        with self._lock:
+            body = self._payload_cache.get(key)
+        if body is None:
+            data = self.pokemon(pokemon_id, base_url) if kind == "pokemon" else self.species(pokemon_id, base_url)
+            # PokeAPI serves keys in alphabetical order
+            body = json.dumps(data, sort_keys=True).encode("utf-8")
+            with self._lock:
+                self._payload_cache[key] = body
+        return body
+
+class _Server(ThreadingHTTPServer):
+    # Load tests open hundreds of connections at once; the default backlog of 5 drops them
+    request_queue_size = 1024
+    daemon_threads = True
+
+class StubPokeAPI:
+    """Threaded HTTP server serving a StubDex under /api/v2"""
+    
+    def __init__(self, dex: Optional[StubDex] = None, latency: float = 0.05, port: int = 0):
+        self.dex = dex or StubDex()
+        self.latency = latency
+        self.requests = Counter()
+        self._counter_lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", port), self._make_handler())
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/v2"
+    
+    @property
+    def sprite_base_url(self) -> str:
+        return f"{self.base_url}/sprites"
+    
+    @property
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+    
+    def reset_counters(self):
+        with self._counter_lock:
+            self.requests.clear()
+    
+    def start(self) -> 'StubPokeAPI':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def __enter__(self) -> 'StubPokeAPI':
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.stop()
+    
+    def _make_handler(self):
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def log_message(self, *args):
+                pass
+            
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                parts = [part for part in parsed.path.split("/") if part]
+                kind = parts[2] if len(parts) >= 3 and parts[:2] == ["api", "v2"] else None
+                with stub._counter_lock:
+                    stub.requests[kind or "other"] += 1
+                
+                if stub.latency:
+                    time.sleep(stub.latency)
+                
+                if kind == "pokemon" and len(parts) == 3:
+                    query = parse_qs(parsed.query)
+                    self._send_json(stub.list_payload(
+                        int(query.get("limit", ["20"])[0]), int(query.get("offset", ["0"])[0])
+                    ))
+                elif kind in ("pokemon", "pokemon-species") and len(parts) == 4:
+                    pokemon_id = stub.dex.resolve(parts[3].lower())
+                    if pokemon_id is None:
+                        self._send_status(404)
+                    else:
+                        self._send_cacheable(stub.dex.encoded(kind, pokemon_id, stub.base_url))
+                elif kind == "sprites" and len(parts) in (4, 5) and parts[-1].endswith(".png"):
+                    variant = SPRITE_PATHS.get(parts[3] if len(parts) == 5 else "")
+                    pokemon_id = stub.dex.resolve(parts[-1][:-len(".png")])
+                    if variant is None or pokemon_id is None:
+                        self._send_status(404)
+                    else:
+                        self._send_cacheable(stub.dex.sprite(pokemon_id, variant), "image/png")
+                else:
+                    self._send_status(404)
+            
+            def _send_json(self, data: Dict):
+                self._send_body(json.dumps(data).encode("utf-8"))
+            
+            def _send_cacheable(self, body: bytes, content_type: str = "application/json"):
+                etag = '"%s"' % hashlib.sha1(body).hexdigest()
+                if self.headers.get("If-None-Match") == etag:
+                    with stub._counter_lock:
+                        stub.requests["not-modified"] += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                else:
+                    self._send_body(body, content_type, {"ETag": etag})
+            
+            def _send_body(self, body: bytes, content_type: str = "application/json", headers: Optional[Dict] = None):
+                self.send_response(200)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def _send_status(self, status: int):
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+        
+        return Handler
+    
+    def list_payload(self, limit: int, offset: int) -> Dict:
+        base = self.base_url
+        end = min(self.dex.count, offset + limit)
+        return {
+            "count": self.dex.count,
+            "next": f"{base}/pokemon?offset={end}&limit={limit}" if end < self.dex.count else None,
+            "previous": f"{base}/pokemon?offset={max(0, offset - limit)}&limit={limit}" if offset > 0 else None,
+            "results": [
+                {"name": self.dex.names[index], "url": f"{base}/pokemon/{index + 1}/"}
+                for index in range(offset, end)
+            ],
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local PokeAPI stand-in")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.05, help="Artificial per-request latency in seconds")
+    parser.add_argument("--count", type=int, default=1300, help="Number of Pokemon in the stub dex")
+    parser.add_argument("--moves", type=int, default=80, help="Moves per Pokemon document")
+    parser.add_argument("--flavor-entries", type=int, default=120, help="Flavor text entries per species document")
+    args = parser.parse_args()
+    
+    dex = StubDex(count=args.count, moves_per_pokemon=args.moves, flavor_entries=args.flavor_entries)
+    stub = StubPokeAPI(dex, latency=args.latency, port=args.port)
+    print(f"Stub PokeAPI listening on {stub.base_url} (latency {args.latency * 1000:.0f}ms)")
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        stub.stop()
+
+if __name__ == "__main__":
+    main()
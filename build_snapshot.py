@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Pokemon Snapshot Builder
+
+Crawls every Pokemon (details + species) from the PokeAPI once and writes
+a compact, versioned snapshot file that SnapshotClient can serve without
+touching the network. Progress is checkpointed to `<output>.partial`, so an
+interrupted crawl resumes where it stopped.
+
+Usage:
+    python build_snapshot.py --output pokemon_snapshot.json.gz
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+from rich.console import Console
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, SpinnerColumn, TextColumn
+from pokemon_api import PokeAPIClient
+from rate_limiter import TokenBucket
+from snapshot_source import SNAPSHOT_FORMAT, SNAPSHOT_VERSION, write_snapshot
+import config
+
+def species_id_from_details(details: Dict) -> Optional[int]:
+    """Get the species ID linked from a Pokemon's details (forms share their base species)"""
+    url = (details.get('species') or {}).get('url')
+    if url:
+        last_segment = url.rstrip('/').rsplit('/', 1)[-1]
+        if last_segment.isdigit():
+            return int(last_segment)
+    return details.get('id')
+
+def fetch_entry(client: PokeAPIClient, name: str) -> Tuple[str, Optional[Dict], Optional[Dict]]:
+    """Fetch the details and species of one Pokemon"""
+    details = client.get_pokemon_details(name)
+    if not details:
+        return name, None, None
+    
+    species_id = species_id_from_details(details)
+    species = client.get_pokemon_species(species_id) if species_id else None
+    return name, details, species
+
+def load_checkpoint(path: str) -> Dict[str, Dict]:
+    """Read already crawled entries from a checkpoint file, skipping lines torn by an interruption"""
+    done = {}
+    if not os.path.exists(path):
+        return done
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            done[entry['name']] = entry
+    return done
+
+def build_snapshot(output: str, base_url: str, workers: int, delay: float, limit: Optional[int]) -> bool:
+    """
+    Crawl the PokeAPI into a snapshot file
+    
+    Returns:
+        True if every Pokemon was fetched and the snapshot was written
+    """
+    console = Console()
+    client = PokeAPIClient(base_url=base_url, rate_limiter=TokenBucket.from_delay(delay, capacity=workers))
+    
+    listing = client.get_pokemon_list(limit=limit or 100000, offset=0)
+    names = [pokemon['name'] for pokemon in listing.get('results', [])]
+    if not names:
+        console.print("[bold red]Could not fetch the Pokemon list![/bold red]")
+        return False
+    
+    checkpoint_path = output + '.partial'
+    done = load_checkpoint(checkpoint_path)
+    pending = [name for name in names if name not in done]
+    console.print(f"[bold blue]{len(names)} Pokemon listed, {len(done)} already in checkpoint, "
+                  f"{len(pending)} to fetch[/bold blue]")
+    
+    failed = []
+    with open(checkpoint_path, 'a', encoding='utf-8') as checkpoint, \
+            ThreadPoolExecutor(max_workers=workers) as executor, \
+            Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"),
+                     BarColumn(), MofNCompleteColumn(), console=console) as progress:
+        task = progress.add_task("Crawling Pokemon...", total=len(pending))
+        futures = [executor.submit(fetch_entry, client, name) for name in pending]
+        
+        for future in as_completed(futures):
+            name, details, species = future.result()
+            if details is None:
+                failed.append(name)
+            else:
+                entry = {'name': name, 'details': details, 'species': species}
+                checkpoint.write(json.dumps(entry, separators=(',', ':')) + '\n')
+                checkpoint.flush()
+                done[name] = entry
+            progress.advance(task)
+    
+    if failed:
+        console.print(f"[bold yellow]{len(failed)} Pokemon failed ({', '.join(failed[:5])}...). "
+                      f"Run the same command again to resume.[/bold yellow]")
+        return False
+    
+    species_by_id = {}
+    for entry in done.values():
+        if entry['species']:
+            species_by_id[str(entry['species']['id'])] = entry['species']
+    
+    snapshot = {
+        'format': SNAPSHOT_FORMAT,
+        'version': SNAPSHOT_VERSION,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'base_url': base_url,
+        'count': len(names),
+        # Keep the upstream list order so offsets match the live API
+        'pokemon': [{'name': name, 'details': done[name]['details']} for name in names],
+        'species': species_by_id,
+    }
+    
+    temp_path = output + '.tmp'
+    write_snapshot(temp_path, snapshot)
+    os.replace(temp_path, output)
+    os.remove(checkpoint_path)
+    
+    console.print(f"[bold green]✓ Wrote {len(names)} Pokemon and {len(species_by_id)} species to {output} "
+                  f"({os.path.getsize(output) / 1024 / 1024:.1f} MB)[/bold green]")
+    return True
+
+def main():
+    """Entry point of the snapshot builder"""
+    parser = argparse.ArgumentParser(description="Build an offline Pokemon snapshot from the PokeAPI")
+    parser.add_argument('--output', default=config.SNAPSHOT_PATH or 'pokemon_snapshot.json.gz',
+                        help="Snapshot file to write")
+    parser.add_argument('--base-url', default=config.POKEAPI_BASE_URL, help="PokeAPI base URL")
+    parser.add_argument('--workers', type=int, default=config.MAX_CONCURRENT_REQUESTS,
+                        help="Concurrent requests")
+    parser.add_argument('--delay', type=float, default=config.REQUEST_DELAY,
+                        help="Average seconds between requests (rate limit)")
+    parser.add_argument('--limit', type=int, default=None, help="Only crawl the first N Pokemon")
+    args = parser.parse_args()
+    
+    try:
+        ok = build_snapshot(args.output, args.base_url, args.workers, args.delay, args.limit)
+    except KeyboardInterrupt:
+        print("\n\nInterrupted. Progress is saved; run the same command again to resume. 👋")
+        sys.exit(1)
+    
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
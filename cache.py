@@ -0,0 +1,305 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import config
+
+def make_cache_key(url: str, params: Optional[Dict] = None) -> str:
+    """
+    Build a normalized cache key from a URL and its query parameters
+    
+    Scheme and host are lower-cased, trailing slashes are dropped and
+    parameters are sorted, so equivalent requests share one entry.
+    """
+    parts = urlsplit(url)
+    path = parts.path.rstrip('/') or '/'
+    query = dict(parse_qsl(parts.query))
+    query.update({str(k): str(v) for k, v in (params or {}).items()})
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(sorted(query.items())), ''))
+
+@dataclass
+class CacheEntry:
+    """A cached value with its expiry time, approximate size in bytes and HTTP validators"""
+    value: Any
+    expires_at: float
+    size: int = 0
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    
+    @property
+    def is_expired(self) -> bool:
+        return time.time() >= self.expires_at
+
+class CacheBackend(ABC):
+    """Interface implemented by response cache backends"""
+    
+    @abstractmethod
+    def get(self, key: str, allow_stale: bool = False) -> Optional[CacheEntry]:
+        """
+        Return the entry for `key`, or None on a miss
+        
+        Expired entries are only returned when `allow_stale` is set, e.g.
+        so their validators can be used for a conditional request.
+        """
+    
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float, size: int = 0,
+            etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Store `value` under `key` for `ttl` seconds"""
+    
+    @abstractmethod
+    def delete(self, key: str):
+        """Remove `key` if present"""
+    
+    @abstractmethod
+    def clear(self):
+        """Remove every entry"""
+    
+    @abstractmethod
+    def stats(self) -> Dict:
+        """Return hit/miss/eviction counters and current usage"""
+
+class MemoryCache(CacheBackend):
+    """Thread-safe in-process cache with TTL expiry and LRU eviction by entry count and bytes"""
+    
+    def __init__(self, max_entries: int = config.CACHE_MAX_ENTRIES, max_bytes: int = config.CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[str, CacheEntry]' = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get(self, key: str, allow_stale: bool = False) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            if entry.is_expired:
+                self.expirations += 1
+                self.misses += 1
+                if not allow_stale:
+                    self._remove(key)
+                    return None
+            else:
+                self.hits += 1
+                
+            self._entries.move_to_end(key)
+            return entry
+    
+    def set(self, key: str, value: Any, ttl: float, size: int = 0,
+            etag: Optional[str] = None, last_modified: Optional[str] = None):
+        if size > self.max_bytes:
+            return
+        
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            
+            self._entries[key] = CacheEntry(value=value, expires_at=time.time() + ttl, size=size,
+                                            etag=etag, last_modified=last_modified)
+            self._total_bytes += size
+            
+            # Evict least recently used entries until both limits are respected
+            while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+    
+    def delete(self, key: str):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+    
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self._total_bytes -= entry.size
+
+class SQLiteCache(CacheBackend):
+    """
+    Persistent cache stored in a SQLite file, shared by worker processes
+    
+    The database runs in WAL mode so any number of processes can read while
+    one writes, and every thread/process opens its own connection. Values
+    are stored as zlib-compressed JSON together with their ETag and
+    Last-Modified validators, so expired entries can be revalidated cheaply.
+    """
+    
+    # Size limit is enforced every this many writes rather than on each one
+    _TRIM_INTERVAL = 100
+    
+    def __init__(self, path: str = config.CACHE_PATH, max_bytes: int = config.CACHE_MAX_BYTES,
+                 compress_level: int = 6):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.compress_level = compress_level
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._connection()  # create the schema eagerly
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, reopening it after a fork"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' key TEXT PRIMARY KEY,'
+            ' value BLOB NOT NULL,'
+            ' expires_at REAL NOT NULL,'
+            ' stored_at REAL NOT NULL,'
+            ' size INTEGER NOT NULL,'
+            ' etag TEXT,'
+            ' last_modified TEXT)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at)')
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+    
+    def get(self, key: str, allow_stale: bool = False) -> Optional[CacheEntry]:
+        row = self._connection().execute(
+            'SELECT value, expires_at, size, etag, last_modified FROM responses WHERE key = ?', (key,)
+        ).fetchone()
+        
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            
+            entry = CacheEntry(value=None, expires_at=row[1], size=row[2], etag=row[3], last_modified=row[4])
+            if entry.is_expired:
+                self.expirations += 1
+                self.misses += 1
+                if not allow_stale:
+                    return None
+            else:
+                self.hits += 1
+        
+        entry.value = json.loads(zlib.decompress(row[0]))
+        return entry
+    
+    def set(self, key: str, value: Any, ttl: float, size: int = 0,
+            etag: Optional[str] = None, last_modified: Optional[str] = None):
+        blob = zlib.compress(json.dumps(value, separators=(',', ':')).encode('utf-8'), self.compress_level)
+        now = time.time()
+        self._connection().execute(
+            'INSERT OR REPLACE INTO responses (key, value, expires_at, stored_at, size, etag, last_modified)'
+            ' VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (key, blob, now + ttl, now, len(blob), etag, last_modified)
+        )
+        
+        with self._lock:
+            self._writes += 1
+            trim = self._writes % self._TRIM_INTERVAL == 0
+        if trim:
+            self._trim()
+    
+    def _trim(self):
+        """Drop the oldest entries while the stored blobs exceed max_bytes"""
+        conn = self._connection()
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        
+        removed = 0
+        for key, size in conn.execute('SELECT key, size FROM responses ORDER BY stored_at').fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+            total -= size
+            removed += 1
+        
+        with self._lock:
+            self.evictions += removed
+    
+    def delete(self, key: str):
+        self._connection().execute('DELETE FROM responses WHERE key = ?', (key,))
+    
+    def clear(self):
+        self._connection().execute('DELETE FROM responses')
+    
+    def stats(self) -> Dict:
+        entries, total = self._connection().execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses'
+        ).fetchone()
+        with self._lock:
+            return {
+                'backend': 'sqlite',
+                'path': self.path,
+                'entries': entries,
+                'bytes': total,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+# Registry of available backends, selected by config.CACHE_BACKEND
+CACHE_BACKENDS: Dict[str, Callable[[], CacheBackend]] = {
+    'memory': MemoryCache,
+    'sqlite': SQLiteCache,
+}
+
+_default_cache: Optional[CacheBackend] = None
+_default_cache_lock = threading.Lock()
+
+def create_cache(backend: str = config.CACHE_BACKEND) -> CacheBackend:
+    """Create a new cache instance for the named backend"""
+    try:
+        return CACHE_BACKENDS[backend]()
+    except KeyError:
+        raise ValueError(f"Unknown cache backend '{backend}'. Available: {', '.join(CACHE_BACKENDS)}")
+
+def get_default_cache() -> Optional[CacheBackend]:
+    """Return the process-wide cache, or None if caching is disabled in config"""
+    global _default_cache
+    
+    if not config.ENABLE_CACHING:
+        return None
+    
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = create_cache()
+        return _default_cache
@@ -0,0 +1,54 @@
+import gzip
+from typing import Optional
+import config
+
+try:
+    import brotli
+except ImportError:
+    # Optional: without it responses are only offered gzip-compressed
+    brotli = None
+
+def available_encodings():
+    """COMPRESSION_ENCODINGS this process can produce, in order of preference"""
+    return tuple(encoding for encoding in config.COMPRESSION_ENCODINGS if encoding != 'br' or brotli is not None)
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick the content coding for a response from an Accept-Encoding header
+    
+    Args:
+        accept_encoding: The request's Accept-Encoding value, e.g. "gzip, deflate, br;q=0.9"
+        
+    Returns:
+        The most preferred available encoding the client accepts with a non-zero
+        q-value (ties go to COMPRESSION_ENCODINGS order), or None for identity
+    """
+    if not accept_encoding or not config.COMPRESSION_ENABLED:
+        return None
+        
+    weights = {}
+    for item in accept_encoding.split(','):
+        coding, _, params = item.strip().partition(';')
+        weight = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding.strip().lower()] = weight
+        
+    best, best_weight = None, 0.0
+    for encoding in available_encodings():
+        weight = weights.get(encoding, weights.get('*', 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Encode a body with 'gzip' or 'br'"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=config.BROTLI_QUALITY)
+    # mtime=0 keeps the output identical for identical bodies
+    return gzip.compress(body, compresslevel=config.GZIP_LEVEL, mtime=0)
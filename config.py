@@ -2,12 +2,37 @@
 
 # API Configuration
 POKEAPI_BASE_URL = "https://pokeapi.co/api/v2"
-REQUEST_TIMEOUT = 10  # seconds
-REQUEST_DELAY = 0.1   # seconds between requests
+CONNECT_TIMEOUT = 3.05  # seconds to establish a connection to the PokeAPI
+READ_TIMEOUT = 10  # seconds to wait for response data once connected
+REQUEST_DELAY = 0.1   # seconds between requests (sustained rate of the global rate limiter)
+RATE_LIMIT_BURST = 24  # requests allowed back-to-back before REQUEST_DELAY pacing kicks in
+MAX_CONCURRENT_REQUESTS = 8  # parallel detail/species fetches per page
+TRIM_PAYLOADS = True  # keep only the fields the app uses before caching/storing responses
+MAX_MOVES = 4  # moves kept per Pokemon when trimming (the battle screen uses 4)
+# Endpoints parsed incrementally while downloading instead of with response.json(): any of
+# "pokemon", "pokemon-species". Uses less memory and stops reading early, but costs more CPU
+# than the C JSON decoder on documents that must be scanned to the end (benchmarks/bench_streaming_parse.py)
+STREAMING_ENDPOINTS = ()
+ASYNC_MAX_CONNECTIONS = 100  # pooled upstream connections of the async client (asgi_app.py)
+ASYNC_MAX_KEEPALIVE_CONNECTIONS = 20
+
+# HTTP Connection Pool / Retry Configuration
+HTTP_POOL_CONNECTIONS = 4  # hosts with a connection pool in the sync client
+HTTP_POOL_MAXSIZE = 32  # connections kept per host; at least MAX_CONCURRENT_REQUESTS
+HTTP_KEEP_ALIVE = True  # reuse connections between requests
+HTTP_KEEPALIVE_EXPIRY = 5.0  # seconds an idle pooled connection is kept (async client)
+MAX_RETRIES = 3  # retries of a request failing with a connection error, timeout or RETRY_STATUS_CODES
+RETRY_BACKOFF_BASE = 0.5  # seconds; backoff cap doubles per retry and the wait is jittered
+RETRY_BACKOFF_MAX = 8.0  # longest single wait; a longer Retry-After is not waited for
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+CIRCUIT_BREAKER_THRESHOLD = 5  # consecutive failed requests that open the circuit (0 disables it)
+CIRCUIT_BREAKER_RESET_TIMEOUT = 30  # seconds before a probe request is let through
 
 # Pagination Configuration
 DEFAULT_PAGE_SIZE = 10
-MAX_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 50  # largest `limit` accepted by /api/pokemon
+EXPORT_CHUNK_SIZE = 50  # Pokemon loaded per step by /api/export/pokemon; about two chunks are held in memory at once
+BATCH_LOOKUP_MAX = 50  # names or IDs accepted per /api/pokemon/batch request
 
 # Display Configuration
 CONSOLE_WIDTH = 120
@@ -15,4 +40,67 @@ SHOW_PROGRESS_BARS = True
 
 # Cache Configuration
 ENABLE_CACHING = True
-CACHE_EXPIRY = 3600  # seconds (1 hour)
\ No newline at end of file
+CACHE_EXPIRY = 3600  # seconds (1 hour)
+CACHE_BACKEND = "memory"  # "memory" (per process) or "sqlite" (persistent, shared by workers)
+CACHE_MAX_ENTRIES = 5000
+CACHE_MAX_BYTES = 64 * 1024 * 1024  # approximate upper bound on cached response bodies
+CACHE_PATH = "pokeapi_cache.sqlite3"  # used by the sqlite backend
+MAX_STALENESS = 600  # seconds past CACHE_EXPIRY a page or Pokemon is still served while it refreshes in the background (0 disables)
+RESULT_CACHE_MAX_ENTRIES = 2000  # assembled pages and Pokemon kept by PokemonService
+REFRESH_WORKERS = 2  # background threads refreshing stale pages and Pokemon
+
+# Prefetch Configuration
+PREFETCH_ENABLED = True  # load the next page in the background after serving one (needs ENABLE_CACHING)
+PREFETCH_PREVIOUS = False  # also prefetch the previous page
+PREFETCH_MAX_PENDING = 4  # prefetched pages queued or loading at once; the oldest queued one is dropped
+PREFETCH_WORKERS = 1
+
+# Search Configuration
+SEARCH_INDEX_LIMIT = 100000  # listing size requested to build the local name index (the whole dex)
+SEARCH_INDEX_REFRESH = 24 * 3600  # seconds between background rebuilds of the name index
+SEARCH_INDEX_RETRY = 60  # seconds before retrying a failed index build
+SEARCH_SUGGESTION_LIMIT = 10
+SEARCH_FUZZY_MAX_DISTANCE = 2  # typos tolerated in queries longer than 5 characters
+
+# Filter / Sort Index Configuration
+DEX_INDEX_REBUILD_INTERVAL = 5  # seconds; newly loaded Pokemon appear in filter results after at most this long
+DEX_INDEX_CRAWL = False  # load every Pokemon in the background on the first filter query (about 1300 PokeAPI requests)
+
+# HTTP Caching Configuration
+HTTP_MAX_AGE_PAGES = 60  # seconds browsers and CDNs may reuse an /api/pokemon page without revalidating
+HTTP_MAX_AGE_POKEMON = 3600  # same for /api/pokemon/<name> and /api/battle/pokemon/<name>
+HTTP_MAX_AGE_SPRITES = 365 * 24 * 3600  # /sprites responses, sent as immutable: a Pokemon's sprite doesn't change
+RESPONSE_CACHE_TTL = 30  # seconds a rendered API response is reused in process (0 disables the cache)
+RESPONSE_CACHE_MAX_ENTRIES = 2000
+RESPONSE_CACHE_MAX_BYTES = 16 * 1024 * 1024
+COMPRESSION_ENABLED = True  # gzip/brotli-encode rendered API responses for clients that accept it
+COMPRESSION_MIN_SIZE = 1024  # bytes; smaller bodies gain less than the encoding costs
+COMPRESSION_ENCODINGS = ("br", "gzip")  # in order of preference; "br" is skipped unless the brotli package is installed
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Battle Simulation Configuration
+BATTLE_BATCH_DEFAULT = 10000  # battles run by /api/battle/batch when the request doesn't say
+BATTLE_BATCH_MAX = 1000000  # upper bound on battles per /api/battle/batch request
+BATTLE_MAX_TURNS = 500  # actions (both sides) after which a simulated battle counts as a draw
+BATTLE_STAT_MAX = 1000  # upper bound on max_hp and every stat of a Pokemon sent to /api/battle/batch
+BATTLE_MULTIPLIER_MAX = 4.0  # upper bound on its attack and defense multipliers
+TOURNAMENT_BATTLES = 200  # battles per pair in /api/battle/tournament unless the request says
+TOURNAMENT_MAX_BATTLES = 10000  # upper bound on battles per pair
+TOURNAMENT_WORKERS = None  # processes computing a tournament (None: one per CPU)
+TOURNAMENT_CHUNK_PAIRS = 64  # pairs handed to a worker at a time
+TOURNAMENT_CACHE_DIR = "tournament_cache"  # finished win-probability matrices, reused across restarts
+TOURNAMENT_MAX_QUEUED = 1  # tournaments waiting behind the running one; other new ones are answered 503
+TOURNAMENT_RETRY_AFTER = 30  # seconds a 503'd client is told to wait (Retry-After)
+TOURNAMENT_FAILED_TTL = 60  # seconds a failed tournament is reported as failed before a request may retry it
+BATTLE_SESSION_TTL = 900  # seconds an idle /api/battle/sessions battle is kept
+BATTLE_SESSION_MAX = 10000  # open battle sessions; the least recently used one is dropped beyond this
+
+# Sprite Proxy Configuration
+SPRITE_BASE_URL = "https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon"  # upstream of /sprites
+SPRITE_CACHE_DIR = "sprite_cache"  # fetched sprites, thumbnails and sheets by content hash, reused across restarts
+SPRITE_THUMBNAIL_SIZES = (32, 48, 64)  # square sizes /sprites accepts as ?size=, built when a sprite is fetched (needs Pillow)
+SPRITE_MISSING_TTL = 3600  # seconds a sprite upstream doesn't have is answered 404 without asking again
+
+# Snapshot Configuration
+SNAPSHOT_PATH = None  # e.g. "pokemon_snapshot.json.gz" built by build_snapshot.py; serves data without network
\ No newline at end of file
@@ -0,0 +1,85 @@
+import base64
+import binascii
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+@dataclass(frozen=True)
+class PageCursor:
+    """
+    Position in the Pokemon listing just after a given Pokemon
+    
+    Sent to clients as an opaque token. The listing is in ID order, so the
+    page after a cursor is found from the ID rather than a fixed offset and
+    doesn't shift when Pokemon are added before it. The offset the next
+    Pokemon had when the cursor was issued is kept as a fallback for when
+    the name index isn't available.
+    """
+    after_id: int
+    offset: int
+    
+    def encode(self) -> str:
+        """Opaque, URL-safe token of this cursor"""
+        return base64.urlsafe_b64encode(f"{self.after_id}:{self.offset}".encode()).decode().rstrip('=')
+    
+    @classmethod
+    def decode(cls, token: str) -> 'PageCursor':
+        """
+        Parse a token made by encode()
+        
+        Raises:
+            ValueError: If the token is malformed
+        """
+        try:
+            after_id, offset = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode().split(':')
+            cursor = cls(after_id=int(after_id), offset=int(offset))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise ValueError("Invalid 'cursor'")
+        if cursor.after_id < 0 or cursor.offset < 0:
+            raise ValueError("Invalid 'cursor'")
+        return cursor
+    
+    @classmethod
+    def from_params(cls, params) -> Optional['PageCursor']:
+        """
+        The `cursor` parameter of a request
+        
+        Args:
+            params: Request arguments with `getlist()` (Flask or Starlette)
+            
+        Returns:
+            PageCursor, or None if the request has no cursor
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        values = params.getlist('cursor')
+        return cls.decode(values[-1].strip()) if values and values[-1].strip() else None
+
+def export_options(params) -> Tuple[Optional[PageCursor], int, Optional[int]]:
+    """
+    Range of an /api/export/pokemon request (offset=100&count=500, or cursor=...&count=500)
+    
+    Args:
+        params: Request arguments with `getlist()` (Flask or Starlette)
+        
+    Returns:
+        (cursor or None, offset, count or None for everything from the start on)
+        
+    Raises:
+        ValueError: On a malformed cursor, offset or count
+    """
+    cursor = PageCursor.from_params(params)
+    values = {}
+    for name in ('offset', 'count'):
+        if params.getlist(name):
+            try:
+                values[name] = int(params.getlist(name)[-1])
+            except ValueError:
+                raise ValueError(f"'{name}' must be an integer")
+    if values.get('offset', 0) < 0:
+        raise ValueError("'offset' must not be negative")
+    if values.get('count', 1) < 1:
+        raise ValueError("'count' must be at least 1")
+    if cursor is not None and 'offset' in values:
+        raise ValueError("Give either 'cursor' or 'offset', not both")
+    return cursor, values.get('offset', 0), values.get('count')
@@ -62,7 +62,7 @@ def test_pagination():
         
         # Test next page
         if pagination_info.has_next:
-            pokemon_list, pagination_info = service.load_next_page()
+            pokemon_list, pagination_info = service.load_next_page(pagination_info)
             console.print(f"[green]✓ Loaded next page with {len(pokemon_list)} Pokemon[/green]")
         
         return True
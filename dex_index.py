@@ -0,0 +1,332 @@
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+import config
+
+STAT_FIELDS = ('hp', 'attack', 'defense', 'special-attack', 'special-defense', 'speed')
+# Fields that can be range-filtered (min_<field>/max_<field>) and sorted on
+NUMERIC_FIELDS = ('id', 'height', 'weight', 'base_experience') + STAT_FIELDS
+SORT_FIELDS = NUMERIC_FIELDS + ('name',)
+
+# Set bit positions of every byte value, for turning a bitmap back into rows
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256))
+
+@dataclass(frozen=True)
+class DexQuery:
+    """Filters and sort order for a query over the whole dex"""
+    types: Tuple[str, ...] = ()
+    abilities: Tuple[str, ...] = ()
+    # (field, minimum or None, maximum or None), bounds inclusive
+    ranges: Tuple[Tuple[str, Optional[int], Optional[int]], ...] = ()
+    sort: str = 'id'
+    
+    @classmethod
+    def from_params(cls, params) -> Optional['DexQuery']:
+        """
+        Parse query string parameters such as type=fire&min_speed=100&sort=-base_experience
+        
+        Args:
+            params: Request arguments with `getlist()` (Flask or Starlette)
+            
+        Returns:
+            DexQuery, or None when no filter or sort parameter is present
+            
+        Raises:
+            ValueError: On an unknown field or a non-integer bound
+        """
+        types = tuple(value.strip().lower() for value in params.getlist('type') if value.strip())
+        abilities = tuple(value.strip().lower() for value in params.getlist('ability') if value.strip())
+        
+        bounds: Dict[str, List[Optional[int]]] = {}
+        for key in params.keys():
+            if not key.startswith(('min_', 'max_')):
+                continue
+            field = _field_name(key[4:])
+            if field not in NUMERIC_FIELDS:
+                raise ValueError(f"Cannot filter on '{key[4:]}'")
+            try:
+                value = int(params.getlist(key)[-1])
+            except ValueError:
+                raise ValueError(f"'{key}' must be an integer")
+            bounds.setdefault(field, [None, None])[0 if key.startswith('min_') else 1] = value
+            
+        sort = params.getlist('sort')[-1].strip() if params.getlist('sort') else ''
+        if sort:
+            sort_field = _field_name(sort.lstrip('-'))
+            if sort_field not in SORT_FIELDS:
+                raise ValueError(f"Cannot sort on '{sort.lstrip('-')}'")
+            sort = ('-' if sort.startswith('-') else '') + sort_field
+            
+        if not (types or abilities or bounds or sort):
+            return None
+        return cls(
+            types=types,
+            abilities=abilities,
+            ranges=tuple((field, low, high) for field, (low, high) in sorted(bounds.items())),
+            sort=sort or 'id'
+        )
+    
+    def to_params(self) -> List[Tuple[str, str]]:
+        """Query string parameters that reproduce this query"""
+        params = [('type', value) for value in self.types] + [('ability', value) for value in self.abilities]
+        for field, low, high in self.ranges:
+            if low is not None:
+                params.append((f"min_{field.replace('-', '_')}", str(low)))
+            if high is not None:
+                params.append((f"max_{field.replace('-', '_')}", str(high)))
+        descending = self.sort.startswith('-')
+        params.append(('sort', ('-' if descending else '') + self.sort.lstrip('-').replace('-', '_')))
+        return params
+
+def _field_name(name: str) -> str:
+    """Map a query parameter spelling (special_attack) to the field name (special-attack)"""
+    return name if name in SORT_FIELDS else name.replace('_', '-')
+
+def _record_from_details(details: Dict) -> Tuple[int, str, Tuple[str, ...], Tuple[str, ...], Dict[str, int]]:
+    stats = {stat['stat']['name']: stat['base_stat'] for stat in details.get('stats', [])}
+    values = {
+        'id': details['id'],
+        'height': details.get('height') or 0,
+        'weight': details.get('weight') or 0,
+        'base_experience': details.get('base_experience') or 0,
+    }
+    values.update({field: stats.get(field, 0) for field in STAT_FIELDS})
+    return (
+        details['id'],
+        details['name'],
+        tuple(type_info['type']['name'] for type_info in details.get('types', [])),
+        tuple(ability_info['ability']['name'] for ability_info in details.get('abilities', [])),
+        values
+    )
+
+class DexIndex:
+    """
+    Immutable attribute index over a set of Pokemon details
+    
+    Rows are Pokemon in ID order. Types and abilities map to bitmaps of rows
+    (Python ints, so AND/OR run in C over N/64 machine words). Every numeric
+    field is stored as a column with its rows pre-sorted in both directions;
+    "value >= v" bitmaps are precomputed at evenly spaced ranks, so a range
+    filter costs one bisect plus at most one checkpoint's worth of rows
+    instead of a scan of the column.
+    """
+    
+    CHECKPOINTS = 64
+    
+    def __init__(self, details: Iterable[Dict]):
+        """
+        Args:
+            details: PokeAPI /pokemon documents (full or trimmed); duplicates by ID are collapsed
+        """
+        records = sorted({record[0]: record for record in map(_record_from_details, details)}.values())
+        self.size = len(records)
+        self.ids = array('l', (record[0] for record in records))
+        self.names = [record[1] for record in records]
+        self._nbytes = (self.size + 7) // 8
+        self.all_rows = (1 << self.size) - 1
+        
+        self.type_bitmaps = self._bitmaps(record[2] for record in records)
+        self.ability_bitmaps = self._bitmaps(record[3] for record in records)
+        
+        self.columns: Dict[str, array] = {
+            field: array('l', (record[4][field] for record in records)) for field in NUMERIC_FIELDS
+        }
+        self._step = max(256, -(-self.size // self.CHECKPOINTS))
+        self._ascending: Dict[str, array] = {}
+        self._descending: Dict[str, array] = {}
+        self._sorted_values: Dict[str, array] = {}
+        self._at_least: Dict[str, List[int]] = {}
+        for field, column in self.columns.items():
+            # Ties keep ID order in both directions
+            ascending = sorted(range(self.size), key=lambda row: column[row])
+            self._ascending[field] = array('l', ascending)
+            self._descending[field] = array('l', sorted(range(self.size), key=lambda row: -column[row]))
+            self._sorted_values[field] = array('l', (column[row] for row in ascending))
+            self._at_least[field] = self._checkpoints(ascending)
+            
+        names_order = sorted(range(self.size), key=self.names.__getitem__)
+        self._ascending['name'] = array('l', names_order)
+        self._descending['name'] = array('l', reversed(names_order))
+        self._name_rank = array('l', [0]) * self.size
+        for rank, row in enumerate(names_order):
+            self._name_rank[row] = rank
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def _bitmaps(self, labels_per_row: Iterable[Tuple[str, ...]]) -> Dict[str, int]:
+        buffers: Dict[str, bytearray] = {}
+        for row, labels in enumerate(labels_per_row):
+            for label in labels:
+                buffer = buffers.setdefault(label, bytearray(self._nbytes))
+                buffer[row >> 3] |= 1 << (row & 7)
+        return {label: int.from_bytes(buffer, 'little') for label, buffer in buffers.items()}
+    
+    def _rows_bitmap(self, rows: Iterable[int]) -> int:
+        buffer = bytearray(self._nbytes)
+        for row in rows:
+            buffer[row >> 3] |= 1 << (row & 7)
+        return int.from_bytes(buffer, 'little')
+    
+    def _checkpoints(self, ascending: List[int]) -> List[int]:
+        """checkpoints[k] is the bitmap of rows ranked k * step or higher"""
+        buffer = bytearray(self._nbytes)
+        checkpoints = []
+        for start in range((len(ascending) - 1) // self._step * self._step, -1, -self._step):
+            for row in ascending[start:start + self._step]:
+                buffer[row >> 3] |= 1 << (row & 7)
+            checkpoints.append(int.from_bytes(buffer, 'little'))
+        checkpoints.reverse()
+        return checkpoints
+    
+    def _at_least_bitmap(self, field: str, value: int) -> int:
+        """Bitmap of rows whose `field` is >= value"""
+        rank = bisect_left(self._sorted_values[field], value)
+        if rank >= self.size:
+            return 0
+        checkpoint = -(-rank // self._step)
+        bitmap = self._at_least[field][checkpoint] if checkpoint < len(self._at_least[field]) else 0
+        return bitmap | self._rows_bitmap(self._ascending[field][rank:checkpoint * self._step])
+    
+    def match(self, query: DexQuery) -> int:
+        """Return the bitmap of rows matching every filter of `query`"""
+        bitmap = self.all_rows
+        for type_name in query.types:
+            bitmap &= self.type_bitmaps.get(type_name, 0)
+        for ability in query.abilities:
+            bitmap &= self.ability_bitmaps.get(ability, 0)
+        for field, low, high in query.ranges:
+            if low is not None:
+                bitmap &= self._at_least_bitmap(field, low)
+            if high is not None:
+                bitmap &= ~self._at_least_bitmap(field, high + 1)
+        return bitmap
+    
+    def query(self, query: DexQuery, offset: int = 0, limit: int = config.DEFAULT_PAGE_SIZE) -> Tuple[List[int], int]:
+        """
+        Filter and sort the dex
+        
+        Args:
+            query: Filters and sort order
+            offset: Matches to skip
+            limit: Maximum number of IDs returned
+            
+        Returns:
+            Tuple of (Pokemon names of the requested slice, total number of matches)
+        """
+        bitmap = self.match(query)
+        total = bitmap.bit_count()
+        wanted = offset + limit
+        if total == 0 or offset >= total:
+            return [], total
+            
+        field = query.sort.lstrip('-')
+        order = (self._descending if query.sort.startswith('-') else self._ascending)[field]
+        matched = bitmap.to_bytes(self._nbytes, 'little')
+        
+        if wanted * self.size <= total * total:
+            # Dense matches: walking the presorted order finds `wanted` of them in about wanted * size / total steps
+            rows = []
+            for row in order:
+                if matched[row >> 3] >> (row & 7) & 1:
+                    rows.append(row)
+                    if len(rows) == wanted:
+                        break
+        else:
+            # Sparse matches: pull them out of the bitmap and sort just those by their sorted position
+            rows = [index << 3 | bit for index, byte in enumerate(matched) if byte for bit in _BYTE_BITS[byte]]
+            if field != 'id' or query.sort.startswith('-'):
+                rows.sort(key=self._sort_key(field, query.sort))
+                
+        return [self.names[row] for row in rows[offset:wanted]], total
+    
+    def _sort_key(self, field: str, sort: str):
+        column = self._name_rank if field == 'name' else self.columns[field]
+        if sort.startswith('-'):
+            return lambda row: (-column[row], row)
+        return lambda row: (column[row], row)
+
+    
+class DexIndexer:
+    """
+    Keeps indexes up to date with the Pokemon details seen by a service
+    
+    Details are collected as they are loaded (pages, searches, prefetches)
+    or all at once from a snapshot. Each kind of immutable index (a DexIndex
+    by default, or any class built from a list of details) is rebuilt on
+    demand when new details arrived, at most every `rebuild_interval` seconds.
+    """
+    
+    def __init__(self, expected_count: int = 0, rebuild_interval: float = config.DEX_INDEX_REBUILD_INTERVAL):
+        self.expected_count = expected_count
+        self.rebuild_interval = rebuild_interval
+        self._details: Dict[int, Dict] = {}
+        self._lock = threading.Lock()
+        # Bumped whenever a new Pokemon is recorded
+        self._version = 0
+        # Index class -> (index, version it was built from, build time)
+        self._built: Dict[Callable, Tuple[Any, int, float]] = {}
+        # Index classes being rebuilt right now
+        self._building: Set[Callable] = set()
+    
+    def add(self, details: Optional[Dict]):
+        """Record a Pokemon details document"""
+        if not details or details.get('id') is None:
+            return
+        with self._lock:
+            if details['id'] not in self._details:
+                self._version += 1
+            self._details[details['id']] = details
+    
+    def add_many(self, details: Iterable[Dict]):
+        for document in details:
+            self.add(document)
+    
+    def __contains__(self, pokemon_id: int) -> bool:
+        return pokemon_id in self._details
+    
+    def __len__(self) -> int:
+        return len(self._details)
+    
+    def get(self, build: Callable[[List[Dict]], Any] = DexIndex, fresh: bool = False) -> Any:
+        """
+        Return a `build` index (DexIndex by default) of every Pokemon recorded so far
+        
+        With `fresh`, Pokemon recorded since the last build are included even if
+        `rebuild_interval` hasn't elapsed. The build runs outside the lock, so
+        threads recording details don't wait for it; while one thread rebuilds,
+        others asking for a non-fresh index get the previous one.
+        """
+        with self._lock:
+            built = self._built.get(build)
+            if built is not None and (built[1] == self._version or (
+                    not fresh and (time.monotonic() - built[2] < self.rebuild_interval or build in self._building))):
+                return built[0]
+            details, version = list(self._details.values()), self._version
+            self._building.add(build)
+            
+        try:
+            index = build(details)
+        finally:
+            with self._lock:
+                self._building.discard(build)
+        with self._lock:
+            current = self._built.get(build)
+            # Another thread may have built from newer details meanwhile
+            if current is not None and current[1] > version:
+                return current[0]
+            self._built[build] = (index, version, time.monotonic())
+            return index
+    
+    def peek(self, build: Callable[[List[Dict]], Any] = DexIndex) -> Any:
+        """The last `build` index built, possibly missing recent Pokemon, or None; never builds one"""
+        built = self._built.get(build)
+        return built[0] if built is not None else None
+    
+    @property
+    def complete(self) -> bool:
+        """Whether every Pokemon in the dex has been recorded"""
+        return self.expected_count > 0 and len(self._details) >= self.expected_count
@@ -0,0 +1,187 @@
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Tuple
+import config
+from api_responses import encode_json, pagination_fields, pokemon_columns_body, pokemon_page_body
+from cache import MemoryCache
+from compression import available_encodings, compress, negotiate_encoding
+from models import Pokemon, PaginationInfo
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Cache-Control and Vary sent with one kind of API response"""
+    # Seconds browsers and shared caches may reuse the response without revalidating
+    max_age: int
+    # Seconds past max_age a cache may serve the response while revalidating it in the background
+    stale_while_revalidate: int = 0
+    vary: Tuple[str, ...] = ('Accept-Encoding',)
+    # The URL's content never changes, so browsers needn't revalidate it even on reload
+    immutable: bool = False
+    
+    def headers(self, stale: bool = False) -> Dict[str, str]:
+        """
+        Caching headers of a response under this policy
+        
+        Args:
+            stale: The body came from an expired entry that is being refreshed; caches
+                may keep it but must revalidate before reusing it
+        """
+        if stale or self.max_age <= 0:
+            cache_control = 'no-cache'
+        else:
+            cache_control = f'public, max-age={self.max_age}'
+            if self.stale_while_revalidate:
+                cache_control += f', stale-while-revalidate={self.stale_while_revalidate}'
+            if self.immutable:
+                cache_control += ', immutable'
+        headers = {'Cache-Control': cache_control}
+        if self.vary:
+            headers['Vary'] = ', '.join(self.vary)
+        return headers
+
+# Policies per route; filter results change whenever the dex index is rebuilt, so they are reused no longer than that
+PAGE_POLICY = CachePolicy(config.HTTP_MAX_AGE_PAGES, stale_while_revalidate=config.MAX_STALENESS)
+FILTERED_PAGE_POLICY = CachePolicy(config.DEX_INDEX_REBUILD_INTERVAL)
+POKEMON_POLICY = CachePolicy(config.HTTP_MAX_AGE_POKEMON, stale_while_revalidate=config.MAX_STALENESS)
+# Sprites are PNGs (not worth compressing again) that never change once fetched
+SPRITE_POLICY = CachePolicy(config.HTTP_MAX_AGE_SPRITES, vary=(), immutable=True)
+
+@dataclass(frozen=True)
+class RenderedResponse:
+    """An encoded 200 response with its validator, as kept by ResponseCache"""
+    body: bytes
+    etag: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    # Compressed bodies by content coding, built once per response
+    variants: Dict[str, bytes] = field(default_factory=dict, repr=False, compare=False)
+    
+    def precompress(self) -> int:
+        """Build every compressed variant the process can serve; returns their total size in bytes"""
+        if len(self.body) < config.COMPRESSION_MIN_SIZE or not config.COMPRESSION_ENABLED:
+            return 0
+        return sum(len(self.encoded(encoding)) for encoding in available_encodings())
+    
+    def encoded(self, encoding: str) -> bytes:
+        """The body in a content coding ('gzip' or 'br')"""
+        body = self.variants.get(encoding)
+        if body is None:
+            body = self.variants[encoding] = compress(self.body, encoding)
+        return body
+    
+    def response_parts(self, if_none_match: Optional[str],
+                       accept_encoding: Optional[str] = None) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Status, headers and body answering a request with the given If-None-Match and Accept-Encoding
+        
+        Bodies of at least COMPRESSION_MIN_SIZE bytes are sent compressed when the
+        client accepts it. Each coding is a different representation, so it gets
+        its own ETag (the identity one with the coding appended).
+        
+        Returns:
+            (304, headers, b'') when the client already holds this version, else (200, headers, body)
+        """
+        encoding = negotiate_encoding(accept_encoding) if len(self.body) >= config.COMPRESSION_MIN_SIZE else None
+        etag = f'{self.etag[:-1]}-{encoding}"' if encoding else self.etag
+        headers = {'ETag': etag, **self.headers}
+        if etag_matches(if_none_match, etag):
+            return 304, headers, b''
+        if encoding is None:
+            return 200, headers, self.body
+        headers['Content-Encoding'] = encoding
+        return 200, headers, self.encoded(encoding)
+
+def content_etag(*parts: bytes) -> str:
+    """Strong ETag of some content: a quoted digest of its bytes"""
+    digest = hashlib.blake2b(digest_size=12)
+    for part in parts:
+        digest.update(part)
+    return f'"{digest.hexdigest()}"'
+
+def pokemon_etag(pokemon: Pokemon) -> str:
+    """ETag of /api/pokemon/<name>; the body is the Pokemon's own JSON, so this is its version"""
+    return f'"{pokemon.version()}"'
+
+def page_etag(pokemon_list: Iterable[Pokemon], pagination_info: PaginationInfo,
+              filters: Optional[Dict] = None, page_format: str = 'objects') -> str:
+    """
+    ETag of an /api/pokemon page, computed from the versions of the Pokemon on it
+    
+    Together with the pagination (and filter coverage) and the page format these
+    determine the body byte for byte, so the body doesn't have to be built to validate it.
+    """
+    pokemon_list = list(pokemon_list)
+    return content_etag(b','.join(pokemon.version().encode() for pokemon in pokemon_list),
+                        encode_json(pagination_fields(pagination_info, len(pokemon_list))),
+                        encode_json(filters) if filters is not None else b'', page_format.encode())
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header names `etag` (weak comparison, as RFC 9110 asks for If-None-Match)"""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag == '*' or (tag[2:] if tag.startswith('W/') else tag) == etag:
+            return True
+    return False
+
+class ResponseCache:
+    """
+    In-process cache of rendered API responses keyed by path and query string
+    
+    Holds the encoded body, ETag and caching headers of fresh 200 responses
+    for a few seconds, so repeat requests skip the service, the encoding and
+    the hashing. Stale and failed responses are never stored.
+    """
+    
+    def __init__(self, ttl: float = config.RESPONSE_CACHE_TTL, max_entries: int = config.RESPONSE_CACHE_MAX_ENTRIES,
+                 max_bytes: int = config.RESPONSE_CACHE_MAX_BYTES):
+        self.ttl = ttl
+        self._cache = MemoryCache(max_entries=max_entries, max_bytes=max_bytes)
+        self.not_modified = 0
+        self.compressed = 0
+    
+    @staticmethod
+    def key(path: str, params: Iterable[Tuple[str, str]]) -> str:
+        """Cache key of a request; parameter order doesn't matter"""
+        return path + '?' + '&'.join(f'{name}={value}' for name, value in sorted(params))
+    
+    def get(self, key: str) -> Optional[RenderedResponse]:
+        if self.ttl <= 0:
+            return None
+        entry = self._cache.get(key)
+        return entry.value if entry is not None else None
+    
+    def put(self, key: str, rendered: RenderedResponse) -> RenderedResponse:
+        """Store a rendered response and return it"""
+        if self.ttl > 0:
+            # Compressed once here rather than on every request that accepts it
+            self._cache.set(key, rendered, ttl=self.ttl, size=len(rendered.body) + rendered.precompress())
+        return rendered
+    
+    def answer(self, rendered: RenderedResponse, if_none_match: Optional[str],
+               accept_encoding: Optional[str] = None) -> Tuple[int, Dict[str, str], bytes]:
+        """rendered.response_parts, counting 304s and compressed responses"""
+        parts = rendered.response_parts(if_none_match, accept_encoding)
+        if parts[0] == 304:
+            self.not_modified += 1
+        elif 'Content-Encoding' in parts[1]:
+            self.compressed += 1
+        return parts
+    
+    def stats(self) -> Dict:
+        """Rendered response cache counters and usage"""
+        return {'ttl': self.ttl, 'not_modified': self.not_modified, 'compressed': self.compressed,
+                'encodings': list(available_encodings()), **self._cache.stats()}
+
+def render_page(pokemon_list, pagination_info: PaginationInfo, filters: Optional[Dict] = None,
+                policy: CachePolicy = PAGE_POLICY, page_format: str = 'objects') -> RenderedResponse:
+    """Encode an /api/pokemon page in `page_format` (see api_responses.PAGE_FORMATS) with its ETag and caching headers"""
+    build_body = pokemon_columns_body if page_format == 'columns' else pokemon_page_body
+    return RenderedResponse(build_body(pokemon_list, pagination_info, filters),
+                            page_etag(pokemon_list, pagination_info, filters, page_format),
+                            policy.headers(pagination_info.stale))
+
+def is_complete_page(pokemon_list, pagination_info: PaginationInfo) -> bool:
+    """Whether a page may be kept by ResponseCache: fresh, with every listed Pokemon loaded"""
+    expected = min(pagination_info.current_limit, pagination_info.count - pagination_info.current_offset)
+    return not pagination_info.stale and pagination_info.count > 0 and len(pokemon_list) == max(0, expected)
@@ -0,0 +1,278 @@
+import codecs
+import json
+import re
+import sys
+from typing import Any, AsyncIterable, Callable, Dict, Iterable, Tuple
+
+# Value specs describe which parts of a document to materialize:
+#   FULL            decode the value completely
+#   {key: spec}     object: only decode the listed keys, skip the rest
+#   Head(n, spec)   array: decode the first n elements, skip the rest
+#   First(pred, spec) array: decode elements until one matches pred, skip the rest
+FULL = object()
+
+class Head:
+    """Array spec: keep the first `count` elements"""
+    
+    def __init__(self, count: int, item: Any = FULL):
+        self.count = count
+        self.item = item
+
+class First:
+    """Array spec: keep only the first element for which `predicate` is true"""
+    
+    def __init__(self, predicate: Callable[[Any], bool], item: Any = FULL):
+        self.predicate = predicate
+        self.item = item
+
+class _NeedMore(Exception):
+    """Raised when the buffered text ends in the middle of a value"""
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_STRING = r'"(?:[^"\\]|\\.)*"'
+_STRING_RE = re.compile(_STRING, re.DOTALL)
+_SCALAR_RE = re.compile(r'[^,\]}\s]+')
+# A lone quote means a string is cut off at the end of the buffer
+_TOKEN_RE = re.compile(_STRING + r'|"|[\[\]{}]', re.DOTALL)
+
+# Possessive quantifiers (Python 3.11+) stop the regex engine from backtracking,
+# which makes both matching and failing on an incomplete buffer much cheaper
+_POSSESSIVE = '+' if sys.version_info >= (3, 11) else ''
+
+def _container_pattern(depth: int) -> str:
+    """Regex matching a JSON array/object nested at most `depth` levels deep"""
+    # Text between brackets, with whole strings (which may contain brackets) as single steps
+    run = r'[^\[\]{}"]*Q(?:"[^"\\]*Q(?:\\.[^"\\]*Q)*Q"[^\[\]{}"]*Q)*Q'.replace('Q', _POSSESSIVE)
+    nested = None
+    for _ in range(depth):
+        inner = run if nested is None else run + r'(?:(?:' + nested + r')' + run + r')*' + _POSSESSIVE
+        nested = r'\{' + inner + r'\}|\[' + inner + r'\]'
+    return nested
+
+# Skips a whole container in one C-level match instead of a Python loop per token
+_CONTAINER_RE = re.compile(_container_pattern(8), re.DOTALL)
+
+class SelectiveParser:
+    """
+    Incremental JSON parser that only materializes the parts of a document named in a spec
+    
+    Text is fed in chunks as it arrives. Unwanted values are skipped without
+    building Python objects, consumed input is discarded, and parsing stops
+    as soon as every top-level key in the spec has been seen.
+    """
+    
+    def __init__(self, spec: Dict):
+        self.spec = spec
+        self.result: Dict = {}
+        self.done = False
+        self._buffer = ''
+        self._pos = 0
+        self._started = False
+        self._final = False
+        # After running out of input, wait until the buffer has doubled before retrying,
+        # so tiny chunks don't rescan a large unfinished value over and over
+        self._retry_at = 0
+        self._decoder = json.JSONDecoder()
+    
+    def feed(self, text: str) -> bool:
+        """Add text to the buffer; returns True once everything needed has been parsed"""
+        if self.done:
+            return True
+            
+        self._buffer = self._buffer[self._pos:] + text
+        self._retry_at -= self._pos
+        self._pos = 0
+        if len(self._buffer) < self._retry_at and not self._final:
+            return False
+        
+        try:
+            self._parse_top_level()
+        except _NeedMore:
+            self._retry_at = 2 * (len(self._buffer) - self._pos)
+        return self.done
+    
+    def close(self) -> Dict:
+        """Signal end of input and return the extracted fields"""
+        if not self.done:
+            self._final = True
+            self.feed('')
+            if not self.done:
+                raise ValueError("Truncated JSON document")
+        return self.result
+    
+    def _parse_top_level(self):
+        buf = self._buffer
+        if not self._started:
+            pos = self._skip_ws(buf, self._pos)
+            self._expect(buf, pos, '{')
+            self._pos = pos + 1
+            self._started = True
+            
+        while True:
+            pos = self._skip_ws(buf, self._pos)
+            char = self._char(buf, pos)
+            if char == '}':
+                self.done = True
+                return
+            if char == ',':
+                pos = self._skip_ws(buf, pos + 1)
+                
+            key, pos = self._parse_key(buf, pos)
+            if key in self.spec:
+                value, pos = self._parse_value(buf, pos, self.spec[key])
+                self.result[key] = value
+            else:
+                pos = self._skip_value(buf, pos)
+                
+            # Commit the finished member; a later _NeedMore resumes from here
+            self._pos = pos
+            if len(self.result) == len(self.spec):
+                self.done = True
+                return
+    
+    def _parse_key(self, buf: str, pos: int) -> Tuple[str, int]:
+        self._expect(buf, pos, '"')
+        match = _STRING_RE.match(buf, pos)
+        if match is None:
+            raise _NeedMore()
+        key = json.loads(match.group())
+        pos = self._skip_ws(buf, match.end())
+        self._expect(buf, pos, ':')
+        return key, self._skip_ws(buf, pos + 1)
+    
+    def _parse_value(self, buf: str, pos: int, spec: Any) -> Tuple[Any, int]:
+        if spec is FULL:
+            try:
+                value, end = self._decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if self._final:
+                    raise
+                raise _NeedMore()
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(buf) and not self._final:
+                raise _NeedMore()
+            return value, end
+        if isinstance(spec, dict):
+            return self._parse_object(buf, pos, spec)
+        if isinstance(spec, (Head, First)):
+            return self._parse_array(buf, pos, spec)
+        raise TypeError(f"Invalid spec: {spec!r}")
+    
+    def _parse_object(self, buf: str, pos: int, spec: Dict) -> Tuple[Any, int]:
+        if self._char(buf, pos) == 'n':
+            return None, self._skip_value(buf, pos)
+        self._expect(buf, pos, '{')
+        result = {}
+        pos = self._skip_ws(buf, pos + 1)
+        
+        while self._char(buf, pos) != '}':
+            if self._char(buf, pos) == ',':
+                pos = self._skip_ws(buf, pos + 1)
+            key, pos = self._parse_key(buf, pos)
+            if key in spec:
+                result[key], pos = self._parse_value(buf, pos, spec[key])
+            else:
+                pos = self._skip_value(buf, pos)
+            pos = self._skip_ws(buf, pos)
+            
+        return result, pos + 1
+    
+    def _parse_array(self, buf: str, pos: int, spec) -> Tuple[Any, int]:
+        self._expect(buf, pos, '[')
+        result = []
+        wanted = True
+        pos = self._skip_ws(buf, pos + 1)
+        
+        while self._char(buf, pos) != ']':
+            if self._char(buf, pos) == ',':
+                pos = self._skip_ws(buf, pos + 1)
+            if wanted:
+                item, pos = self._parse_value(buf, pos, spec.item)
+                if isinstance(spec, Head):
+                    result.append(item)
+                    wanted = len(result) < spec.count
+                elif spec.predicate(item):
+                    result.append(item)
+                    wanted = False
+            else:
+                pos = self._skip_value(buf, pos)
+            pos = self._skip_ws(buf, pos)
+            
+        return result, pos + 1
+    
+    def _skip_value(self, buf: str, pos: int) -> int:
+        """Return the position just past the value starting at `pos`, without decoding it"""
+        char = self._char(buf, pos)
+        if char == '"':
+            match = _STRING_RE.match(buf, pos)
+            if match is None:
+                raise _NeedMore()
+            return match.end()
+            
+        if char in '[{':
+            match = _CONTAINER_RE.match(buf, pos)
+            if match is not None:
+                return match.end()
+            # Either the container is incomplete or nested deeper than the pattern handles
+            if not self._final:
+                raise _NeedMore()
+            return self._skip_container_slow(buf, pos)
+            
+        match = _SCALAR_RE.match(buf, pos)
+        if match is None or (match.end() == len(buf) and not self._final):
+            raise _NeedMore()
+        return match.end()
+    
+    @staticmethod
+    def _skip_container_slow(buf: str, pos: int) -> int:
+        """Token-by-token fallback for containers nested deeper than _CONTAINER_RE handles"""
+        depth = 0
+        for match in _TOKEN_RE.finditer(buf, pos):
+            token = match.group()
+            if token == '"':
+                raise _NeedMore()
+            if token in '[{':
+                depth += 1
+            elif token in ']}':
+                depth -= 1
+                if depth == 0:
+                    return match.end()
+        raise _NeedMore()
+    
+    @staticmethod
+    def _skip_ws(buf: str, pos: int) -> int:
+        return _WHITESPACE.match(buf, pos).end()
+    
+    @staticmethod
+    def _char(buf: str, pos: int) -> str:
+        if pos >= len(buf):
+            raise _NeedMore()
+        return buf[pos]
+    
+    def _expect(self, buf: str, pos: int, expected: str):
+        if self._char(buf, pos) != expected:
+            raise ValueError(f"Expected '{expected}' at position {pos}, found '{buf[pos]}'")
+
+def parse_selected(chunks: Iterable[bytes], spec: Dict, encoding: str = 'utf-8') -> Dict:
+    """
+    Parse a JSON object from an iterable of byte chunks, keeping only the fields in `spec`
+    
+    Stops consuming `chunks` as soon as the spec is satisfied.
+    """
+    parser = SelectiveParser(spec)
+    decoder = codecs.getincrementaldecoder(encoding)()
+    for chunk in chunks:
+        if parser.feed(decoder.decode(chunk)):
+            return parser.result
+    parser.feed(decoder.decode(b'', final=True))
+    return parser.close()
+
+async def parse_selected_async(chunks: AsyncIterable[bytes], spec: Dict, encoding: str = 'utf-8') -> Dict:
+    """Async counterpart of parse_selected for streaming async HTTP responses"""
+    parser = SelectiveParser(spec)
+    decoder = codecs.getincrementaldecoder(encoding)()
+    async for chunk in chunks:
+        if parser.feed(decoder.decode(chunk)):
+            return parser.result
+    parser.feed(decoder.decode(b'', final=True))
+    return parser.close()
@@ -1,24 +1,29 @@
-from dataclasses import dataclass
-from typing import List, Optional, Dict
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+import hashlib
+import json
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Pokemon:
-    """Data class representing a Pokemon"""
+    """Immutable, slotted data class representing a Pokemon"""
     id: int
     name: str
     height: int
     weight: int
-    types: List[str]
-    abilities: List[str]
+    types: Tuple[str, ...]
+    abilities: Tuple[str, ...]
     base_experience: int
     sprite_url: Optional[str] = None
     description: Optional[str] = None
+    # Lazily filled by to_json(); instances are immutable so the encoding never goes stale
+    _json: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+    _version: Optional[str] = field(default=None, init=False, repr=False, compare=False)
     
     @classmethod
-    def from_api_response(cls, data: Dict) -> 'Pokemon':
+    def from_api_response(cls, data: Dict, description: Optional[str] = None) -> 'Pokemon':
         """Create Pokemon instance from API response"""
-        types = [type_info['type']['name'] for type_info in data.get('types', [])]
-        abilities = [ability['ability']['name'] for ability in data.get('abilities', [])]
+        types = tuple(type_info['type']['name'] for type_info in data.get('types', []))
+        abilities = tuple(ability['ability']['name'] for ability in data.get('abilities', []))
         
         sprite_url = None
         sprites = data.get('sprites', {})
@@ -33,7 +38,8 @@ class Pokemon:
             types=types,
             abilities=abilities,
             base_experience=data.get('base_experience', 0),
-            sprite_url=sprite_url
+            sprite_url=sprite_url,
+            description=description
         )
     
     def get_height_meters(self) -> float:
@@ -43,8 +49,34 @@ class Pokemon:
     def get_weight_kg(self) -> float:
         """Convert weight from hectograms to kilograms"""
         return self.weight / 10.0
+    
+    def to_dict(self) -> Dict:
+        """Convert to the dictionary shape returned by the web API"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'height': self.get_height_meters(),
+            'weight': self.get_weight_kg(),
+            'types': list(self.types),
+            'abilities': list(self.abilities),
+            'base_experience': self.base_experience,
+            'sprite_url': self.sprite_url,
+            'description': self.description
+        }
+    
+    def to_json(self) -> bytes:
+        """Return the compact JSON encoding of to_dict(), computed once per instance"""
+        if self._json is None:
+            object.__setattr__(self, '_json', json.dumps(self.to_dict(), separators=(',', ':')).encode('utf-8'))
+        return self._json
+    
+    def version(self) -> str:
+        """Digest of to_json(), computed once per instance; changes whenever any served field does"""
+        if self._version is None:
+            object.__setattr__(self, '_version', hashlib.blake2b(self.to_json(), digest_size=12).hexdigest())
+        return self._version
 
-@dataclass
+@dataclass(frozen=True)
 class PaginationInfo:
     """Data class for pagination information"""
     count: int
@@ -52,6 +84,10 @@ class PaginationInfo:
     previous_url: Optional[str]
     current_offset: int
     current_limit: int
+    # Set when the page was served from an expired cache entry that is being refreshed
+    stale: bool = False
+    # Opaque token of the page after this one (see cursors.PageCursor), None on the last page
+    next_cursor: Optional[str] = None
     
     @property
     def has_next(self) -> bool:
@@ -0,0 +1,76 @@
+from typing import Dict, Optional
+from json_stream import FULL, First, Head
+import config
+
+def _named(resource: Optional[Dict]) -> Optional[Dict]:
+    """Reduce a PokeAPI named resource ({'name', 'url'}) to just its name"""
+    return {'name': resource['name']} if resource else None
+
+def trim_pokemon_details(data: Dict, max_moves: int = config.MAX_MOVES) -> Dict:
+    """
+    Keep only the parts of a /pokemon/{name} response the app uses
+    
+    The result has the same shape as the API response (so it can be fed to
+    Pokemon.from_api_response and the battle endpoints unchanged), minus the
+    version group details of every move, game indices and most sprites.
+    """
+    sprites = data.get('sprites') or {}
+    species = data.get('species')
+    
+    return {
+        'id': data.get('id'),
+        'name': data.get('name'),
+        'height': data.get('height'),
+        'weight': data.get('weight'),
+        'base_experience': data.get('base_experience'),
+        'types': [{'slot': t.get('slot'), 'type': _named(t['type'])} for t in data.get('types', [])],
+        'abilities': [
+            {'ability': _named(a['ability']), 'is_hidden': a.get('is_hidden', False)}
+            for a in data.get('abilities', [])
+        ],
+        'stats': [{'base_stat': s['base_stat'], 'stat': _named(s['stat'])} for s in data.get('stats', [])],
+        'moves': [{'move': _named(m['move'])} for m in data.get('moves', [])[:max_moves]],
+        'sprites': {
+            'front_default': sprites.get('front_default'),
+            'back_default': sprites.get('back_default'),
+        },
+        # Forms link to their base species, which snapshot building relies on
+        'species': {'name': species['name'], 'url': species['url']} if species else None,
+    }
+
+def trim_pokemon_species(data: Dict) -> Dict:
+    """Keep only the ID, name and first English flavor text of a /pokemon-species/{id} response"""
+    english = next(
+        (entry for entry in data.get('flavor_text_entries', []) if entry['language']['name'] == 'en'),
+        None
+    )
+    
+    return {
+        'id': data.get('id'),
+        'name': data.get('name'),
+        'flavor_text_entries': [
+            {'flavor_text': english['flavor_text'], 'language': {'name': 'en'}}
+        ] if english else [],
+    }
+
+
+# Streaming parser specs that read only what the trim functions above keep
+POKEMON_DETAILS_SPEC = {
+    'id': FULL,
+    'name': FULL,
+    'height': FULL,
+    'weight': FULL,
+    'base_experience': FULL,
+    'types': FULL,
+    'abilities': FULL,
+    'stats': FULL,
+    'moves': Head(config.MAX_MOVES, {'move': FULL}),
+    'sprites': {'front_default': FULL, 'back_default': FULL},
+    'species': FULL,
+}
+
+POKEMON_SPECIES_SPEC = {
+    'id': FULL,
+    'name': FULL,
+    'flavor_text_entries': First(lambda entry: entry['language']['name'] == 'en'),
+}
@@ -1,15 +1,141 @@
 import requests
 import json
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 import time
+import config
+from cache import CacheBackend, CacheEntry, get_default_cache, make_cache_key
+from json_stream import parse_selected
+from payloads import POKEMON_DETAILS_SPEC, POKEMON_SPECIES_SPEC, trim_pokemon_details, trim_pokemon_species
+from rate_limiter import TokenBucket
+from resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+from single_flight import SingleFlight
+from requests.adapters import HTTPAdapter
+
+# Shared by every client in the process so concurrent fetches stay polite as a whole
+_global_rate_limiter = TokenBucket.from_delay(config.REQUEST_DELAY, capacity=config.RATE_LIMIT_BURST)
+# Likewise shared: once the PokeAPI looks down, every client in the process fails fast
+_global_circuit_breaker = CircuitBreaker()
 
 class PokeAPIClient:
     """Client for interacting with the PokeAPI"""
     
-    def __init__(self, base_url: str = "https://pokeapi.co/api/v2"):
+    def __init__(self, base_url: str = "https://pokeapi.co/api/v2", rate_limiter: Optional[TokenBucket] = None,
+                 cache: Optional[CacheBackend] = None, cache_ttl: float = config.CACHE_EXPIRY,
+                 trim_payloads: bool = config.TRIM_PAYLOADS,
+                 streaming_endpoints: Tuple[str, ...] = config.STREAMING_ENDPOINTS,
+                 single_flight: Optional[SingleFlight] = None, retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None):
         self.base_url = base_url
         self.session = requests.Session()
+        # Size the pool for the concurrent page fan-out; retries are handled in _send, not by urllib3
+        adapter = HTTPAdapter(pool_connections=config.HTTP_POOL_CONNECTIONS, pool_maxsize=config.HTTP_POOL_MAXSIZE)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        if not config.HTTP_KEEP_ALIVE:
+            self.session.headers['Connection'] = 'close'
+        self.timeout = (config.CONNECT_TIMEOUT, config.READ_TIMEOUT)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or _global_circuit_breaker
+        self.rate_limiter = rate_limiter or _global_rate_limiter
+        # Falls back to the shared in-process cache (None when config.ENABLE_CACHING is off)
+        self.cache = cache if cache is not None else get_default_cache()
+        self.cache_ttl = cache_ttl
+        self.trim_payloads = trim_payloads
+        # Streaming specs only read the trimmed fields, so they require trimming
+        self.streaming_endpoints = set(streaming_endpoints) if trim_payloads else set()
+        self.single_flight = single_flight or SingleFlight()
+    
+    def _get_json(self, url: str, params: Optional[Dict] = None,
+                  extract: Optional[Callable[[Dict], Dict]] = None, stream_spec: Optional[Dict] = None) -> Dict:
+        """
+        Return the decoded JSON body for a GET request, served from the cache when possible
+        
+        `extract` runs once on a freshly downloaded body; only its (smaller)
+        result is cached and returned. With a `stream_spec` the body is parsed
+        incrementally while downloading and only the fields in the spec are built.
+        """
+        cache_key = make_cache_key(url, params)
+        entry = None
+        if self.cache is not None:
+            entry = self.cache.get(cache_key, allow_stale=True)
+            if entry is not None and not entry.is_expired:
+                return entry.value
+        
+        # Concurrent misses for the same key wait for a single upstream request
+        return self.single_flight.do(
+            cache_key, lambda: self._fetch_json(cache_key, url, params, entry, extract, stream_spec)
+        )
+    
+    def _fetch_json(self, cache_key: str, url: str, params: Optional[Dict], entry: Optional[CacheEntry],
+                    extract: Optional[Callable[[Dict], Dict]], stream_spec: Optional[Dict]) -> Dict:
+        """Download (or revalidate an expired `entry`) and store the result in the cache"""
+        # Revalidate an expired entry instead of re-downloading it when we have validators
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        
+        response = self._send(url, params, headers, stream=stream_spec is not None)
         
+        etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+        with response:
+            if response.status_code == 304 and entry is not None:
+                data = entry.value
+                size = entry.size
+                # A 304 needn't repeat the validators; keep the stored ones for the next revalidation
+                etag, last_modified = etag or entry.etag, last_modified or entry.last_modified
+            else:
+                response.raise_for_status()
+                if stream_spec is not None:
+                    # Stops reading as soon as the spec is satisfied; the rest of the body is dropped
+                    data = parse_selected(response.iter_content(chunk_size=16384), stream_spec)
+                    size = 0
+                else:
+                    data = response.json()
+                    size = len(response.content)
+                if extract is not None:
+                    data = extract(data)
+                    size = len(json.dumps(data, separators=(',', ':')))
+        
+        if self.cache is not None:
+            self.cache.set(cache_key, data, ttl=self.cache_ttl, size=size, etag=etag, last_modified=last_modified)
+        
+        return data
+    
+    def _send(self, url: str, params: Optional[Dict], headers: Dict, stream: bool) -> requests.Response:
+        """
+        Send a GET, retrying connection errors, timeouts and transient statuses with backoff
+        
+        Raises CircuitOpenError without sending anything while the PokeAPI is
+        considered down. A response that is still transient after the last
+        retry is returned as-is for the caller's raise_for_status().
+        """
+        self.circuit_breaker.before_call()
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=self.timeout, stream=stream)
+            except (requests.ConnectionError, requests.Timeout):
+                delay = self.retry_policy.backoff(attempt)
+                if delay is None:
+                    self.circuit_breaker.record_failure()
+                    raise
+            else:
+                if response.status_code not in self.retry_policy.status_codes:
+                    self.circuit_breaker.record_success()
+                    return response
+                delay = self.retry_policy.backoff(attempt, response.headers.get('Retry-After'))
+                if delay is None:
+                    self.circuit_breaker.record_failure()
+                    return response
+                response.close()
+            
+            attempt += 1
+            time.sleep(delay)
+    
     def get_pokemon_list(self, limit: int = 20, offset: int = 0) -> Dict:
         """
         Get a paginated list of Pokemon
@@ -25,10 +151,8 @@ class PokeAPIClient:
         params = {"limit": limit, "offset": offset}
         
         try:
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
+            return self._get_json(url, params=params)
+        except (requests.RequestException, CircuitOpenError) as e:
             print(f"Error fetching Pokemon list: {e}")
             return {"results": [], "count": 0, "next": None, "previous": None}
     
@@ -45,10 +169,12 @@ class PokeAPIClient:
         url = f"{self.base_url}/pokemon/{pokemon_name.lower()}"
         
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
+            return self._get_json(
+                url,
+                extract=trim_pokemon_details if self.trim_payloads else None,
+                stream_spec=POKEMON_DETAILS_SPEC if 'pokemon' in self.streaming_endpoints else None
+            )
+        except (requests.RequestException, CircuitOpenError) as e:
             print(f"Error fetching Pokemon details for {pokemon_name}: {e}")
             return None
     
@@ -65,9 +191,11 @@ class PokeAPIClient:
         url = f"{self.base_url}/pokemon-species/{pokemon_id}"
         
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
+            return self._get_json(
+                url,
+                extract=trim_pokemon_species if self.trim_payloads else None,
+                stream_spec=POKEMON_SPECIES_SPEC if 'pokemon-species' in self.streaming_endpoints else None
+            )
+        except (requests.RequestException, CircuitOpenError) as e:
             print(f"Error fetching Pokemon species for ID {pokemon_id}: {e}")
             return None
\ No newline at end of file
@@ -148,7 +148,7 @@ Choose an option (1-3):
                     console=self.console
                 ) as progress:
                     task = progress.add_task("Loading previous page...", total=None)
-                    pokemon_list, pagination_info = self.pokemon_service.load_previous_page()
+                    pokemon_list, pagination_info = self.pokemon_service.load_previous_page(pagination_info)
                     
             elif choice == 'n' and pagination_info.has_next:
                 with Progress(
@@ -157,7 +157,7 @@ Choose an option (1-3):
                     console=self.console
                 ) as progress:
                     task = progress.add_task("Loading next page...", total=None)
-                    pokemon_list, pagination_info = self.pokemon_service.load_next_page()
+                    pokemon_list, pagination_info = self.pokemon_service.load_next_page(pagination_info)
                     
             elif choice == 'd':
                 try:
@@ -1,89 +1,471 @@
 from pokemon_api import PokeAPIClient
+from snapshot_source import SnapshotClient
+from cache import MemoryCache
+from prefetch import Prefetcher
+from search_index import NameIndex, SearchIndex
+from dex_index import DexIndexer, DexQuery
+from stat_store import StatStore, StatsQuery
+from cursors import PageCursor
 from models import Pokemon, PaginationInfo
-from typing import List, Tuple, Optional
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Tuple, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import replace
+from urllib.parse import urlencode
+import threading
 import time
+import numpy as np
+import config
 
 class PokemonService:
-    """Service class for managing Pokemon data with lazy loading"""
+    """
+    Service class for managing Pokemon data with lazy loading
     
-    def __init__(self, page_size: int = 20):
-        self.api_client = PokeAPIClient()
+    Holds no per-request state: every page load takes its own offset/limit and
+    returns fresh objects, so one instance can be shared by many request threads.
+    Navigation state (the current page) belongs to the caller.
+    
+    Assembled pages and Pokemon are cached for CACHE_EXPIRY seconds. For up to
+    `max_staleness` seconds after that an expired result is still returned
+    immediately, flagged as stale, while a background worker reloads it.
+    
+    After serving a page the adjacent page(s) are prefetched in the background,
+    per `client_id`, so that pressing Next is usually a cache hit.
+    
+    Searches are resolved against a local index of every Pokemon name, so
+    prefixes and typos find the right Pokemon and unknown names cost no request.
+    
+    Filtered and sorted queries are answered from an attribute index of every
+    Pokemon the service has loaded (or the whole snapshot).
+    """
+    
+    def __init__(self, page_size: int = 20, max_workers: int = config.MAX_CONCURRENT_REQUESTS,
+                 api_client: Optional[PokeAPIClient] = None, cache_ttl: float = config.CACHE_EXPIRY,
+                 max_staleness: float = config.MAX_STALENESS, prefetch: bool = config.PREFETCH_ENABLED,
+                 prefetch_previous: bool = config.PREFETCH_PREVIOUS):
+        if api_client is None:
+            # A configured snapshot keeps the request path entirely off the network
+            api_client = SnapshotClient(config.SNAPSHOT_PATH) if config.SNAPSHOT_PATH else PokeAPIClient()
+        self.api_client = api_client
         self.page_size = page_size
-        self.cached_pokemon: List[Pokemon] = []
-        self.pagination_info: Optional[PaginationInfo] = None
-        self.current_offset = 0
+        # Bounded pool used to fan out detail/species requests; pacing is done by the client's rate limiter
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pokemon-fetch")
+        # Pages and Pokemon are immutable once built, so cached ones are shared between requests
+        self.result_cache = MemoryCache(max_entries=config.RESULT_CACHE_MAX_ENTRIES) if config.ENABLE_CACHING else None
+        self.cache_ttl = cache_ttl
+        self.max_staleness = max_staleness
+        self.refresh_executor = ThreadPoolExecutor(max_workers=config.REFRESH_WORKERS, thread_name_prefix="pokemon-refresh")
+        self._refreshing = set()
+        # Guards _refreshing and the stale-while-revalidate counters, which request and refresh threads update
+        self._refresh_lock = threading.Lock()
+        self.stale_served = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        # Prefetched pages land in the result cache, so prefetching needs it
+        self.prefetcher = Prefetcher() if prefetch and self.result_cache is not None else None
+        self.prefetch_previous = prefetch_previous
+        self.search_index = SearchIndex(self._build_name_index)
+        self.dex_indexer = DexIndexer()
+        if isinstance(api_client, SnapshotClient):
+            self.dex_indexer.expected_count = len(api_client.pokemon)
+            self.dex_indexer.add_many(entry['details'] for entry in api_client.pokemon)
+        self._crawl_lock = threading.Lock()
+        self._crawl_started = False
         
-    def load_pokemon_page(self, offset: int = None) -> Tuple[List[Pokemon], PaginationInfo]:
+    def load_pokemon_page(self, offset: int = 0, limit: Optional[int] = None,
+                          client_id: Hashable = None) -> Tuple[List[Pokemon], PaginationInfo]:
         """
         Load a page of Pokemon with lazy loading
         
         Args:
-            offset: Starting position (if None, uses current offset)
+            offset: Starting position (default: 0)
+            limit: Number of Pokemon on the page (default: the service page size)
+            client_id: Whose navigation this is; prefetches queued for an earlier
+                page of the same client are cancelled (default: one shared client)
+            
+        Returns:
+            Tuple of (Pokemon list, pagination info); `pagination_info.stale` is set
+            when the page came from an expired cache entry
+        """
+        if limit is None:
+            limit = self.page_size
+            
+        key = self._page_key(offset, limit)
+        if self.prefetcher is not None:
+            self.prefetcher.record_use(key)
+            # The client has moved on: stop prefetching anything but this page before loading it
+            self.prefetcher.release(client_id, keep=(key,))
             
+        (pokemon_list, pagination_info), stale = self._cached(
+            key,
+            lambda: self._fetch_page(offset, limit),
+            self._is_complete_page
+        )
+        
+        if self.prefetcher is not None and pagination_info.count > 0:
+            self.prefetcher.request(client_id, self._adjacent_page_loads(pagination_info))
+            
+        if stale:
+            pagination_info = replace(pagination_info, stale=True)
+        return list(pokemon_list), pagination_info
+    
+    def stream_pokemon_page(self, offset: int = 0, limit: Optional[int] = None,
+                            client_id: Hashable = None) -> Tuple[PaginationInfo, Iterator[Tuple[int, Pokemon]]]:
+        """
+        Load a page of Pokemon, handing out each one as soon as it has loaded
+        
+        A page in the result cache (fresh, or stale within `max_staleness`) is
+        served as load_pokemon_page would. Otherwise the listing is fetched
+        first, so the pagination info is known up front, and Pokemon follow in
+        the order their requests complete; once all have loaded the page is
+        cached and the adjacent page prefetched like load_pokemon_page does.
+        
         Returns:
-            Tuple of (Pokemon list, pagination info)
+            Tuple of (pagination info, iterator of (position on the page, Pokemon))
+        """
+        if limit is None:
+            limit = self.page_size
+            
+        key = self._page_key(offset, limit)
+        if self._has_servable(key):
+            pokemon_list, pagination_info = self.load_pokemon_page(offset=offset, limit=limit, client_id=client_id)
+            return pagination_info, enumerate(pokemon_list)
+            
+        if self.prefetcher is not None:
+            self.prefetcher.record_use(key)
+            self.prefetcher.release(client_id, keep=(key,))
+            
+        response, pagination_info = self._fetch_listing(offset, limit)
+        return pagination_info, self._stream_page(key, self._submit_page_loads(response), pagination_info, client_id)
+    
+    def _has_servable(self, key: str) -> bool:
+        """Whether the result cache can answer `key` without loading it on the request path"""
+        if self.result_cache is None:
+            return False
+        entry = self.result_cache.get(key, allow_stale=True)
+        return entry is not None and (not entry.is_expired or time.time() - entry.expires_at < self.max_staleness)
+    
+    def _stream_page(self, key: str, loads: List[Tuple[Future, Optional[Future]]], pagination_info: PaginationInfo,
+                     client_id: Hashable) -> Iterator[Tuple[int, Pokemon]]:
+        positions = {detail_future: position for position, (detail_future, _) in enumerate(loads)}
+        pokemon_list = [None] * len(loads)
+        for detail_future in as_completed(positions):
+            position = positions[detail_future]
+            pokemon = self._build_loaded(detail_future, loads[position][1])
+            if pokemon is not None:
+                pokemon_list[position] = pokemon
+                yield position, pokemon
+                
+        page = (tuple(pokemon for pokemon in pokemon_list if pokemon is not None), pagination_info)
+        if self.result_cache is not None and self._is_complete_page(page):
+            self.result_cache.set(key, page, ttl=self.cache_ttl)
+        if self.prefetcher is not None and pagination_info.count > 0:
+            self.prefetcher.request(client_id, self._adjacent_page_loads(pagination_info))
+    
+    @staticmethod
+    def _page_key(offset: int, limit: int) -> str:
+        return f"page:{offset}:{limit}"
+    
+    def _adjacent_page_loads(self, pagination_info: PaginationInfo) -> Dict[str, Callable[[], bool]]:
+        """Prefetch loads for the pages next to `pagination_info` that aren't freshly cached"""
+        limit = pagination_info.current_limit
+        offsets = []
+        if pagination_info.has_next:
+            offsets.append(pagination_info.current_offset + limit)
+        if self.prefetch_previous and pagination_info.has_previous:
+            offsets.append(max(0, pagination_info.current_offset - limit))
+            
+        loads = {}
+        for offset in offsets:
+            key = self._page_key(offset, limit)
+            entry = self.result_cache.get(key, allow_stale=True)
+            if entry is None or entry.is_expired:
+                loads[key] = lambda key=key, offset=offset: self._prefetch_page(key, offset, limit)
+        return loads
+    
+    def _prefetch_page(self, key: str, offset: int, limit: int) -> bool:
+        """Load a page into the result cache; returns whether it was complete enough to store"""
+        page = self._fetch_page(offset, limit, log=False, abandon=lambda: not self.prefetcher.is_wanted(key))
+        if not self._is_complete_page(page):
+            return False
+        self.result_cache.set(key, page, ttl=self.cache_ttl)
+        return True
+    
+    def _fetch_page(self, offset: int, limit: int, log: bool = True,
+                    abandon: Optional[Callable[[], bool]] = None) -> Tuple[Tuple[Pokemon, ...], PaginationInfo]:
+        """
+        Load a page from the API client, bypassing the result cache
+        
+        `abandon` is polled between steps; once it returns True the remaining
+        requests are cancelled and the (incomplete) page is returned as is.
         """
-        if offset is not None:
-            self.current_offset = offset
+        if log:
+            print(f"Loading Pokemon page at offset {offset}...")
         
-        print(f"Loading Pokemon page at offset {self.current_offset}...")
+        response, pagination_info = self._fetch_listing(offset, limit)
         
+        if abandon is not None and abandon():
+            return (), pagination_info
+        
+        # Futures are collected in list order, so the page order stays deterministic
+        loads = self._submit_page_loads(response)
+        pokemon_list = []
+        for detail_future, species_future in loads:
+            if abandon is not None and abandon():
+                # Free the shared fan-out pool for requests someone is waiting on
+                for future in (future for pair in loads for future in pair):
+                    if future is not None:
+                        future.cancel()
+                break
+            
+            pokemon = self._build_loaded(detail_future, species_future)
+            if pokemon is not None:
+                pokemon_list.append(pokemon)
+        
+        return tuple(pokemon_list), pagination_info
+    
+    def _fetch_listing(self, offset: int, limit: int) -> Tuple[Dict, PaginationInfo]:
+        """Fetch one /pokemon listing page; returns (response, pagination info)"""
         # Get Pokemon list from API
-        response = self.api_client.get_pokemon_list(
-            limit=self.page_size,
-            offset=self.current_offset
-        )
+        response = self.api_client.get_pokemon_list(limit=limit, offset=offset)
+        if response.get('count'):
+            self.dex_indexer.expected_count = response['count']
         
         # Create pagination info
-        self.pagination_info = PaginationInfo(
+        pagination_info = PaginationInfo(
             count=response.get('count', 0),
             next_url=response.get('next'),
             previous_url=response.get('previous'),
-            current_offset=self.current_offset,
-            current_limit=self.page_size
+            current_offset=offset,
+            current_limit=limit,
+            next_cursor=self._next_cursor(response, offset)
         )
-        
-        # Load Pokemon details for this page
-        pokemon_list = []
+        return response, pagination_info
+    
+    @classmethod
+    def _next_cursor(cls, response: Dict, offset: int) -> Optional[str]:
+        """Cursor token of the page after a listing fetched at `offset`, or None on the last page"""
+        results = response.get('results', [])
+        if not results or not response.get('next'):
+            return None
+        last_id = cls._pokemon_id_from_url(results[-1].get('url'))
+        return PageCursor(after_id=last_id, offset=offset + len(results)).encode() if last_id else None
+    
+    def _submit_page_loads(self, response: Dict) -> List[Tuple[Future, Optional[Future]]]:
+        """Fan out the detail and species requests of a whole listing at once; (details, species) futures in list order"""
+        loads = []
         for pokemon_basic in response.get('results', []):
-            pokemon_name = pokemon_basic['name']
+            detail_future = self.executor.submit(self.api_client.get_pokemon_details, pokemon_basic['name'])
             
-            # Get detailed Pokemon data
-            pokemon_details = self.api_client.get_pokemon_details(pokemon_name)
-            if pokemon_details:
-                pokemon = Pokemon.from_api_response(pokemon_details)
-                
-                # Get description from species endpoint
-                species_data = self.api_client.get_pokemon_species(pokemon.id)
-                if species_data and species_data.get('flavor_text_entries'):
-                    # Get English description
-                    for entry in species_data['flavor_text_entries']:
-                        if entry['language']['name'] == 'en':
-                            pokemon.description = entry['flavor_text'].replace('\n', ' ').replace('\f', ' ')
-                            break
+            # The list URL already carries the ID, so species can be requested alongside the details
+            pokemon_id = self._pokemon_id_from_url(pokemon_basic.get('url'))
+            species_future = self.executor.submit(self.api_client.get_pokemon_species, pokemon_id) if pokemon_id else None
+            loads.append((detail_future, species_future))
+        return loads
+    
+    def _build_loaded(self, detail_future: Future, species_future: Optional[Future]) -> Optional[Pokemon]:
+        """Pokemon from a submitted page load, or None if its details failed to load"""
+        pokemon_details = detail_future.result()
+        if not pokemon_details:
+            return None
+        self.dex_indexer.add(pokemon_details)
+        
+        if species_future is not None:
+            species_data = species_future.result()
+        else:
+            species_data = self.api_client.get_pokemon_species(pokemon_details.get('id', 0))
+        
+        return self._build_pokemon(pokemon_details, species_data)
+    
+    @staticmethod
+    def _is_complete_page(page: Tuple[Tuple[Pokemon, ...], PaginationInfo]) -> bool:
+        """Only cache pages where every listed Pokemon loaded, so upstream errors are not kept around"""
+        pokemon_list, pagination_info = page
+        expected = min(pagination_info.current_limit, pagination_info.count - pagination_info.current_offset)
+        return pagination_info.count > 0 and len(pokemon_list) == max(0, expected)
+    
+    def _cached(self, key: str, load: Callable[[], Any], cacheable: Callable[[Any], bool]) -> Tuple[Any, bool]:
+        """
+        Return `load()` through the result cache with stale-while-revalidate
+        
+        Args:
+            key: Result cache key
+            load: Builds the value from the API client
+            cacheable: Whether a loaded value may be stored
+            
+        Returns:
+            Tuple of (value, stale)
+        """
+        if self.result_cache is None:
+            return load(), False
+            
+        entry = self.result_cache.get(key, allow_stale=True)
+        if entry is not None:
+            if not entry.is_expired:
+                return entry.value, False
+            if time.time() - entry.expires_at < self.max_staleness:
+                self._refresh_in_background(key, load, cacheable)
+                with self._refresh_lock:
+                    self.stale_served += 1
+                return entry.value, True
                 
-                pokemon_list.append(pokemon)
+        value = load()
+        if cacheable(value):
+            self.result_cache.set(key, value, ttl=self.cache_ttl)
+        return value, False
+    
+    def _refresh_in_background(self, key: str, load: Callable[[], Any], cacheable: Callable[[Any], bool]):
+        """Reload `key` on the refresh pool unless a refresh for it is already queued"""
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
             
-            # Small delay to be respectful to the API
-            time.sleep(0.1)
+        def refresh():
+            refreshed = False
+            try:
+                value = load()
+                # Otherwise keep serving the stale value until it passes max_staleness
+                if cacheable(value):
+                    self.result_cache.set(key, value, ttl=self.cache_ttl)
+                    refreshed = True
+            except Exception as e:
+                print(f"Error refreshing {key}: {e}")
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+                    if refreshed:
+                        self.refreshes += 1
+                    else:
+                        self.refresh_failures += 1
+                    
+        self.refresh_executor.submit(refresh)
+    
+    def stale_stats(self) -> Dict:
+        """Return stale-while-revalidate counters"""
+        with self._refresh_lock:
+            return {
+                'max_staleness': self.max_staleness,
+                'stale_served': self.stale_served,
+                'refreshes': self.refreshes,
+                'refresh_failures': self.refresh_failures,
+                'refreshing': len(self._refreshing),
+            }
+    
+    @staticmethod
+    def _pokemon_id_from_url(url: Optional[str]) -> Optional[int]:
+        """Extract the numeric ID from a PokeAPI resource URL like .../pokemon/25/"""
+        if not url:
+            return None
+        
+        last_segment = url.rstrip('/').rsplit('/', 1)[-1]
+        return int(last_segment) if last_segment.isdigit() else None
+    
+    @staticmethod
+    def _build_pokemon(pokemon_details: Dict, species_data: Optional[Dict]) -> Pokemon:
+        """Create a Pokemon from its details and attach the English description"""
+        description = None
+        if species_data and species_data.get('flavor_text_entries'):
+            # Get English description
+            for entry in species_data['flavor_text_entries']:
+                if entry['language']['name'] == 'en':
+                    description = entry['flavor_text'].replace('\n', ' ').replace('\f', ' ')
+                    break
         
-        return pokemon_list, self.pagination_info
+        return Pokemon.from_api_response(pokemon_details, description=description)
     
-    def load_next_page(self) -> Tuple[List[Pokemon], PaginationInfo]:
-        """Load the next page of Pokemon"""
-        if self.pagination_info and self.pagination_info.has_next:
-            self.current_offset += self.page_size
-            return self.load_pokemon_page()
+    def load_next_page(self, pagination_info: PaginationInfo,
+                       client_id: Hashable = None) -> Tuple[List[Pokemon], PaginationInfo]:
+        """Load the page after the one described by `pagination_info`"""
+        if pagination_info.has_next:
+            return self.load_pokemon_page(
+                offset=pagination_info.current_offset + pagination_info.current_limit,
+                limit=pagination_info.current_limit,
+                client_id=client_id
+            )
         else:
-            return [], self.pagination_info
+            return [], pagination_info
     
-    def load_previous_page(self) -> Tuple[List[Pokemon], PaginationInfo]:
-        """Load the previous page of Pokemon"""
-        if self.pagination_info and self.pagination_info.has_previous:
-            self.current_offset = max(0, self.current_offset - self.page_size)
-            return self.load_pokemon_page()
+    def load_previous_page(self, pagination_info: PaginationInfo,
+                           client_id: Hashable = None) -> Tuple[List[Pokemon], PaginationInfo]:
+        """Load the page before the one described by `pagination_info`"""
+        if pagination_info.has_previous:
+            return self.load_pokemon_page(
+                offset=max(0, pagination_info.current_offset - pagination_info.current_limit),
+                limit=pagination_info.current_limit,
+                client_id=client_id
+            )
         else:
-            return [], self.pagination_info
+            return [], pagination_info
+    
+    def load_pokemon_page_after(self, cursor: PageCursor, limit: Optional[int] = None,
+                                client_id: Hashable = None) -> Tuple[List[Pokemon], PaginationInfo]:
+        """
+        Load the page of Pokemon following a cursor (keyset pagination)
+        
+        The page starts at the first Pokemon with an ID above the cursor's,
+        wherever the listing has put it since the cursor was issued.
+        
+        Args:
+            cursor: Cursor from a previous page's `next_cursor`
+            limit: Number of Pokemon on the page (default: the service page size)
+            client_id: See load_pokemon_page
+            
+        Returns:
+            Tuple of (Pokemon list, pagination info), as load_pokemon_page
+        """
+        pokemon_list, pagination_info = self.load_pokemon_page(
+            offset=self.locate_cursor(cursor), limit=limit, client_id=client_id)
+        # An index older than the listing may place the cursor early; never repeat what the client has seen
+        return [pokemon for pokemon in pokemon_list if pokemon.id > cursor.after_id], pagination_info
+    
+    def locate_cursor(self, cursor: PageCursor) -> int:
+        """Current listing offset of the first Pokemon after `cursor`"""
+        index = self.search_index.get()
+        return index.position_after(cursor.after_id) if index is not None and index.ids else cursor.offset
+    
+    def export_pokemon(self, offset: int = 0, count: Optional[int] = None,
+                       chunk_size: int = config.EXPORT_CHUNK_SIZE) -> Iterator[Pokemon]:
+        """
+        Every Pokemon from `offset` on, in listing order, for bulk export
+        
+        Loads `chunk_size` Pokemon at a time, bypassing the result cache and
+        prefetching so an export doesn't push out pages visitors are using.
+        The next chunk's requests are in flight while the current one is
+        consumed, so memory stays at about two chunks however long the range.
+        
+        Args:
+            offset: Listing position to start at
+            count: Number of Pokemon to export (default: all the rest)
+            chunk_size: Pokemon per listing request
+            
+        Returns:
+            Iterator of Pokemon (Pokemon whose details fail to load are skipped)
+        """
+        end = None if count is None else offset + count
+        
+        def submit(start: int) -> Tuple[Optional[Dict], List[Tuple[Future, Optional[Future]]]]:
+            limit = chunk_size if end is None else min(chunk_size, end - start)
+            if limit <= 0:
+                return None, []
+            response, _ = self._fetch_listing(start, limit)
+            return response, self._submit_page_loads(response)
+            
+        response, loads = submit(offset)
+        following: List[Tuple[Future, Optional[Future]]] = []
+        try:
+            while loads:
+                offset += len(loads)
+                next_response, following = submit(offset) if response.get('next') else (None, [])
+                for detail_future, species_future in loads:
+                    pokemon = self._build_loaded(detail_future, species_future)
+                    if pokemon is not None:
+                        yield pokemon
+                response, loads, following = next_response, following, []
+        finally:
+            # The consumer stopped early (e.g. the download was cancelled); drop requests nobody will read
+            for future in (future for pair in loads + following for future in pair):
+                if future is not None:
+                    future.cancel()
     
     def search_pokemon(self, name: str) -> Optional[Pokemon]:
         """
@@ -95,20 +477,221 @@ class PokemonService:
         Returns:
             Pokemon object if found, None otherwise
         """
+        return self.search_pokemon_with_status(name)[0]
+    
+    def search_pokemon_with_status(self, name: str, match: bool = True) -> Tuple[Optional[Pokemon], bool]:
+        """
+        Search for a specific Pokemon by name, reporting whether it was served stale
+        
+        Args:
+            name: Pokemon name or ID to search for
+            match: Resolve prefixes and typos through the name index ("pika" finds
+                Pikachu); otherwise only an exact name or ID is looked up
+            
+        Returns:
+            Tuple of (Pokemon object or None, stale)
+        """
+        query = name.strip().lower()
+        index = self.search_index.get()
+        if index is not None:
+            # The index lists every Pokemon, so a query it can't place doesn't need a request
+            resolved = index.resolve(query) if match else index.lookup(query)
+            if resolved is None:
+                return None, False
+            query = resolved
+            
+        return self._cached_pokemon(query)
+    
+    def _cached_pokemon(self, query: str) -> Tuple[Optional[Pokemon], bool]:
+        """Load one Pokemon by resolved name or ID through the result cache"""
+        return self._cached(
+            f"pokemon:{query}",
+            lambda: self._fetch_pokemon(query),
+            lambda pokemon: pokemon is not None
+        )
+    
+    def get_many(self, names: List[str]) -> List[Tuple[Optional[Pokemon], bool, Optional[str]]]:
+        """
+        Look up many Pokemon by exact name or ID at once, e.g. a team of six
+        
+        Names are deduplicated (a name and its ID count once when the name index
+        is available). Pokemon the result cache can answer are served straight
+        away; the rest are fetched concurrently on the service pool, paced by the
+        client's rate limiter.
+        
+        Args:
+            names: Pokemon names or IDs
+            
+        Returns:
+            One (Pokemon or None, stale, error or None) per name, in request order;
+            error is set when loading failed rather than the Pokemon not existing
+        """
+        index = self.search_index.get()
+        queries = [self._exact_query(name, index) for name in names]
+        
+        results, futures = {}, {}
+        for query in dict.fromkeys(query for query in queries if query is not None):
+            if self._has_servable(f"pokemon:{query}"):
+                results[query] = (*self._cached_pokemon(query), None)
+            else:
+                futures[query] = self.executor.submit(self._cached_pokemon, query)
+        for query, future in futures.items():
+            try:
+                results[query] = (*future.result(), None)
+            except Exception as e:
+                print(f"Error loading Pokemon {query}: {e}")
+                results[query] = (None, False, 'Failed to fetch Pokemon')
+                
+        return [results[query] if query is not None else (None, False, None) for query in queries]
+    
+    @staticmethod
+    def _exact_query(name: str, index: Optional[NameIndex]) -> Optional[str]:
+        """Normalised name or ID to load, or None if the name index shows no such Pokemon exists"""
+        query = name.strip().lower()
+        return index.lookup(query) if index is not None else query
+    
+    def suggest_pokemon(self, query: str, limit: int = config.SEARCH_SUGGESTION_LIMIT) -> List[str]:
+        """
+        Autocomplete Pokemon names from the local index without any network request
+        
+        Args:
+            query: Partial or misspelled name
+            limit: Maximum number of names
+            
+        Returns:
+            Matching names, best first (empty if the index couldn't be built)
+        """
+        index = self.search_index.get()
+        return index.suggest(query, limit) if index is not None else []
+    
+    def _build_name_index(self) -> Optional[NameIndex]:
+        """Build the name index from the full Pokemon listing"""
+        response = self.api_client.get_pokemon_list(limit=config.SEARCH_INDEX_LIMIT, offset=0)
+        results = response.get('results', [])
+        if not results:
+            return None
+        return NameIndex((entry['name'], self._pokemon_id_from_url(entry.get('url'))) for entry in results)
+    
+    def _fetch_pokemon(self, name: str) -> Optional[Pokemon]:
+        """Load one Pokemon from the API client, bypassing the result cache"""
         print(f"Searching for Pokemon: {name}")
         
         pokemon_details = self.api_client.get_pokemon_details(name)
         if pokemon_details:
-            pokemon = Pokemon.from_api_response(pokemon_details)
+            self.dex_indexer.add(pokemon_details)
+            species_data = self.api_client.get_pokemon_species(pokemon_details.get('id', 0))
+            return self._build_pokemon(pokemon_details, species_data)
+        
+        return None
+    
+    def filter_pokemon(self, query: DexQuery, offset: int = 0,
+                       limit: Optional[int] = None) -> Tuple[List[Pokemon], PaginationInfo]:
+        """
+        Filter and sort the dex, e.g. fire types with speed >= 100 by base experience
+        
+        Only Pokemon the service has already loaded are indexed unless a snapshot
+        is configured or DEX_INDEX_CRAWL is enabled; `dex_indexer.complete` tells
+        whether the results cover the whole dex.
+        
+        Args:
+            query: Filters and sort order
+            offset: Matches to skip (default: 0)
+            limit: Number of Pokemon on the page (default: the service page size)
             
-            # Get description
-            species_data = self.api_client.get_pokemon_species(pokemon.id)
-            if species_data and species_data.get('flavor_text_entries'):
-                for entry in species_data['flavor_text_entries']:
-                    if entry['language']['name'] == 'en':
-                        pokemon.description = entry['flavor_text'].replace('\n', ' ').replace('\f', ' ')
-                        break
+        Returns:
+            Tuple of (Pokemon list, pagination info over the matches)
+        """
+        if limit is None:
+            limit = self.page_size
+        if config.DEX_INDEX_CRAWL:
+            self._start_crawl()
+            
+        names, total = self.dex_indexer.get().query(query, offset, limit)
+        
+        # Matches are already known by name, so each one is a result cache or single-document lookup
+        futures = [self.executor.submit(self.search_pokemon_with_status, name, False) for name in names]
+        loaded = [future.result() for future in futures]
+        
+        params = query.to_params()
+        pagination_info = PaginationInfo(
+            count=total,
+            next_url=f"/api/pokemon?{urlencode(params + [('offset', offset + limit), ('limit', limit)])}"
+            if offset + limit < total else None,
+            previous_url=f"/api/pokemon?{urlencode(params + [('offset', max(0, offset - limit)), ('limit', limit)])}"
+            if offset > 0 else None,
+            current_offset=offset,
+            current_limit=limit,
+            stale=any(stale for _, stale in loaded)
+        )
+        return [pokemon for pokemon, _ in loaded if pokemon is not None], pagination_info
+    
+    def stats_report(self, query: StatsQuery) -> Dict:
+        """
+        Aggregate stats over the indexed Pokemon: summaries with percentiles, top-N and per-type averages
+        
+        Covers the same Pokemon as `filter_pokemon`; `complete` tells whether
+        that is the whole dex.
+        
+        Args:
+            query: Stats, type filter, percentiles and top count to report
             
-            return pokemon
+        Returns:
+            Report dict (see StatStore.report) plus `indexed` and `complete`
+        """
+        if config.DEX_INDEX_CRAWL:
+            self._start_crawl()
+        report = self.dex_indexer.get(StatStore).report(query)
+        report.update(indexed=len(self.dex_indexer), complete=self.dex_indexer.complete)
+        return report
+    
+    def battle_stats(self, pokemon_details: Dict) -> Optional[Dict[str, int]]:
+        """
+        Base stats of a Pokemon from the columnar store, or None if it isn't in the current store yet
+        
+        Reads whatever store stats and tournament requests last built: rebuilding it here would cost
+        far more than the six stats it saves parsing.
+        """
+        self.dex_indexer.add(pokemon_details)
+        store = self.dex_indexer.peek(StatStore)
+        return store.battle_stats(pokemon_details['id']) if store is not None else None
+    
+    def battle_roster(self, pokemon_set: str = '151') -> Tuple[List[str], np.ndarray]:
+        """
+        Names and battle stats of a set of Pokemon, for a tournament
         
-        return None
\ No newline at end of file
+        Args:
+            pokemon_set: '151' for the original Pokemon (IDs 1-151, loaded if needed) or
+                'indexed' for every Pokemon loaded so far (the whole dex with a snapshot or DEX_INDEX_CRAWL)
+                
+        Returns:
+            (names, stats array in STAT_FIELDS order), see StatStore.battle_roster
+        """
+        if pokemon_set == 'indexed':
+            return self.dex_indexer.get(StatStore, fresh=True).battle_roster()
+            
+        pokemon_ids = range(1, 152)
+        missing = [pokemon_id for pokemon_id in pokemon_ids if pokemon_id not in self.dex_indexer]
+        futures = [self.executor.submit(self.api_client.get_pokemon_details, str(pokemon_id)) for pokemon_id in missing]
+        for future in futures:
+            pokemon_details = future.result()
+            if pokemon_details:
+                self.dex_indexer.add(pokemon_details)
+        return self.dex_indexer.get(StatStore, fresh=True).battle_roster(pokemon_ids)
+    
+    def _start_crawl(self):
+        """Load every Pokemon into the attribute index on a background thread, once"""
+        with self._crawl_lock:
+            if self._crawl_started:
+                return
+            self._crawl_started = True
+        threading.Thread(target=self._crawl_dex, name="dex-crawl", daemon=True).start()
+    
+    def _crawl_dex(self):
+        index = self.search_index.get()
+        if index is None:
+            return
+        self.dex_indexer.expected_count = len(index)
+        for name in index.names:
+            # Requests go through the client, so they are rate limited and land in the response cache
+            if index.ids_by_name.get(name) not in self.dex_indexer:
+                self.dex_indexer.add(self.api_client.get_pokemon_details(name))
\ No newline at end of file
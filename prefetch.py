@@ -0,0 +1,158 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, Iterable, Set
+import config
+
+class Prefetcher:
+    """
+    Bounded queue of speculative background loads
+    
+    Each client (a console session, a browser address, ...) has a set of keys
+    it expects to need next. When a client asks for a new set, its queued
+    loads that are no longer wanted by anyone are cancelled, so jumping to a
+    distant page doesn't leave stale work ahead of useful work. At most
+    `max_pending` loads are queued or running; when the queue is full the
+    oldest queued load is cancelled to make room.
+    
+    Loads already running are not interrupted, but can poll `is_wanted()` and
+    give up early.
+    """
+    
+    # Completed loads remembered for hit accounting
+    MAX_TRACKED = 256
+    
+    def __init__(self, max_pending: int = config.PREFETCH_MAX_PENDING, workers: int = config.PREFETCH_WORKERS):
+        self.max_pending = max_pending
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pokemon-prefetch")
+        # Callbacks of cancelled futures run synchronously while the lock is held
+        self._lock = threading.RLock()
+        self._pending: 'OrderedDict[str, Future]' = OrderedDict()
+        self._wanted_by: Dict[str, Set[Hashable]] = {}
+        self._client_keys: Dict[Hashable, Set[str]] = {}
+        self._completed: 'OrderedDict[str, None]' = OrderedDict()
+        self.issued = 0
+        self.completed = 0
+        self.failed = 0
+        self.hits = 0
+        self.late = 0
+        self.cancelled = 0
+        self.unused = 0
+    
+    def request(self, client_id: Hashable, loads: Dict[str, Callable[[], bool]]):
+        """
+        Replace the prefetches wanted by `client_id` with `loads`
+        
+        Args:
+            client_id: Identifies whose navigation the loads predict
+            loads: Cache key -> callable that loads and stores it, returning False if nothing was stored
+        """
+        with self._lock:
+            self.release(client_id, keep=loads)
+            for key, load in loads.items():
+                if key not in self._pending:
+                    if len(self._pending) >= self.max_pending and not self._cancel_oldest_queued():
+                        continue
+                    future = self.executor.submit(self._run, key, load)
+                    self._pending[key] = future
+                    self._wanted_by[key] = set()
+                    self.issued += 1
+                    future.add_done_callback(lambda f, key=key: self._finished(key, f))
+                    if future.done():
+                        continue
+                self._wanted_by[key].add(client_id)
+                self._client_keys.setdefault(client_id, set()).add(key)
+    
+    def release(self, client_id: Hashable, keep: Iterable[str] = ()):
+        """Drop the prefetches wanted by `client_id` except `keep`, cancelling those nobody else wants"""
+        with self._lock:
+            keep = set(keep)
+            kept = set()
+            for key in self._client_keys.pop(client_id, set()):
+                if key in keep:
+                    kept.add(key)
+                else:
+                    self._unwant(key, client_id)
+            if kept:
+                self._client_keys[client_id] = kept
+    
+    def record_use(self, key: str):
+        """Count whether a key being served now was prefetched"""
+        with self._lock:
+            if key in self._completed:
+                del self._completed[key]
+                self.hits += 1
+            elif key in self._pending:
+                self.late += 1
+    
+    def is_wanted(self, key: str) -> bool:
+        """Whether some client still expects `key`; running loads use this to stop early"""
+        with self._lock:
+            return bool(self._wanted_by.get(key))
+    
+    def _unwant(self, key: str, client_id: Hashable):
+        clients = self._wanted_by.get(key)
+        if clients is None:
+            return
+        clients.discard(client_id)
+        if not clients:
+            self._pending[key].cancel()
+    
+    def _cancel_oldest_queued(self) -> bool:
+        for future in list(self._pending.values()):
+            if future.cancel():
+                return True
+        return False
+    
+    def _run(self, key: str, load: Callable[[], bool]) -> bool:
+        try:
+            return load()
+        except Exception as e:
+            print(f"Error prefetching {key}: {e}")
+            return False
+    
+    def _finished(self, key: str, future: Future):
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+                for client_id in self._wanted_by.pop(key, set()):
+                    keys = self._client_keys.get(client_id)
+                    if keys is not None:
+                        keys.discard(key)
+                        if not keys:
+                            del self._client_keys[client_id]
+                            
+            if future.cancelled():
+                self.cancelled += 1
+            elif future.result():
+                self.completed += 1
+                self._completed[key] = None
+                self._completed.move_to_end(key)
+                while len(self._completed) > self.MAX_TRACKED:
+                    self._completed.popitem(last=False)
+                    self.unused += 1
+            else:
+                self.failed += 1
+    
+    def stats(self) -> Dict:
+        """
+        Return prefetch counters
+        
+        `failed` counts loads that stored nothing (errors, incomplete or abandoned
+        pages) and `hit_rate` is the share of completed prefetches later served.
+        """
+        with self._lock:
+            return {
+                'pending': len(self._pending),
+                'issued': self.issued,
+                'completed': self.completed,
+                'failed': self.failed,
+                'cancelled': self.cancelled,
+                'hits': self.hits,
+                'late': self.late,
+                'unused': self.unused,
+                'hit_rate': round(self.hits / self.completed, 3) if self.completed else None,
+            }
+    
+    def shutdown(self, wait: bool = True):
+        self.executor.shutdown(wait=wait, cancel_futures=True)
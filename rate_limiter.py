@@ -0,0 +1,59 @@
+import asyncio
+import threading
+import time
+
+class TokenBucket:
+    """Thread-safe token bucket used to pace requests to the PokeAPI"""
+    
+    def __init__(self, rate: float, capacity: int = 1):
+        """
+        Args:
+            rate: Tokens added per second (0 or less disables limiting)
+            capacity: Maximum number of tokens that can be saved up for bursts
+        """
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_delay(cls, delay: float, capacity: int = 1) -> 'TokenBucket':
+        """Create a bucket that allows one request every `delay` seconds on average"""
+        return cls(rate=1.0 / delay if delay > 0 else 0, capacity=capacity)
+    
+    def acquire(self):
+        """Block until a token is available, then consume it"""
+        if self.rate <= 0:
+            return
+        
+        while True:
+            wait = self._try_take()
+            if wait == 0:
+                return
+            # Sleep outside the lock so other threads can keep refilling/checking
+            time.sleep(wait)
+    
+    async def acquire_async(self):
+        """Like acquire(), but waits without blocking the event loop"""
+        if self.rate <= 0:
+            return
+        
+        while True:
+            wait = self._try_take()
+            if wait == 0:
+                return
+            await asyncio.sleep(wait)
+    
+    def _try_take(self) -> float:
+        """Consume a token if one is available; otherwise return how long to wait for one"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            
+            return (1 - self._tokens) / self.rate
@@ -0,0 +1,129 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, Optional
+import config
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the PokeAPI while the circuit breaker is open"""
+
+class RetryPolicy:
+    """Decides whether and how long to wait before retrying a failed upstream request"""
+    
+    def __init__(self, max_retries: int = config.MAX_RETRIES, backoff_base: float = config.RETRY_BACKOFF_BASE,
+                 backoff_max: float = config.RETRY_BACKOFF_MAX,
+                 status_codes: Iterable[int] = config.RETRY_STATUS_CODES):
+        """
+        Args:
+            max_retries: Retries after the first attempt (0 disables retrying)
+            backoff_base: Backoff cap in seconds for the first retry; doubles on each retry
+            backoff_max: Upper bound on any single wait, including a server's Retry-After
+            status_codes: HTTP statuses treated as transient (rate limited or server error)
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.status_codes = frozenset(status_codes)
+    
+    def backoff(self, attempt: int, retry_after: Optional[str] = None) -> Optional[float]:
+        """
+        Return the delay before retry number `attempt + 1`, or None to give up
+        
+        Uses "full jitter" exponential backoff so concurrent clients don't retry
+        in lockstep. A Retry-After header is honored as a minimum wait; if the
+        server asks for longer than `backoff_max` the request is not retried.
+        """
+        if attempt >= self.max_retries:
+            return None
+            
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        requested = parse_retry_after(retry_after)
+        if requested is not None:
+            if requested > self.backoff_max:
+                return None
+            delay = max(delay, requested)
+        return delay
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds or as an HTTP date"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker for the PokeAPI
+    
+    After `failure_threshold` consecutive failed requests the circuit opens
+    and calls fail immediately with CircuitOpenError. Once `reset_timeout`
+    seconds have passed a single probe request is let through; its outcome
+    closes the circuit again or keeps it open for another period.
+    """
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+    
+    def __init__(self, failure_threshold: int = config.CIRCUIT_BREAKER_THRESHOLD,
+                 reset_timeout: float = config.CIRCUIT_BREAKER_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.times_opened = 0
+    
+    def before_call(self):
+        """Raise CircuitOpenError unless a request may be sent now"""
+        if self.failure_threshold <= 0:
+            return
+            
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            now = time.monotonic()
+            if now - self._opened_at >= self.reset_timeout:
+                # Let one probe through per period; everyone else keeps failing fast until it reports back
+                self.state = self.HALF_OPEN
+                self._opened_at = now
+                return
+            self.rejected += 1
+            raise CircuitOpenError("PokeAPI circuit breaker is open; failing fast")
+    
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self.state = self.CLOSED
+    
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and 0 < self.failure_threshold <= self._failures
+            ):
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self.times_opened += 1
+    
+    def stats(self) -> Dict:
+        """Return the breaker state and counters"""
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self._failures,
+                'times_opened': self.times_opened,
+                'rejected': self.rejected,
+            }
@@ -6,7 +6,7 @@ echo Checking Python installation...
 python --version
 if errorlevel 1 (
     echo Python is not installed or not in PATH!
-    echo Please install Python 3.7 or higher from https://python.org
+    echo Please install Python 3.10 or higher from https://python.org
     pause
     exit /b 1
 )
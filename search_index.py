@@ -0,0 +1,278 @@
+import asyncio
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+import config
+
+def bounded_levenshtein(a: str, b: str, max_distance: int) -> int:
+    """
+    Edit distance between `a` and `b`, or `max_distance + 1` if it is larger
+    
+    Swapping two adjacent letters counts as one edit (optimal string alignment),
+    since that is the most common typo. Only the diagonal band of width
+    2 * max_distance + 1 is computed and the scan stops as soon as a whole row
+    exceeds the bound.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if len(a) > len(b):
+        a, b = b, a
+        
+    too_far = max_distance + 1
+    before = None
+    previous = [j if j <= max_distance else too_far for j in range(len(b) + 1)]
+    for i, char_a in enumerate(a, 1):
+        current = [too_far] * (len(b) + 1)
+        current[0] = i if i <= max_distance else too_far
+        row_min = current[0]
+        for j in range(max(1, i - max_distance), min(len(b), i + max_distance) + 1):
+            distance = previous[j - 1] + (char_a != b[j - 1])
+            if previous[j] + 1 < distance:
+                distance = previous[j] + 1
+            if current[j - 1] + 1 < distance:
+                distance = current[j - 1] + 1
+            if before is not None and j > 1 and char_a == b[j - 2] and a[i - 2] == b[j - 1] \
+                    and before[j - 2] + 1 < distance:
+                distance = before[j - 2] + 1
+            current[j] = distance
+            if distance < row_min:
+                row_min = distance
+        if row_min > max_distance:
+            return too_far
+        before, previous = previous, current
+    return min(previous[-1], too_far)
+
+def _bigrams(word: str) -> set:
+    padded = f"^{word}$"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+class NameIndex:
+    """
+    Immutable in-memory index of Pokemon names and IDs
+    
+    Prefix matches come from binary search over the sorted names. Typo
+    matches use a bigram index to pick candidates (one edit changes at most
+    three bigrams, so a name within distance k shares all but 3k of the
+    query's bigrams) and a bounded edit distance to rank them.
+    """
+    
+    def __init__(self, entries: Iterable[Tuple[str, Optional[int]]]):
+        """
+        Args:
+            entries: (name, id) pairs, e.g. from the full /pokemon listing
+        """
+        ids_by_name = {name.lower(): pokemon_id for name, pokemon_id in entries}
+        self.names: List[str] = sorted(ids_by_name)
+        self._lengths = [len(name) for name in self.names]
+        self.ids_by_name = ids_by_name
+        self.names_by_id = {pokemon_id: name for name, pokemon_id in ids_by_name.items() if pokemon_id is not None}
+        # The listing is in ID order, so this is also listing order
+        self.ids: List[int] = sorted(self.names_by_id)
+        self._postings: Dict[str, List[int]] = {}
+        for position, name in enumerate(self.names):
+            for gram in _bigrams(name):
+                self._postings.setdefault(gram, []).append(position)
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def lookup(self, query: str) -> Optional[str]:
+        """Return the name for an exact name or numeric ID, if known"""
+        query = query.strip().lower()
+        if query in self.ids_by_name:
+            return query
+        if query.isdigit():
+            return self.names_by_id.get(int(query))
+        return None
+    
+    def position_after(self, pokemon_id: int) -> int:
+        """Listing offset of the first Pokemon with an ID above `pokemon_id`"""
+        return bisect_right(self.ids, pokemon_id)
+    
+    def prefix(self, query: str, limit: int = config.SEARCH_SUGGESTION_LIMIT) -> List[str]:
+        """Return up to `limit` names starting with `query`, alphabetically"""
+        query = query.strip().lower()
+        matches = []
+        position = bisect_left(self.names, query)
+        while position < len(self.names) and len(matches) < limit and self.names[position].startswith(query):
+            matches.append(self.names[position])
+            position += 1
+        return matches
+    
+    def fuzzy(self, query: str, max_distance: Optional[int] = None,
+              limit: int = config.SEARCH_SUGGESTION_LIMIT) -> List[Tuple[str, int]]:
+        """
+        Return names within `max_distance` edits of `query`
+        
+        Args:
+            query: Possibly misspelled name
+            max_distance: Edit distance allowed (default: scaled with the query length)
+            limit: Maximum number of matches
+            
+        Returns:
+            List of (name, distance), closest first
+        """
+        query = query.strip().lower()
+        if max_distance is None:
+            max_distance = self.default_max_distance(query)
+        if max_distance <= 0:
+            return []
+            
+        grams = _bigrams(query)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+            
+        required = max(1, len(grams) - 3 * max_distance)
+        matches = []
+        lengths = self._lengths
+        for position, count in shared.items():
+            if count < required or abs(lengths[position] - len(query)) > max_distance:
+                continue
+            name = self.names[position]
+            distance = bounded_levenshtein(query, name, max_distance)
+            if distance <= max_distance:
+                matches.append((name, distance))
+                
+        matches.sort(key=lambda match: (match[1], match[0]))
+        return matches[:limit]
+    
+    @staticmethod
+    def default_max_distance(query: str) -> int:
+        """Edits tolerated for a query: none for very short ones, one for short ones"""
+        if len(query) < 3:
+            return 0
+        if len(query) <= 5:
+            return 1
+        return config.SEARCH_FUZZY_MAX_DISTANCE
+    
+    def suggest(self, query: str, limit: int = config.SEARCH_SUGGESTION_LIMIT) -> List[str]:
+        """Autocomplete: the exact match, then prefix matches, then typo matches"""
+        query = query.strip().lower()
+        suggestions = []
+        exact = self.lookup(query)
+        if exact is not None:
+            suggestions.append(exact)
+        for name in self.prefix(query, limit):
+            if name not in suggestions:
+                suggestions.append(name)
+        if len(suggestions) < limit:
+            for name, _ in self.fuzzy(query, limit=limit):
+                if name not in suggestions:
+                    suggestions.append(name)
+        return suggestions[:limit]
+    
+    def resolve(self, query: str) -> Optional[str]:
+        """Best single name for a search query, or None if nothing is close"""
+        exact = self.lookup(query)
+        if exact is not None:
+            return exact
+        prefixed = self.prefix(query, 1)
+        if prefixed:
+            return prefixed[0]
+        close = self.fuzzy(query, limit=1)
+        return close[0][0] if close else None
+
+class SearchIndex:
+    """
+    Holds the current NameIndex and rebuilds it every `refresh_interval` seconds
+    
+    The first lookup builds the index synchronously; later rebuilds run on
+    a background thread while the previous index keeps answering. A failed
+    build (None) is retried after `retry_interval` seconds.
+    """
+    
+    def __init__(self, build: Callable[[], Optional[NameIndex]],
+                 refresh_interval: float = config.SEARCH_INDEX_REFRESH,
+                 retry_interval: float = config.SEARCH_INDEX_RETRY):
+        self.build = build
+        self.refresh_interval = refresh_interval
+        self.retry_interval = retry_interval
+        self._index: Optional[NameIndex] = None
+        self._built_at = 0.0
+        self._attempted_at = float('-inf')
+        self._build_lock = threading.Lock()
+        self._refreshing = False
+    
+    def get(self) -> Optional[NameIndex]:
+        """Return the current index (None until a build has succeeded)"""
+        index = self._index
+        now = time.monotonic()
+        if index is None:
+            with self._build_lock:
+                if self._index is None and now - self._attempted_at >= self.retry_interval:
+                    self._rebuild()
+            return self._index
+            
+        if now - self._built_at >= self.refresh_interval and now - self._attempted_at >= self.retry_interval:
+            with self._build_lock:
+                if self._refreshing:
+                    return index
+                self._refreshing = True
+            threading.Thread(target=self._background_rebuild, name="search-index-refresh", daemon=True).start()
+        return index
+    
+    def _rebuild(self):
+        self._attempted_at = time.monotonic()
+        try:
+            index = self.build()
+        except Exception as e:
+            print(f"Error building search index: {e}")
+            return
+        if index is not None:
+            self._index = index
+            self._built_at = time.monotonic()
+    
+    def _background_rebuild(self):
+        try:
+            self._rebuild()
+        finally:
+            with self._build_lock:
+                self._refreshing = False
+
+class AsyncSearchIndex:
+    """asyncio counterpart of SearchIndex; rebuilds run as tasks on the running loop"""
+    
+    def __init__(self, build: Callable[[], Awaitable[Optional[NameIndex]]],
+                 refresh_interval: float = config.SEARCH_INDEX_REFRESH,
+                 retry_interval: float = config.SEARCH_INDEX_RETRY):
+        self.build = build
+        self.refresh_interval = refresh_interval
+        self.retry_interval = retry_interval
+        self._index: Optional[NameIndex] = None
+        self._built_at = 0.0
+        self._attempted_at = float('-inf')
+        self._build_lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+    
+    async def get(self) -> Optional[NameIndex]:
+        """Return the current index (None until a build has succeeded)"""
+        index = self._index
+        now = time.monotonic()
+        if index is None:
+            async with self._build_lock:
+                if self._index is None and now - self._attempted_at >= self.retry_interval:
+                    await self._rebuild()
+            return self._index
+            
+        if (self._refresh_task is None and now - self._built_at >= self.refresh_interval
+                and now - self._attempted_at >= self.retry_interval):
+            self._refresh_task = asyncio.ensure_future(self._rebuild())
+            self._refresh_task.add_done_callback(self._refresh_done)
+        return index
+    
+    async def _rebuild(self):
+        self._attempted_at = time.monotonic()
+        try:
+            index = await self.build()
+        except Exception as e:
+            print(f"Error building search index: {e}")
+            return
+        if index is not None:
+            self._index = index
+            self._built_at = time.monotonic()
+    
+    def _refresh_done(self, task: asyncio.Task):
+        self._refresh_task = None
@@ -0,0 +1,112 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+class _Call:
+    """An in-flight call whose result is shared by every caller with the same key"""
+    
+    __slots__ = ('done', 'result', 'error')
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """Thread-safe de-duplication of concurrent calls for the same key"""
+    
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+    
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run `fn` unless a call for `key` is already in flight, in which case wait for it
+        
+        Args:
+            key: Identifies the resource being fetched
+            fn: Performs the fetch; called at most once per concurrent group of callers
+            
+        Returns:
+            The result of the shared call. If it raised, every waiting caller
+            sees the same exception.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+                
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+            
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # Forget the call before waking waiters so later callers start a fresh fetch
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+            
+        return call.result
+    
+    def stats(self) -> Dict:
+        """Return how many calls ran upstream and how many piggybacked on one in flight"""
+        with self._lock:
+            return {
+                'in_flight': len(self._calls),
+                'executed': self.executed,
+                'coalesced': self.coalesced,
+            }
+
+class AsyncSingleFlight:
+    """asyncio counterpart of SingleFlight; must only be used from one event loop"""
+    
+    def __init__(self):
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        self.executed = 0
+        self.coalesced = 0
+    
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await `fn()` unless a call for `key` is already in flight, in which case await that one
+        
+        The shared call runs as its own task, so a caller that is cancelled
+        (e.g. its client disconnected) does not cancel it for the others.
+        """
+        task = self._tasks.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = self._tasks[key] = asyncio.ensure_future(fn())
+            self.executed += 1
+            task.add_done_callback(lambda done: self._forget(key, done))
+            
+        return await asyncio.shield(task)
+    
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # Mark the exception as retrieved even if every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+    
+    def stats(self) -> Dict:
+        """Return how many calls ran upstream and how many piggybacked on one in flight"""
+        return {
+            'in_flight': len(self._tasks),
+            'executed': self.executed,
+            'coalesced': self.coalesced,
+        }
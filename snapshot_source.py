@@ -0,0 +1,97 @@
+import gzip
+import json
+from typing import Dict, Iterator, List, Optional
+import config
+
+SNAPSHOT_FORMAT = "pokemon-viewer-snapshot"
+SNAPSHOT_VERSION = 1
+
+def read_snapshot(path: str) -> Dict:
+    """Load and validate a snapshot file written by build_snapshot.py"""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        snapshot = json.load(f)
+    
+    if snapshot.get('format') != SNAPSHOT_FORMAT:
+        raise ValueError(f"{path} is not a Pokemon Viewer snapshot")
+    if snapshot.get('version') != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {snapshot.get('version')} in {path} "
+                         f"(expected {SNAPSHOT_VERSION}); rebuild it with build_snapshot.py")
+    return snapshot
+
+def write_snapshot(path: str, snapshot: Dict):
+    """Write a snapshot as compact gzip-compressed JSON"""
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        json.dump(snapshot, f, separators=(',', ':'))
+
+class SnapshotClient:
+    """PokeAPIClient-compatible data source served entirely from a local snapshot file"""
+    
+    def __init__(self, path: str = config.SNAPSHOT_PATH, base_url: str = config.POKEAPI_BASE_URL):
+        self.path = path
+        self.base_url = base_url
+        # No response cache is needed: every lookup is already a dict access
+        self.cache = None
+        
+        snapshot = read_snapshot(path)
+        self.created_at = snapshot.get('created_at')
+        self.pokemon: List[Dict] = snapshot['pokemon']
+        self._details_by_name = {entry['name']: entry['details'] for entry in self.pokemon}
+        self._details_by_id = {entry['details']['id']: entry['details'] for entry in self.pokemon}
+        self._species_by_id = {int(species_id): species for species_id, species in snapshot['species'].items()}
+    
+    def get_pokemon_list(self, limit: int = 20, offset: int = 0) -> Dict:
+        """
+        Get a paginated list of Pokemon, shaped like the PokeAPI response
+        
+        Args:
+            limit: Number of Pokemon to fetch (default: 20)
+            offset: Starting position (default: 0)
+            
+        Returns:
+            Dict containing Pokemon list and pagination info
+        """
+        count = len(self.pokemon)
+        offset = max(0, offset)
+        end = min(count, offset + limit)
+        
+        return {
+            'count': count,
+            'next': f"{self.base_url}/pokemon?offset={end}&limit={limit}" if end < count else None,
+            'previous': f"{self.base_url}/pokemon?offset={max(0, offset - limit)}&limit={limit}" if offset > 0 else None,
+            'results': [
+                {'name': entry['name'], 'url': f"{self.base_url}/pokemon/{entry['details']['id']}/"}
+                for entry in self.pokemon[offset:end]
+            ]
+        }
+    
+    def get_pokemon_details(self, pokemon_name: str) -> Optional[Dict]:
+        """
+        Get detailed information about a specific Pokemon
+        
+        Args:
+            pokemon_name: Name or ID of the Pokemon
+            
+        Returns:
+            Dict containing Pokemon details or None if not found
+        """
+        key = str(pokemon_name).lower()
+        if key.isdigit():
+            return self._details_by_id.get(int(key))
+        return self._details_by_name.get(key)
+    
+    def get_pokemon_species(self, pokemon_id: int) -> Optional[Dict]:
+        """
+        Get Pokemon species information for description
+        
+        Args:
+            pokemon_id: ID of the Pokemon species
+            
+        Returns:
+            Dict containing species information or None if not found
+        """
+        return self._species_by_id.get(int(pokemon_id))
+    
+    def iter_pokemon_details(self) -> Iterator[Dict]:
+        """Iterate over the details of every Pokemon in the snapshot, in list order"""
+        for entry in self.pokemon:
+            yield entry['details']
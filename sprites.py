@@ -0,0 +1,288 @@
+import hashlib
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import requests
+import config
+from cache import MemoryCache
+from single_flight import SingleFlight
+
+try:
+    from PIL import Image
+except ImportError:
+    # Optional: without it only full-size sprites are served (no thumbnails or sprite sheets)
+    Image = None
+
+# Path of each sprite variant under SPRITE_BASE_URL, as PokeAPI's sprite repository lays them out
+SPRITE_VARIANTS = {'front': '{id}.png', 'back': 'back/{id}.png', 'shiny': 'shiny/{id}.png'}
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# Edge of PokeAPI's default sprites, and of full-size sprite sheet cells
+FULL_SIZE = 96
+
+def thumbnails_available() -> bool:
+    """Whether this process can build thumbnails and sprite sheets (Pillow is installed)"""
+    return Image is not None
+
+def sprite_size(params) -> Optional[int]:
+    """
+    The `size` parameter of a sprite request
+    
+    Args:
+        params: Request arguments with `getlist()` (Flask or Starlette)
+        
+    Returns:
+        One of SPRITE_THUMBNAIL_SIZES, or None for the full-size sprite
+        
+    Raises:
+        ValueError: On a size that isn't offered, or any size without Pillow
+    """
+    values = params.getlist('size')
+    if not values or not values[-1].strip():
+        return None
+    sizes = ', '.join(str(size) for size in config.SPRITE_THUMBNAIL_SIZES)
+    try:
+        size = int(values[-1])
+    except ValueError:
+        raise ValueError(f"'size' must be one of {sizes}")
+    if size not in config.SPRITE_THUMBNAIL_SIZES:
+        raise ValueError(f"'size' must be one of {sizes}")
+    if not thumbnails_available():
+        raise ValueError("Sprite thumbnails need the Pillow package")
+    return size
+
+def sheet_options(params) -> Tuple[List[int], str, Optional[int]]:
+    """
+    Pokemon IDs, variant and size of a /sprites/sheet request (ids=1,2,3&variant=front&size=48)
+    
+    Args:
+        params: Request arguments with `getlist()` (Flask or Starlette)
+        
+    Returns:
+        (IDs in sheet order, variant, thumbnail size or None for full size)
+        
+    Raises:
+        ValueError: On malformed or too many IDs, an unknown variant or size, or without Pillow
+    """
+    values = params.getlist('ids')
+    try:
+        ids = [int(value) for value in values[-1].split(',')] if values else []
+    except ValueError:
+        raise ValueError("'ids' must be a comma-separated list of Pokemon IDs")
+    if not ids or any(pokemon_id < 1 for pokemon_id in ids):
+        raise ValueError("'ids' must be a comma-separated list of Pokemon IDs")
+    if len(ids) > config.MAX_PAGE_SIZE:
+        raise ValueError(f"'ids' may hold at most {config.MAX_PAGE_SIZE} Pokemon")
+    variants = params.getlist('variant')
+    variant = variants[-1].strip().lower() if variants else 'front'
+    if variant not in SPRITE_VARIANTS:
+        raise ValueError(f"'variant' must be one of {', '.join(SPRITE_VARIANTS)}")
+    size = sprite_size(params)
+    if not thumbnails_available():
+        raise ValueError("Sprite sheets need the Pillow package")
+    return ids, variant, size
+
+@dataclass(frozen=True)
+class Sprite:
+    """A stored PNG and the digest it is kept under"""
+    digest: str
+    body: bytes
+    
+    @property
+    def etag(self) -> str:
+        return f'"{self.digest}"'
+
+class SpriteStore:
+    """
+    Pokemon sprites proxied from SPRITE_BASE_URL and kept on disk by content hash
+    
+    Each sprite is fetched once. `<directory>/<digest>.png` holds the image and
+    a small ref file maps the sprite (Pokemon, variant, size) to its digest, so
+    identical images are stored once and the store survives restarts and is
+    shared by every server process. Sprites upstream doesn't have are
+    remembered for SPRITE_MISSING_TTL seconds.
+    
+    With Pillow installed, fetching a sprite also stores its SPRITE_THUMBNAIL_SIZES
+    thumbnails, and sprite sheets (one strip image for a page of Pokemon) are
+    built from stored sprites and kept the same way.
+    
+    Blocking: the ASGI app calls it from a worker thread.
+    """
+    
+    def __init__(self, directory: str = config.SPRITE_CACHE_DIR, base_url: str = config.SPRITE_BASE_URL,
+                 session: Optional[requests.Session] = None):
+        self.directory = Path(directory)
+        self.base_url = base_url.rstrip('/')
+        self.session = session or requests.Session()
+        self.timeout = (config.CONNECT_TIMEOUT, config.READ_TIMEOUT)
+        # Digests of sprites already resolved, and None for sprites upstream doesn't have
+        self._refs = MemoryCache()
+        self.single_flight = SingleFlight()
+        # Fetches the sprites of a sheet together
+        self.executor = ThreadPoolExecutor(max_workers=config.MAX_CONCURRENT_REQUESTS, thread_name_prefix="sprite-fetch")
+        self.fetched = 0
+        self.missing = 0
+    
+    def get(self, pokemon_id: int, variant: str = 'front', size: Optional[int] = None) -> Optional[Sprite]:
+        """
+        A Pokemon's sprite, fetched and stored on first use
+        
+        Args:
+            pokemon_id: Pokemon ID
+            variant: One of SPRITE_VARIANTS
+            size: One of SPRITE_THUMBNAIL_SIZES, or None for the full-size sprite (thumbnails need Pillow)
+            
+        Returns:
+            Sprite, or None if upstream has no such sprite
+            
+        Raises:
+            requests.RequestException: If upstream can't be reached or fails
+            ValueError: If upstream answers with something that isn't a PNG
+        """
+        name = f"{pokemon_id}-{variant}-{size or 'full'}"
+        entry = self._refs.get(name)
+        if entry is not None and entry.value is None:
+            # Upstream recently answered that there is no such sprite
+            return None
+        sprite = self._stored(name, entry.value if entry is not None else None)
+        if sprite is not None:
+            return sprite
+        digest = self.single_flight.do(name, lambda: self._load(name, pokemon_id, variant, size))
+        return self._read(digest) if digest is not None else None
+    
+    def get_sheet(self, pokemon_ids: List[int], variant: str = 'front',
+                  size: Optional[int] = None) -> Tuple[Sprite, bool]:
+        """
+        One PNG strip of the given Pokemon's sprites, left to right in the given order (needs Pillow)
+        
+        Every cell is `size` (or FULL_SIZE) pixels square, so the sprite of the
+        n-th ID starts at x = n * height. Sprites upstream doesn't have leave
+        their cell transparent.
+        
+        Returns:
+            (sheet, complete): complete is False when a sprite failed to load, so
+            the sheet shouldn't be cached for long
+        """
+        def load(pokemon_id: int) -> Tuple[Optional[Sprite], bool]:
+            try:
+                return self.get(pokemon_id, variant, size), True
+            except Exception as e:
+                print(f"Error loading sprite {pokemon_id}/{variant}: {e}")
+                return None, False
+                
+        loaded = list(self.executor.map(load, pokemon_ids))
+        sprites = [sprite for sprite, _ in loaded]
+        # A sheet is determined by its layout and the images in it, so those name it
+        layout = f"{variant}:{size}:" + ','.join(sprite.digest if sprite else '-' for sprite in sprites)
+        name = f"sheet-{hashlib.blake2b(layout.encode(), digest_size=16).hexdigest()}"
+        entry = self._refs.get(name)
+        sheet = self._stored(name, entry.value if entry is not None else None)
+        if sheet is None:
+            sheet = self._read(self.single_flight.do(name, lambda: self._save(name, self._compose(sprites, size))))
+        return sheet, all(ok for _, ok in loaded)
+    
+    def stats(self) -> Dict:
+        """Sprite proxy counters"""
+        return {'fetched': self.fetched, 'missing': self.missing, 'thumbnails': thumbnails_available(),
+                'refs': self._refs.stats()}
+    
+    def _stored(self, name: str, digest: Optional[str] = None) -> Optional[Sprite]:
+        """The stored sprite called `name`, or None if it hasn't been fetched yet"""
+        try:
+            if digest is None:
+                digest = (self.directory / 'refs' / name).read_text().strip()
+            sprite = self._read(digest)
+        except FileNotFoundError:
+            # Never fetched, or the image was removed from under its ref: fetch it (again)
+            return None
+        self._refs.set(name, digest, ttl=float('inf'))
+        return sprite
+    
+    def _load(self, name: str, pokemon_id: int, variant: str, size: Optional[int]) -> Optional[str]:
+        """Fetch or build the sprite called `name` and store it; returns its digest, or None if upstream has none"""
+        if size is not None:
+            full = self.get(pokemon_id, variant)
+            return self._save(name, self._thumbnail(full.body, size)) if full is not None else None
+            
+        url = f"{self.base_url}/{SPRITE_VARIANTS[variant].format(id=pokemon_id)}"
+        response = self.session.get(url, timeout=self.timeout)
+        if response.status_code == 404:
+            self.missing += 1
+            self._refs.set(name, None, ttl=config.SPRITE_MISSING_TTL)
+            return None
+        response.raise_for_status()
+        if not response.content.startswith(PNG_SIGNATURE):
+            raise ValueError(f"{url} did not return a PNG")
+        self.fetched += 1
+        
+        digest = self._save(name, response.content)
+        if thumbnails_available():
+            # Every thumbnail size is built now, while the sprite is at hand, so later requests are plain reads
+            for thumbnail_size in config.SPRITE_THUMBNAIL_SIZES:
+                self._save(f"{pokemon_id}-{variant}-{thumbnail_size}", self._thumbnail(response.content, thumbnail_size))
+        return digest
+    
+    def _save(self, name: str, body: bytes) -> str:
+        """Store an image under its content hash and point the ref `name` at it; returns the digest"""
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        path = self.directory / f"{digest}.png"
+        if not path.exists():
+            self._write(path, body)
+        self._write(self.directory / 'refs' / name, digest.encode())
+        self._refs.set(name, digest, ttl=float('inf'))
+        return digest
+    
+    @staticmethod
+    def _write(path: Path, data: bytes):
+        """Write a file atomically, so other threads and processes never read a partial image"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temporary.write_bytes(data)
+        os.replace(temporary, path)
+    
+    def _read(self, digest: str) -> Sprite:
+        return Sprite(digest, (self.directory / f"{digest}.png").read_bytes())
+    
+    @classmethod
+    def _thumbnail(cls, body: bytes, size: int) -> bytes:
+        with Image.open(io.BytesIO(body)) as image:
+            return cls._png(cls._fit(image, size))
+    
+    @classmethod
+    def _compose(cls, sprites: List[Optional[Sprite]], size: Optional[int]) -> bytes:
+        cell = size or FULL_SIZE
+        sheet = Image.new('RGBA', (cell * len(sprites), cell))
+        for position, sprite in enumerate(sprites):
+            if sprite is not None:
+                with Image.open(io.BytesIO(sprite.body)) as image:
+                    sheet.paste(cls._fit(image, cell), (position * cell, 0))
+        return cls._png(sheet)
+    
+    @staticmethod
+    def _fit(image: 'Image.Image', size: int) -> 'Image.Image':
+        """The image scaled down to fit a transparent `size` x `size` square, centred"""
+        image = image.convert('RGBA')
+        # Box filtering keeps pixel art crisper than Lanczos at these small reductions
+        image.thumbnail((size, size), Image.Resampling.BOX)
+        square = Image.new('RGBA', (size, size))
+        square.paste(image, ((size - image.width) // 2, (size - image.height) // 2))
+        return square
+    
+    @staticmethod
+    def _png(image: 'Image.Image') -> bytes:
+        """Encode as PNG; pixel art with few colours is stored as a palette image when that is lossless and smaller"""
+        encodings = [image]
+        colors = image.getcolors(256)
+        if colors is not None:
+            palette = image.quantize(colors=len(colors), method=Image.Quantize.FASTOCTREE)
+            if palette.convert('RGBA').tobytes() == image.tobytes():
+                encodings.append(palette)
+        bodies = []
+        for encoding in encodings:
+            buffer = io.BytesIO()
+            encoding.save(buffer, 'PNG', optimize=True)
+            bodies.append(buffer.getvalue())
+        return min(bodies, key=len)
@@ -0,0 +1,265 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+import config
+from dex_index import STAT_FIELDS, _field_name
+
+# Rows of the stat matrix
+STAT_COLUMNS = STAT_FIELDS + ('base_experience',)
+DEFAULT_PERCENTILES = (25, 50, 75, 90, 99)
+
+@dataclass(frozen=True)
+class StatsQuery:
+    """Parameters of an /api/stats request"""
+    # Columns to report on (default: all of STAT_COLUMNS)
+    stats: Tuple[str, ...] = STAT_COLUMNS
+    # Only Pokemon having every one of these types
+    types: Tuple[str, ...] = ()
+    percentiles: Tuple[float, ...] = DEFAULT_PERCENTILES
+    # Number of highest Pokemon listed per reported column
+    top: int = 10
+    
+    @classmethod
+    def from_params(cls, params) -> 'StatsQuery':
+        """
+        Parse query string parameters such as stat=speed&type=fire&top=5&percentiles=50,90
+        
+        Args:
+            params: Request arguments with `getlist()` (Flask or Starlette)
+            
+        Returns:
+            StatsQuery (defaults for anything missing)
+            
+        Raises:
+            ValueError: On an unknown stat, a bad percentile or a bad top count
+        """
+        stats = []
+        for value in params.getlist('stat'):
+            for name in filter(None, (part.strip().lower() for part in value.split(','))):
+                field = _field_name(name)
+                if field not in STAT_COLUMNS:
+                    raise ValueError(f"Unknown stat '{name}'")
+                if field not in stats:
+                    stats.append(field)
+                    
+        types = tuple(value.strip().lower() for value in params.getlist('type') if value.strip())
+        
+        percentiles = DEFAULT_PERCENTILES
+        if params.getlist('percentiles'):
+            try:
+                percentiles = tuple(float(part) for part in params.getlist('percentiles')[-1].split(',') if part.strip())
+            except ValueError:
+                raise ValueError("'percentiles' must be comma separated numbers")
+            if not all(0 <= value <= 100 for value in percentiles):
+                raise ValueError("'percentiles' must be between 0 and 100")
+                
+        top = 10
+        if params.getlist('top'):
+            try:
+                top = int(params.getlist('top')[-1])
+            except ValueError:
+                raise ValueError("'top' must be an integer")
+            top = max(0, min(top, config.MAX_PAGE_SIZE))
+            
+        return cls(stats=tuple(stats) or STAT_COLUMNS, types=types, percentiles=percentiles, top=top)
+
+class StatStore:
+    """
+    Immutable columnar store of Pokemon base stats
+    
+    Stats live in one float matrix with a row per STAT_COLUMNS entry and a
+    column per Pokemon in ID order (NaN where PokeAPI has no value, e.g. a
+    null base_experience). Types are bit masks, one uint64 per Pokemon, so
+    selecting "fire and flying" is a single vectorized AND. Aggregates run
+    over whole rows in NumPy instead of looping over Pokemon documents.
+    """
+    
+    def __init__(self, details: Iterable[Dict]):
+        """
+        Args:
+            details: PokeAPI /pokemon documents (full or trimmed); duplicates by ID are collapsed
+        """
+        documents = sorted({document['id']: document for document in details}.items())
+        self.size = len(documents)
+        self.ids = np.fromiter((pokemon_id for pokemon_id, _ in documents), dtype=np.int64, count=self.size)
+        self.names: List[str] = [document['name'] for _, document in documents]
+        
+        self.values = np.full((len(STAT_COLUMNS), self.size), np.nan)
+        type_names = set()
+        for column, (_, document) in enumerate(documents):
+            for stat in document.get('stats', []):
+                name = stat['stat']['name']
+                if name in STAT_FIELDS and stat.get('base_stat') is not None:
+                    self.values[STAT_FIELDS.index(name), column] = stat['base_stat']
+            if document.get('base_experience') is not None:
+                self.values[-1, column] = document['base_experience']
+            type_names.update(type_info['type']['name'] for type_info in document.get('types', []))
+            
+        # PokeAPI has 20 types, well within one 64-bit mask
+        self.type_bits: Dict[str, int] = {name: bit for bit, name in enumerate(sorted(type_names)[:64])}
+        self.type_masks = np.zeros(self.size, dtype=np.uint64)
+        for column, (_, document) in enumerate(documents):
+            mask = 0
+            for type_info in document.get('types', []):
+                bit = self.type_bits.get(type_info['type']['name'])
+                if bit is not None:
+                    mask |= 1 << bit
+            self.type_masks[column] = mask
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def column(self, pokemon_id: int) -> Optional[int]:
+        """Position of a Pokemon in the store, or None if it isn't stored"""
+        position = int(np.searchsorted(self.ids, pokemon_id))
+        if position < self.size and self.ids[position] == pokemon_id:
+            return position
+        return None
+    
+    def battle_stats(self, pokemon_id: int) -> Optional[Dict[str, int]]:
+        """Base stats of one Pokemon keyed like battle_pokemon_from_details, or None if it isn't stored"""
+        position = self.column(pokemon_id)
+        if position is None:
+            return None
+        values = self.values[:len(STAT_FIELDS), position]
+        return {field: int(value) if not np.isnan(value) else 50 for field, value in zip(STAT_FIELDS, values)}
+    
+    def battle_roster(self, pokemon_ids: Optional[Iterable[int]] = None) -> Tuple[List[str], np.ndarray]:
+        """
+        Names and battle stats of several Pokemon, e.g. for a tournament
+        
+        Args:
+            pokemon_ids: Pokemon to include, in order (default: every stored Pokemon); unknown IDs are skipped
+            
+        Returns:
+            (names, int32 array of shape (Pokemon, len(STAT_FIELDS))), missing stats set to 50 like battle_stats
+        """
+        if pokemon_ids is None:
+            positions = np.arange(self.size)
+        else:
+            wanted = np.fromiter(pokemon_ids, dtype=np.int64)
+            positions = np.minimum(np.searchsorted(self.ids, wanted), max(self.size - 1, 0))
+            positions = positions[self.ids[positions] == wanted] if self.size else positions[:0]
+        stats = np.nan_to_num(self.values[:len(STAT_FIELDS), positions].T, nan=50).astype(np.int32)
+        return [self.names[position] for position in positions], stats
+    
+    def select(self, types: Iterable[str] = ()) -> np.ndarray:
+        """Boolean mask of the Pokemon having every one of `types`"""
+        wanted = 0
+        for name in types:
+            if name not in self.type_bits:
+                return np.zeros(self.size, dtype=bool)
+            wanted |= 1 << self.type_bits[name]
+        wanted = np.uint64(wanted)
+        return (self.type_masks & wanted) == wanted
+    
+    def describe(self, rows: np.ndarray, stats: Tuple[str, ...] = STAT_COLUMNS,
+                 percentiles: Tuple[float, ...] = DEFAULT_PERCENTILES) -> Dict[str, Dict]:
+        """
+        Summary statistics of the selected Pokemon
+        
+        Args:
+            rows: Boolean selection mask (see `select`)
+            stats: Columns to summarise
+            percentiles: Percentiles to compute, 0-100
+            
+        Returns:
+            Dict of stat -> count, min, max, mean, std and percentiles (None for an empty selection)
+        """
+        values = self.values[[STAT_COLUMNS.index(stat) for stat in stats]][:, rows]
+        present = ~np.isnan(values)
+        if present.all():
+            # Common case: one pass over the whole matrix per aggregate
+            columns = [values]
+        else:
+            columns = [values[row][present[row]][None, :] for row in range(len(stats))]
+            
+        summary = {}
+        row = 0
+        for block in columns:
+            if block.shape[1]:
+                aggregates = zip(block.min(axis=1), block.max(axis=1), block.mean(axis=1), block.std(axis=1),
+                                 np.percentile(block, percentiles, axis=1).T if percentiles else [()] * len(block))
+            else:
+                aggregates = [None] * len(block)
+            for aggregate in aggregates:
+                stat = stats[row]
+                row += 1
+                if aggregate is None:
+                    summary[stat] = {'count': 0, 'min': None, 'max': None, 'mean': None, 'std': None,
+                                     'percentiles': {_percentile_key(p): None for p in percentiles}}
+                    continue
+                stat_min, stat_max, mean, std, ranks = aggregate
+                summary[stat] = {
+                    'count': block.shape[1],
+                    'min': float(stat_min),
+                    'max': float(stat_max),
+                    'mean': round(float(mean), 2),
+                    'std': round(float(std), 2),
+                    'percentiles': {_percentile_key(p): round(float(value), 2) for p, value in zip(percentiles, ranks)},
+                }
+        return summary
+    
+    def top(self, stat: str, rows: np.ndarray, count: int) -> List[Dict]:
+        """
+        The `count` selected Pokemon with the highest `stat`, highest first (ties by ID)
+        
+        Uses a partial partition, so only the winners are fully sorted.
+        """
+        positions = np.flatnonzero(rows)
+        column = self.values[STAT_COLUMNS.index(stat), positions]
+        positions, column = positions[~np.isnan(column)], column[~np.isnan(column)]
+        count = min(count, len(positions))
+        if count <= 0:
+            return []
+        if count < len(positions):
+            # Everything tied with the count-th value takes part in the final sort, so ties resolve by ID
+            threshold = -np.partition(-column, count - 1)[count - 1]
+            keep = column >= threshold
+            positions, column = positions[keep], column[keep]
+        order = np.lexsort((positions, -column))[:count]
+        return [{'id': int(self.ids[p]), 'name': self.names[p], 'value': float(column[i])}
+                for i, p in zip(order, positions[order])]
+    
+    def type_means(self, rows: np.ndarray, stats: Tuple[str, ...] = STAT_COLUMNS) -> Dict[str, Dict]:
+        """
+        Average of each stat per type over the selected Pokemon
+        
+        Builds a type x Pokemon membership matrix from the bit masks and gets
+        every per-type sum with one matrix product.
+        
+        Returns:
+            Dict of type -> {'count': Pokemon of that type, 'mean': {stat: average}}
+        """
+        bits = np.array(list(self.type_bits.values()), dtype=np.uint64)
+        membership = ((self.type_masks[rows][None, :] >> bits[:, None]) & np.uint64(1)).astype(np.float64)
+        values = self.values[[STAT_COLUMNS.index(stat) for stat in stats]][:, rows]
+        present = ~np.isnan(values)
+        sums = membership @ np.where(present, values, 0.0).T
+        counts = membership @ present.T.astype(np.float64)
+        members = membership.sum(axis=1)
+        
+        means = {}
+        for row, name in enumerate(self.type_bits):
+            if not members[row]:
+                continue
+            means[name] = {
+                'count': int(members[row]),
+                'mean': {stat: round(float(sums[row, i] / counts[row, i]), 2) if counts[row, i] else None
+                         for i, stat in enumerate(stats)},
+            }
+        return means
+    
+    def report(self, query: StatsQuery) -> Dict:
+        """Everything /api/stats returns for `query`: summaries, top Pokemon and per-type averages"""
+        rows = self.select(query.types)
+        return {
+            'count': int(rows.sum()),
+            'types': list(query.types),
+            'stats': self.describe(rows, query.stats, query.percentiles),
+            'top': {stat: self.top(stat, rows, query.top) for stat in query.stats} if query.top else {},
+            'by_type': self.type_means(rows, query.stats),
+        }
+
+def _percentile_key(percentile: float) -> str:
+    return f"p{percentile:g}"
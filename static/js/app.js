@@ -3,11 +3,19 @@ class PokemonViewer {
     constructor() {
         this.currentPage = 1;
         this.isLoading = false;
+        this.suggestTimer = null;
+        // Live channel (/ws) for streamed pages and battle turns; replies are routed by message id
+        this.socketReady = null;
+        this.socketUnavailable = false;
+        this.socketHandlers = new Map();
+        this.nextMessageId = 1;
         this.battleState = {
             pokemon1: null,
             pokemon2: null,
             currentTurn: 1, // Always start with player 1
             isActive: false,
+            sessionId: null, // Battle state lives on the server; turns send only the action
+            computerAction: null,
             pokemonList: []
         };
         this.init();
@@ -48,6 +56,12 @@ class PokemonViewer {
             }
         });
 
+        document.getElementById('search-input').addEventListener('input', (e) => {
+            // Wait for a pause in typing before asking for suggestions
+            clearTimeout(this.suggestTimer);
+            this.suggestTimer = setTimeout(() => this.loadSuggestions(e.target.value.trim()), 150);
+        });
+
         // Modal
         document.getElementById('pokemon-modal').addEventListener('click', (e) => {
             if (e.target.id === 'pokemon-modal' || e.target.classList.contains('modal-close')) {
@@ -118,17 +132,24 @@ class PokemonViewer {
         this.showSkeletonLoading();
 
         try {
-            const response = await fetch(`/api/pokemon?page=${page}&limit=12`);
-            
-            if (!response.ok) {
-                throw new Error(`HTTP error! status: ${response.status}`);
-            }
+            const socket = await this.connectSocket();
+            if (socket) {
+                // Cards replace their skeletons one by one as each Pokemon loads
+                await this.streamPokemonPage(socket, page);
+            } else {
+                // Columnar pages name each field once instead of once per Pokemon
+                const response = await fetch(`/api/pokemon?page=${page}&limit=12&format=columns`);
+                
+                if (!response.ok) {
+                    throw new Error(`HTTP error! status: ${response.status}`);
+                }
 
-            const data = await response.json();
+                const data = await response.json();
+                this.renderPokemonGrid(this.pokemonFromColumns(data.pokemon));
+                this.updatePagination(data.pagination);
+            }
             
             this.currentPage = page;
-            this.renderPokemonGrid(data.pokemon);
-            this.updatePagination(data.pagination);
             this.hideLoading();
 
         } catch (error) {
@@ -139,6 +160,124 @@ class PokemonViewer {
         }
     }
 
+    // Rebuild one object per Pokemon from a format=columns page ({"id": [...], "name": [...]})
+    pokemonFromColumns(columns) {
+        const fields = Object.keys(columns);
+        const count = fields.length ? columns[fields[0]].length : 0;
+        return Array.from({ length: count }, (_, row) => {
+            const pokemon = {};
+            fields.forEach(field => {
+                pokemon[field] = columns[field][row];
+            });
+            return pokemon;
+        });
+    }
+
+    streamPokemonPage(socket, page) {
+        const grid = document.getElementById('pokemon-grid');
+        const slots = Array.from(grid.children);
+        
+        return new Promise((resolve, reject) => {
+            this.sendSocketMessage(socket, { type: 'page', page: page, limit: 12 }, message => {
+                if (message.type === 'page') {
+                    this.updatePagination(message.pagination);
+                } else if (message.type === 'pokemon') {
+                    const card = this.createPokemonCard(message.pokemon);
+                    if (slots[message.index]) {
+                        slots[message.index].replaceWith(card);
+                        slots[message.index] = card;
+                    } else {
+                        grid.appendChild(card);
+                    }
+                } else if (message.type === 'done') {
+                    // Skeletons left over belong to Pokemon that failed to load or a short last page
+                    slots.forEach(slot => {
+                        if (slot.classList.contains('skeleton-card')) slot.remove();
+                    });
+                    resolve();
+                    return true;
+                } else if (message.type === 'error') {
+                    reject(new Error(message.error));
+                    return true;
+                }
+                return false;
+            });
+        });
+    }
+
+    // Resolves to the open live channel, or null when WebSockets aren't available (the caller falls back to HTTP)
+    connectSocket() {
+        if (this.socketUnavailable || !('WebSocket' in window)) {
+            return Promise.resolve(null);
+        }
+        
+        if (!this.socketReady) {
+            this.socketReady = new Promise(resolve => {
+                const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+                const socket = new WebSocket(`${protocol}//${window.location.host}/ws`);
+                let opened = false;
+                
+                socket.onopen = () => {
+                    opened = true;
+                    resolve(socket);
+                };
+                socket.onmessage = (event) => {
+                    const message = JSON.parse(event.data);
+                    const handler = this.socketHandlers.get(message.id);
+                    if (handler) handler(message);
+                };
+                socket.onclose = () => {
+                    // A server without /ws never opens the socket; stay on HTTP from then on
+                    if (!opened) this.socketUnavailable = true;
+                    this.socketReady = null;
+                    this.socketHandlers.forEach(handler => handler({ type: 'error', error: 'Connection closed' }));
+                    this.socketHandlers.clear();
+                    resolve(null);
+                };
+            });
+        }
+        return this.socketReady;
+    }
+
+    // onMessage receives every reply to the message until it returns true
+    sendSocketMessage(socket, message, onMessage) {
+        const id = this.nextMessageId++;
+        this.socketHandlers.set(id, reply => {
+            if (onMessage(reply)) this.socketHandlers.delete(id);
+        });
+        socket.send(JSON.stringify({ ...message, id: id }));
+    }
+
+    // Battle session calls go over the live channel when it is open, otherwise to the HTTP endpoint
+    async battleRequest(message, url, method = 'POST') {
+        const socket = await this.connectSocket();
+        if (socket) {
+            return new Promise((resolve, reject) => {
+                this.sendSocketMessage(socket, message, reply => {
+                    if (reply.type === 'error') {
+                        reject(new Error(reply.error));
+                    } else {
+                        resolve(reply);
+                    }
+                    return true;
+                });
+            });
+        }
+        
+        const response = await fetch(url, {
+            method: method,
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: method === 'POST' ? JSON.stringify(message) : undefined
+        });
+        const body = response.status === 204 ? {} : await response.json();
+        if (!response.ok) {
+            throw new Error(body.error);
+        }
+        return body;
+    }
+
     showSkeletonLoading() {
         const grid = document.getElementById('pokemon-grid');
         grid.innerHTML = '';
@@ -212,13 +351,45 @@ class PokemonViewer {
         const grid = document.getElementById('pokemon-grid');
         grid.innerHTML = '';
 
-        pokemonList.forEach(pokemon => {
-            const card = this.createPokemonCard(pokemon);
+        // The whole page is known up front, so its sprites come as one sheet instead of one request per card
+        const images = pokemonList.map(pokemon => {
+            const card = this.createPokemonCard(pokemon, { deferSprite: true });
             grid.appendChild(card);
+            return card.querySelector('.pokemon-image img');
         });
+        this.applySpriteSheet(pokemonList, images);
+    }
+
+    // Sprites are served by this app's /sprites proxy (cached on its disk) rather than by the upstream origin
+    spriteUrl(pokemon, variant = 'front') {
+        return pokemon.id ? `/sprites/${pokemon.id}/${variant}` : '/static/images/pokeball.png';
+    }
+
+    // Cut a /sprites/sheet strip into the card images; without sheet support (no Pillow) each card loads its own sprite
+    applySpriteSheet(pokemonList, images) {
+        if (pokemonList.length === 0) return;
+        
+        const sheet = new Image();
+        sheet.onload = () => {
+            const cell = sheet.height;
+            const canvas = document.createElement('canvas');
+            canvas.width = canvas.height = cell;
+            const context = canvas.getContext('2d');
+            images.forEach((img, index) => {
+                context.clearRect(0, 0, cell, cell);
+                context.drawImage(sheet, index * cell, 0, cell, cell, 0, 0, cell, cell);
+                img.src = canvas.toDataURL('image/png');
+            });
+        };
+        sheet.onerror = () => {
+            images.forEach((img, index) => {
+                img.src = this.spriteUrl(pokemonList[index]);
+            });
+        };
+        sheet.src = `/sprites/sheet?ids=${pokemonList.map(pokemon => pokemon.id).join(',')}`;
     }
 
-    createPokemonCard(pokemon) {
+    createPokemonCard(pokemon, { deferSprite = false } = {}) {
         const card = document.createElement('div');
         card.className = 'pokemon-card';
         card.onclick = () => this.showPokemonDetails(pokemon);
@@ -233,9 +404,9 @@ class PokemonViewer {
                 <h3 class="pokemon-name">${pokemon.name}</h3>
             </div>
             <div class="pokemon-image">
-                <img src="${pokemon.sprite_url || '/static/images/pokeball.png'}" 
+                <img ${deferSprite ? '' : `src="${this.spriteUrl(pokemon)}"`} 
                      alt="${pokemon.name}" 
-                     onerror="this.src='/static/images/pokeball.png'">
+                     onerror="this.onerror = null; this.src='/static/images/pokeball.png'">
             </div>
             <div class="pokemon-types">
                 ${typeBadges}
@@ -311,6 +482,28 @@ class PokemonViewer {
         }
     }
 
+    async loadSuggestions(query) {
+        const datalist = document.getElementById('search-suggestions');
+        if (!query) {
+            datalist.innerHTML = '';
+            return;
+        }
+
+        try {
+            const response = await fetch(`/api/search/suggest?q=${encodeURIComponent(query)}`);
+            const data = await response.json();
+
+            datalist.innerHTML = '';
+            (data.suggestions || []).forEach(name => {
+                const option = document.createElement('option');
+                option.value = name;
+                datalist.appendChild(option);
+            });
+        } catch (error) {
+            console.error('Suggestion error:', error);
+        }
+    }
+
     showSearchLoading() {
         const resultsDiv = document.getElementById('search-results');
         const skeletonCard = this.createSkeletonCard();
@@ -360,9 +553,9 @@ class PokemonViewer {
                 </div>
                 
                 <div class="pokemon-image">
-                    <img src="${pokemon.sprite_url || '/static/images/pokeball.png'}" 
+                    <img src="${this.spriteUrl(pokemon)}" 
                          alt="${pokemon.name}"
-                         onerror="this.src='/static/images/pokeball.png'">
+                         onerror="this.onerror = null; this.src='/static/images/pokeball.png'">
                 </div>
 
                 <div class="pokemon-types">
@@ -501,7 +694,7 @@ class PokemonViewer {
         ).join('');
         
         preview.innerHTML = `
-            <img src="${pokemon.sprite_url}" alt="${pokemon.name}" onerror="this.src='/static/images/pokeball.png'">
+            <img src="${this.spriteUrl(pokemon)}" alt="${pokemon.name}" onerror="this.onerror = null; this.src='/static/images/pokeball.png'">
             <div class="preview-info">
                 <div class="preview-name">${pokemon.name}</div>
                 <div class="pokemon-types">${typeBadges}</div>
@@ -533,12 +726,25 @@ class PokemonViewer {
         }
     }
     
-    startBattle() {
+    async startBattle() {
         if (!this.battleState.pokemon1 || !this.battleState.pokemon2) return;
         
+        try {
+            const session = await this.battleRequest({
+                type: 'battle_start',
+                player: this.battleState.pokemon1.id,
+                computer: this.battleState.pokemon2.id
+            }, '/api/battle/sessions');
+            this.battleState.sessionId = session.session_id;
+        } catch (error) {
+            console.error('Error starting battle:', error);
+            return;
+        }
+        
         // Reset HP
         this.battleState.pokemon1.current_hp = this.battleState.pokemon1.max_hp;
         this.battleState.pokemon2.current_hp = this.battleState.pokemon2.max_hp;
+        this.battleState.computerAction = null;
         
         // Player always starts first
         this.battleState.currentTurn = 1;
@@ -562,13 +768,13 @@ class PokemonViewer {
         // Setup Pokemon 1 (left side - back sprite)
         document.getElementById('pokemon1-name').textContent = this.battleState.pokemon1.name;
         document.getElementById('pokemon1-sprite').innerHTML = 
-            `<img src="${this.battleState.pokemon1.back_sprite_url || this.battleState.pokemon1.sprite_url}" alt="${this.battleState.pokemon1.name}">`;
+            `<img src="${this.spriteUrl(this.battleState.pokemon1, this.battleState.pokemon1.back_sprite_url ? 'back' : 'front')}" alt="${this.battleState.pokemon1.name}">`;
         this.updateHPBar(1);
         
         // Setup Pokemon 2 (right side - front sprite)
         document.getElementById('pokemon2-name').textContent = this.battleState.pokemon2.name;
         document.getElementById('pokemon2-sprite').innerHTML = 
-            `<img src="${this.battleState.pokemon2.sprite_url}" alt="${this.battleState.pokemon2.name}">`;
+            `<img src="${this.spriteUrl(this.battleState.pokemon2)}" alt="${this.battleState.pokemon2.name}">`;
         this.updateHPBar(2);
         
         // Clear battle log
@@ -643,45 +849,23 @@ class PokemonViewer {
         
         document.getElementById('computer-thinking').style.display = 'none';
         
-        try {
-            // Get computer's chosen action
-            const response = await fetch('/api/battle/computer-action', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json'
-                },
-                body: JSON.stringify({
-                    computer_pokemon: this.battleState.pokemon2,
-                    player_pokemon: this.battleState.pokemon1
-                })
-            });
-            
-            const actionData = await response.json();
+        // The server chose the computer's action when it resolved the player's turn
+        const actionData = this.battleState.computerAction;
+        if (actionData) {
             this.addBattleLog(actionData.description);
+        }
+        
+        // Execute the action after a brief delay
+        setTimeout(async () => {
+            await this.performAction(2, 1, actionData ? actionData.action : 'attack');
             
-            // Execute the action after a brief delay
-            setTimeout(async () => {
-                await this.performAction(2, 1, actionData.action);
-                
-                // Switch back to player turn if battle is still active
-                if (this.battleState.isActive) {
-                    this.battleState.currentTurn = 1;
-                    this.updateTurnInfo();
-                    this.toggleActionButtons(false);
-                }
-            }, 1000);
-            
-        } catch (error) {
-            console.error('Error getting computer action:', error);
-            // Fallback to attack
-            await this.performAction(2, 1, 'attack');
-            
+            // Switch back to player turn if battle is still active
             if (this.battleState.isActive) {
                 this.battleState.currentTurn = 1;
                 this.updateTurnInfo();
                 this.toggleActionButtons(false);
             }
-        }
+        }, 1000);
     }
 
     async performPlayerAttack() {
@@ -699,70 +883,50 @@ class PokemonViewer {
     async performPlayerSpecial() {
         await this.performPlayerAction('special');
     }    async performAction(attackerNum, defenderNum, action) {
-        const attacker = this.battleState[`pokemon${attackerNum}`];
-        const defender = this.battleState[`pokemon${defenderNum}`];
-        
-        // Reset previous turn modifiers for attacker
-        attacker.defend_active = false;
-        attacker.attack_multiplier = 1.0;
-        attacker.defense_multiplier = 1.0;
-        
         // Play action-specific animation
         this.playActionAnimation(attackerNum, action);
         
         try {
-            const response = await fetch('/api/battle/simulate', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json'
-                },
-                body: JSON.stringify({
-                    action: action,
-                    attacker: attacker,
-                    defender: defender
-                })
-            });
+            // The server holds both Pokemon; the player sends its action, the computer's turn sends nothing
+            const delta = await this.battleRequest(
+                { type: 'turn', session_id: this.battleState.sessionId, ...(attackerNum === 1 ? { action: action } : {}) },
+                `/api/battle/sessions/${this.battleState.sessionId}/turn`
+            );
             
-            const result = await response.json();
+            const result = delta.result;
+            this.battleState.pokemon1.current_hp = delta.hp.player;
+            this.battleState.pokemon2.current_hp = delta.hp.computer;
+            this.battleState.computerAction = delta.computer_action || null;
             
-            if (response.ok) {
-                // Handle different action results
-                if (action === 'heal') {
-                    // Update attacker's HP for heal action
-                    this.battleState[`pokemon${attackerNum}`].current_hp = result.new_hp;
-                    setTimeout(() => {
-                        this.playHealAnimation(attackerNum);
-                        this.updateHPBar(attackerNum);
-                        this.addBattleLog(result.battle_log);
-                    }, 300);
-                } else if (action === 'defend') {
-                    // Set defend status for attacker
-                    this.battleState[`pokemon${attackerNum}`].defend_active = true;
-                    this.battleState[`pokemon${attackerNum}`].defense_multiplier = 2.0;
-                    setTimeout(() => {
-                        this.playDefendAnimation(attackerNum);
-                        this.addBattleLog(result.battle_log);
-                    }, 300);
-                } else {
-                    // Handle attack and special actions (damage to defender)
-                    this.battleState[`pokemon${defenderNum}`].current_hp = result.new_hp;
+            // Handle different action results
+            if (result.action === 'heal') {
+                setTimeout(() => {
+                    this.playHealAnimation(attackerNum);
+                    this.updateHPBar(attackerNum);
+                    this.addBattleLog(result.battle_log);
+                }, 300);
+            } else if (result.action === 'defend') {
+                setTimeout(() => {
+                    this.playDefendAnimation(attackerNum);
+                    this.addBattleLog(result.battle_log);
+                }, 300);
+            } else {
+                // Handle attack and special actions (damage to defender)
+                setTimeout(() => {
+                    // Play red blink hit animation on defender
+                    this.playRedBlinkAnimation(defenderNum);
                     
-                    setTimeout(() => {
-                        // Play red blink hit animation on defender
-                        this.playRedBlinkAnimation(defenderNum);
-                        
-                        // Update defender HP bar
-                        this.updateHPBar(defenderNum);
-                        
-                        // Add to battle log
-                        this.addBattleLog(result.battle_log);
-                        
-                        // Check if battle is over
-                        if (result.is_fainted) {
-                            this.endBattle(attackerNum);
-                        }
-                    }, 300);
-                }
+                    // Update defender HP bar
+                    this.updateHPBar(defenderNum);
+                    
+                    // Add to battle log
+                    this.addBattleLog(result.battle_log);
+                    
+                    // Check if battle is over
+                    if (delta.winner) {
+                        this.endBattle(attackerNum);
+                    }
+                }, 300);
             }
         } catch (error) {
             console.error('Error simulating action:', error);
@@ -870,12 +1034,22 @@ class PokemonViewer {
     }
 
     resetBattle() {
+        // Free the server-side battle
+        if (this.battleState.sessionId) {
+            this.battleRequest(
+                { type: 'battle_end', session_id: this.battleState.sessionId },
+                `/api/battle/sessions/${this.battleState.sessionId}`, 'DELETE'
+            ).catch(error => console.error('Error ending battle session:', error));
+        }
+        
         // Reset battle state
         this.battleState = {
             pokemon1: null,
             pokemon2: null,
             currentTurn: 1,
             isActive: false,
+            sessionId: null,
+            computerAction: null,
             pokemonList: this.battleState.pokemonList // Keep the pokemon list
         };
         
@@ -0,0 +1,333 @@
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from multiprocessing import get_context, shared_memory
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import config
+from battle_engine import Combatant, play_matchups
+from dex_index import STAT_FIELDS
+
+# Part of the disk cache key; bump when battle rules change so stored matrices are recomputed
+RULES_VERSION = 3
+# HTTP status of a tournament response without a result, by job status ('queued' and 'running' are 202)
+TOURNAMENT_STATUS_CODES = {'failed': 500, 'busy': 503}
+
+@dataclass(frozen=True)
+class TournamentResult:
+    """Round-robin win probabilities of a set of Pokemon"""
+    names: Tuple[str, ...]
+    # (n, n) share of battles the row Pokemon won against the column Pokemon; NaN on the diagonal
+    wins: np.ndarray
+    # (n, n) share of battles that hit the turn limit
+    draws: np.ndarray
+    battles: int
+    seed: int
+    max_turns: int
+    elapsed: float
+    
+    def to_dict(self) -> Dict:
+        """JSON-ready form: matrices as nested lists (None on the diagonal) and names ranked by mean win rate"""
+        def rows(matrix: np.ndarray) -> List[List[Optional[float]]]:
+            rounded = np.round(matrix.astype(np.float64), 4)
+            return [[None if np.isnan(value) else value for value in row] for row in rounded.tolist()]
+            
+        mean_wins = np.nanmean(self.wins, axis=1) if len(self.names) > 1 else np.zeros(len(self.names))
+        return {
+            'names': list(self.names),
+            'battles_per_pair': self.battles,
+            'seed': self.seed,
+            'max_turns': self.max_turns,
+            'elapsed': round(self.elapsed, 3),
+            'win_rate': rows(self.wins),
+            'draw_rate': rows(self.draws),
+            'ranking': [{'name': self.names[position], 'mean_win_rate': round(float(mean_wins[position]), 4)}
+                        for position in np.argsort(-mean_wins, kind='stable')],
+        }
+    
+    def save(self, path: Path):
+        """Write to an .npz file atomically, so readers never see a partial matrix"""
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(temporary, 'wb') as file:
+            np.savez_compressed(file, names=np.array(self.names), wins=self.wins, draws=self.draws,
+                                settings=np.array([self.battles, self.seed, self.max_turns]),
+                                elapsed=np.array(self.elapsed))
+        os.replace(temporary, path)
+    
+    @classmethod
+    def load(cls, path: Path) -> 'TournamentResult':
+        with np.load(path) as data:
+            battles, seed, max_turns = (int(value) for value in data['settings'])
+            return cls(names=tuple(data['names'].tolist()), wins=data['wins'], draws=data['draws'],
+                       battles=battles, seed=seed, max_turns=max_turns, elapsed=float(data['elapsed']))
+
+def run_tournament(names: Sequence[str], stats: np.ndarray, battles: int, seed: int = 0,
+                   max_turns: int = config.BATTLE_MAX_TURNS, workers: Optional[int] = None,
+                   chunk_pairs: int = config.TOURNAMENT_CHUNK_PAIRS,
+                   progress: Optional[Callable[[int, int], None]] = None) -> TournamentResult:
+    """
+    Play every pair of Pokemon against each other `battles` times
+    
+    Pairs are split into chunks of `chunk_pairs` handed out to a process
+    pool. Stats and the result matrices live in shared memory: workers read
+    the stats and write their chunk's cells in place, so neither is copied
+    or pickled per task. Each chunk draws from its own generator seeded by
+    (seed, chunk number), so the matrix doesn't depend on the worker count.
+    The player always moves first, so each pair plays half of its battles
+    with either Pokemon as the player.
+    
+    Args:
+        names: Pokemon names, one per stats row
+        stats: (n, len(STAT_FIELDS)) base stats in STAT_FIELDS order
+        battles: Battles per pair
+        seed: Seed of the whole tournament
+        max_turns: Actions after which a battle is a draw
+        workers: Processes to use (default: TOURNAMENT_WORKERS, or one per CPU); 1 runs in this process
+        chunk_pairs: Pairs per task
+        progress: Called with (pairs done, total pairs) as chunks finish
+        
+    Returns:
+        TournamentResult with the full win and draw matrices
+    """
+    started = time.perf_counter()
+    count = len(names)
+    workers = workers or config.TOURNAMENT_WORKERS or os.cpu_count() or 1
+    total_pairs = count * (count - 1) // 2
+    chunks = [(start, min(start + chunk_pairs, total_pairs)) for start in range(0, total_pairs, chunk_pairs)]
+    stats = np.ascontiguousarray(stats, dtype=np.int32)
+    
+    stats_memory = shared_memory.SharedMemory(create=True, size=max(stats.nbytes, 1))
+    results_memory = shared_memory.SharedMemory(create=True, size=max(2 * count * count * 4, 1))
+    shared_stats = results = None
+    try:
+        shared_stats = np.ndarray(stats.shape, dtype=np.int32, buffer=stats_memory.buf)
+        shared_stats[:] = stats
+        results = np.ndarray((2, count, count), dtype=np.float32, buffer=results_memory.buf)
+        results[:] = np.nan
+        
+        done = 0
+        if workers <= 1 or len(chunks) <= 1:
+            _configure_worker(shared_stats, results, battles, seed, max_turns)
+            for number, (start, stop) in enumerate(chunks):
+                done += _play_chunk(number, start, stop)
+                if progress is not None:
+                    progress(done, total_pairs)
+        else:
+            # spawn: safe to start from a threaded web server, and the only option on Windows
+            with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), mp_context=get_context('spawn'),
+                                     initializer=_start_worker,
+                                     initargs=(stats_memory.name, results_memory.name, count, battles, seed, max_turns)) as pool:
+                futures = [pool.submit(_play_chunk, number, start, stop) for number, (start, stop) in enumerate(chunks)]
+                for future in as_completed(futures):
+                    done += future.result()
+                    if progress is not None:
+                        progress(done, total_pairs)
+                        
+        wins, draws = results[0].copy(), results[1].copy()
+    finally:
+        # Views into the segments must be gone before they can be closed
+        _worker.clear()
+        shared_stats = results = None
+        for memory in (stats_memory, results_memory):
+            memory.close()
+            memory.unlink()
+            
+    return TournamentResult(names=tuple(names), wins=wins, draws=draws, battles=battles, seed=seed,
+                            max_turns=max_turns, elapsed=time.perf_counter() - started)
+
+# Per-process state of tournament workers, set by _start_worker
+_worker: Dict = {}
+
+def _start_worker(stats_name: str, results_name: str, count: int, battles: int, seed: int, max_turns: int):
+    """Pool initializer: map the parent's segments without copying them"""
+    # The parent owns and unlinks the segments. Before 3.13 attaching also registers them, but with the
+    # parent's resource tracker (pool processes share it), where they are registered already
+    options = {'track': False} if sys.version_info >= (3, 13) else {}
+    memories = [shared_memory.SharedMemory(name=name, **options) for name in (stats_name, results_name)]
+    _configure_worker(np.ndarray((count, len(STAT_FIELDS)), dtype=np.int32, buffer=memories[0].buf),
+                      np.ndarray((2, count, count), dtype=np.float32, buffer=memories[1].buf),
+                      battles, seed, max_turns)
+    _worker['memories'] = memories
+
+def _configure_worker(stats: np.ndarray, results: np.ndarray, battles: int, seed: int, max_turns: int):
+    first, second = np.triu_indices(len(stats), 1)
+    _worker.update(
+        combatants=[_combatant(number, row) for number, row in enumerate(stats.tolist())],
+        results=results,
+        first=first,
+        second=second,
+        battles=battles,
+        seed=seed,
+        max_turns=max_turns
+    )
+
+def _combatant(number: int, row: List[int]) -> Combatant:
+    hp, attack, defense, special_attack, special_defense, speed = row
+    return Combatant(name=str(number), max_hp=hp, current_hp=hp, attack=attack, defense=defense,
+                     special_attack=special_attack, special_defense=special_defense, speed=speed)
+
+def _play_chunk(number: int, start: int, stop: int) -> int:
+    """Play pairs [start, stop) of the upper triangle and write their cells; returns the pairs played"""
+    first, second = _worker['first'][start:stop], _worker['second'][start:stop]
+    combatants = _worker['combatants']
+    rng = np.random.default_rng([_worker['seed'], number])
+    battles = _worker['battles']
+    pairs = [(combatants[row], combatants[column]) for row, column in zip(first, second)]
+    # (first wins, second wins, draws) per pair, with the row Pokemon moving first in the larger half
+    counts = np.zeros((3, len(pairs)), dtype=np.int64)
+    for matchups, count, sides in ((pairs, (battles + 1) // 2, (0, 1)),
+                                   ([(column, row) for row, column in pairs], battles // 2, (1, 0))):
+        if count:
+            winner, _, _ = play_matchups(matchups, count, rng, _worker['max_turns'])
+            for position, side in enumerate(sides):
+                counts[position] += np.count_nonzero(winner == side, axis=1)
+            counts[2] += np.count_nonzero(winner < 0, axis=1)
+    results = _worker['results']
+    results[0, first, second] = counts[0] / battles
+    results[0, second, first] = counts[1] / battles
+    results[1, first, second] = results[1, second, first] = counts[2] / battles
+    return stop - start
+
+class TournamentRunner:
+    """
+    Runs tournaments in the background and caches their matrices on disk
+    
+    One tournament runs at a time (it already uses every core); identical
+    requests while it runs share the job. At most `max_queued` others wait
+    behind it, so new settings beyond that are turned away as 'busy'
+    instead of queueing unbounded work. A failed job is reported for
+    `failed_ttl` seconds and then forgotten, so a later request retries it.
+    Finished matrices are stored in `cache_dir` under a hash of the roster,
+    its stats and the settings, so they survive restarts and are shared by
+    every server process.
+    """
+    
+    # Finished results kept in memory
+    MAX_LOADED = 4
+    
+    def __init__(self, cache_dir: str = config.TOURNAMENT_CACHE_DIR, workers: Optional[int] = None,
+                 max_queued: int = config.TOURNAMENT_MAX_QUEUED, failed_ttl: float = config.TOURNAMENT_FAILED_TTL):
+        self.cache_dir = Path(cache_dir)
+        self.workers = workers
+        self.max_queued = max_queued
+        self.failed_ttl = failed_ttl
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tournament")
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Dict] = {}
+        # Monotonic time at which each failed job is dropped from _jobs
+        self._failed_until: Dict[str, float] = {}
+        self._loaded: 'OrderedDict[str, TournamentResult]' = OrderedDict()
+    
+    @staticmethod
+    def key(names: Sequence[str], stats: np.ndarray, battles: int, seed: int, max_turns: int) -> str:
+        digest = hashlib.sha256(f"{RULES_VERSION}:{battles}:{seed}:{max_turns}:".encode())
+        digest.update('\0'.join(names).encode())
+        digest.update(np.ascontiguousarray(stats, dtype=np.int32).tobytes())
+        return digest.hexdigest()[:32]
+    
+    def get(self, names: Sequence[str], stats: np.ndarray, battles: int, seed: int = 0,
+            max_turns: int = config.BATTLE_MAX_TURNS) -> Tuple[Dict, Optional[TournamentResult]]:
+        """
+        Return the tournament's result, starting it if it isn't cached or running yet
+        
+        Returns:
+            (status, result): status has 'status' ('done', 'queued', 'running', 'failed', or 'busy' when
+            the queue is full and the tournament wasn't started) and progress counters; result is None
+            until the status is 'done'
+        """
+        key = self.key(names, stats, battles, seed, max_turns)
+        path = self.cache_dir / f"{key}.npz"
+        with self._lock:
+            if key in self._loaded:
+                self._loaded.move_to_end(key)
+                return {'status': 'done', 'key': key}, self._loaded[key]
+            self._expire_failed()
+            job = self._jobs.get(key)
+            if job is not None:
+                return dict(job), None
+                
+        if path.exists():
+            try:
+                result = TournamentResult.load(path)
+            except Exception as e:
+                print(f"Error loading tournament {path}: {e}")
+            else:
+                self._remember(key, result)
+                return {'status': 'done', 'key': key}, result
+                
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None:
+                queued = sum(1 for other in self._jobs.values() if other['status'] == 'queued')
+                if queued >= self.max_queued:
+                    return {'status': 'busy', 'key': key, 'retry_after': config.TOURNAMENT_RETRY_AFTER}, None
+                total_pairs = len(names) * (len(names) - 1) // 2
+                job = {'status': 'queued', 'key': key, 'pairs': total_pairs, 'pairs_done': 0}
+                self._jobs[key] = job
+                self._executor.submit(self._run, job, path, list(names), np.array(stats), battles, seed, max_turns)
+            return dict(job), None
+    
+    def _run(self, job: Dict, path: Path, names: List[str], stats: np.ndarray, battles: int, seed: int, max_turns: int):
+        job['status'] = 'running'
+        
+        def progress(done: int, total: int):
+            job['pairs_done'] = done
+            
+        try:
+            result = run_tournament(names, stats, battles, seed, max_turns, workers=self.workers, progress=progress)
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            result.save(path)
+        except Exception as e:
+            print(f"Error running tournament {job['key']}: {e}")
+            with self._lock:
+                job.update(status='failed', error=str(e))
+                self._failed_until[job['key']] = time.monotonic() + self.failed_ttl
+            return
+        self._remember(job['key'], result)
+        with self._lock:
+            self._jobs.pop(job['key'], None)
+    
+    def _expire_failed(self):
+        """Forget failed jobs whose failure has been reported long enough (holding the lock)"""
+        now = time.monotonic()
+        for key, until in list(self._failed_until.items()):
+            if until <= now:
+                del self._failed_until[key]
+                self._jobs.pop(key, None)
+    
+    def _remember(self, key: str, result: TournamentResult):
+        with self._lock:
+            self._loaded[key] = result
+            self._loaded.move_to_end(key)
+            while len(self._loaded) > self.MAX_LOADED:
+                self._loaded.popitem(last=False)
+
+# Rosters /api/battle/tournament accepts: the original 151, or every Pokemon the server has indexed
+TOURNAMENT_SETS = ('151', 'indexed')
+
+def tournament_options(params) -> Tuple[str, int, int]:
+    """
+    Read set, battles (per pair) and seed from /api/battle/tournament query parameters
+    
+    Raises:
+        ValueError: On an unknown set, non-integer values or a battle count outside 1..TOURNAMENT_MAX_BATTLES
+    """
+    pokemon_set = params.get('set', '151')
+    if pokemon_set not in TOURNAMENT_SETS:
+        raise ValueError(f"'set' must be one of {', '.join(TOURNAMENT_SETS)}")
+    try:
+        battles = int(params.get('battles', config.TOURNAMENT_BATTLES))
+        seed = int(params.get('seed', 0))
+    except ValueError:
+        raise ValueError("'battles' and 'seed' must be integers")
+    if not 1 <= battles <= config.TOURNAMENT_MAX_BATTLES:
+        raise ValueError(f"'battles' must be between 1 and {config.TOURNAMENT_MAX_BATTLES}")
+    if seed < 0:
+        raise ValueError("'seed' must not be negative")
+    return pokemon_set, battles, seed
@@ -1,10 +1,26 @@
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request
 from flask_cors import CORS
+from flask_sock import Sock
+from simple_websocket import ConnectionClosed
 from pokemon_service import PokemonService
 from pokemon_api import PokeAPIClient
 from models import Pokemon
+from api_responses import (batch_lookup_body, batch_lookup_names, channel_body, channel_page_body,
+                           channel_pokemon_body, encode_json, page_format, search_found_body)
+from battle import battle_pokemon_from_details, choose_computer_action, simulate_turn
+from battle_engine import Combatant, batch_options, run_battles
+from battle_sessions import ACTIONS, BattleSessionStore
+from cursors import PageCursor, export_options
+from dex_index import DexQuery
+from http_cache import (FILTERED_PAGE_POLICY, PAGE_POLICY, POKEMON_POLICY, SPRITE_POLICY, RenderedResponse,
+                        ResponseCache, content_etag, is_complete_page, pokemon_etag, render_page)
+from sprites import SPRITE_VARIANTS, Sprite, SpriteStore, sheet_options, sprite_size
+from stat_store import StatsQuery
+from tournament import TOURNAMENT_STATUS_CODES, TournamentRunner, tournament_options
+from typing import Dict, Iterator, Optional, Tuple
+import config
+import json
 import logging
-import random
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -13,9 +29,36 @@ logger = logging.getLogger(__name__)
 # Initialize Flask app
 app = Flask(__name__)
 CORS(app)
+sock = Sock(app)
 
 # Initialize Pokemon service
 pokemon_service = PokemonService(page_size=12)  # 12 for nice grid layout
+tournament_runner = TournamentRunner()
+battle_sessions = BattleSessionStore()
+# Rendered bodies, ETags and caching headers of recent GET responses
+response_cache = ResponseCache()
+sprite_store = SpriteStore()
+
+def json_bytes_response(body: bytes, status: int = 200) -> Response:
+    """Wrap already encoded JSON bytes in a response"""
+    return Response(body, status=status, mimetype='application/json')
+
+def rendered_response(rendered: RenderedResponse) -> Response:
+    """Send a rendered response, compressed as Accept-Encoding allows, or an empty 304 if If-None-Match already names it"""
+    status, headers, body = response_cache.answer(rendered, request.headers.get('If-None-Match'),
+                                                  request.headers.get('Accept-Encoding'))
+    return Response(body, status=status, headers=headers, mimetype='application/json' if status == 200 else None)
+
+def response_cache_key() -> str:
+    """Response cache key of the current request"""
+    return ResponseCache.key(request.path, request.args.items(multi=True))
+
+def sprite_response(sprite: Sprite, complete: bool = True) -> Response:
+    """Send a stored PNG with its content-hash ETag and long-lived caching headers, or an empty 304"""
+    # No Accept-Encoding: PNGs are already compressed
+    rendered = RenderedResponse(sprite.body, sprite.etag, SPRITE_POLICY.headers(not complete))
+    status, headers, body = rendered.response_parts(request.headers.get('If-None-Match'))
+    return Response(body, status=status, headers=headers, mimetype='image/png' if status == 200 else None)
 
 @app.route('/')
 def index():
@@ -24,71 +67,114 @@ def index():
 
 @app.route('/api/pokemon')
 def get_pokemon_list():
-    """API endpoint to get paginated Pokemon list"""
+    """
+    API endpoint to get paginated Pokemon list (page=2&limit=50, or cursor=<pagination.next_cursor>&limit=50),
+    optionally filtered and sorted (type=fire&min_speed=100&sort=-base_experience) or columnar (format=columns)
+    """
     try:
-        page = request.args.get('page', 1, type=int)
-        limit = request.args.get('limit', 12, type=int)
+        key = response_cache_key()
+        rendered = response_cache.get(key)
+        if rendered is not None:
+            return rendered_response(rendered)
+            
+        page = max(1, request.args.get('page', 1, type=int))
+        limit = max(1, min(request.args.get('limit', pokemon_service.page_size, type=int), config.MAX_PAGE_SIZE))
         
         # Calculate offset
         offset = (page - 1) * limit
         
-        # Load Pokemon page
-        pokemon_list, pagination_info = pokemon_service.load_pokemon_page(offset=offset)
-        
-        # Convert Pokemon objects to dictionaries
-        pokemon_data = []
-        for pokemon in pokemon_list:
-            pokemon_dict = {
-                'id': pokemon.id,
-                'name': pokemon.name,
-                'height': pokemon.get_height_meters(),
-                'weight': pokemon.get_weight_kg(),
-                'types': pokemon.types,
-                'abilities': pokemon.abilities,
-                'base_experience': pokemon.base_experience,
-                'sprite_url': pokemon.sprite_url,
-                'description': pokemon.description
-            }
-            pokemon_data.append(pokemon_dict)
-        
-        # Prepare response
-        response = {
-            'pokemon': pokemon_data,
-            'pagination': {
-                'current_page': pagination_info.current_page,
-                'total_pages': pagination_info.total_pages,
-                'has_next': pagination_info.has_next,
-                'has_previous': pagination_info.has_previous,
-                'total_count': pagination_info.count,
-                'current_count': len(pokemon_data)
-            }
-        }
-        
-        return jsonify(response)
+        try:
+            query = DexQuery.from_params(request.args)
+            layout = page_format(request.args)
+            cursor = PageCursor.from_params(request.args)
+            if cursor is not None and query is not None:
+                raise ValueError("'cursor' can't be combined with filters or sorting")
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+            
+        if query is not None:
+            pokemon_list, pagination_info = pokemon_service.filter_pokemon(query, offset=offset, limit=limit)
+            filters = {'indexed': len(pokemon_service.dex_indexer), 'complete': pokemon_service.dex_indexer.complete}
+            rendered = render_page(pokemon_list, pagination_info, filters, FILTERED_PAGE_POLICY, layout)
+            if filters['complete']:
+                response_cache.put(key, rendered)
+            return rendered_response(rendered)
+            
+        # Load Pokemon page; prefetches are tracked per browser so one visitor jumping around doesn't cancel another's
+        if cursor is not None:
+            pokemon_list, pagination_info = pokemon_service.load_pokemon_page_after(
+                cursor, limit=limit, client_id=request.remote_addr)
+        else:
+            pokemon_list, pagination_info = pokemon_service.load_pokemon_page(
+                offset=offset, limit=limit, client_id=request.remote_addr)
+        
+        rendered = render_page(pokemon_list, pagination_info, page_format=layout)
+        if is_complete_page(pokemon_list, pagination_info):
+            response_cache.put(key, rendered)
+        return rendered_response(rendered)
         
     except Exception as e:
         logger.error(f"Error fetching Pokemon list: {e}")
         return jsonify({'error': 'Failed to fetch Pokemon list'}), 500
 
+@app.route('/api/export/pokemon')
+def export_pokemon():
+    """API endpoint streaming a range of Pokemon as NDJSON, one Pokemon per line (offset=0&count=500, or cursor=...&count=500)"""
+    try:
+        try:
+            cursor, offset, count = export_options(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+            
+        if cursor is not None:
+            offset = pokemon_service.locate_cursor(cursor)
+        return Response(ndjson_lines(pokemon_service.export_pokemon(offset, count)), mimetype='application/x-ndjson')
+        
+    except Exception as e:
+        logger.error(f"Error exporting Pokemon: {e}")
+        return jsonify({'error': 'Failed to export Pokemon'}), 500
+
+def ndjson_lines(pokemon_stream: Iterator[Pokemon]) -> Iterator[bytes]:
+    """One JSON line per Pokemon; an upstream failure ends the body early, since the status line has already gone out"""
+    try:
+        for pokemon in pokemon_stream:
+            yield pokemon.to_json() + b'\n'
+    except Exception as e:
+        logger.error(f"Error exporting Pokemon: {e}")
+
+@app.route('/api/pokemon/batch', methods=['POST'])
+def get_pokemon_batch():
+    """API endpoint to look up many Pokemon by name or ID in one request, e.g. a team of six"""
+    try:
+        try:
+            names = batch_lookup_names(request.get_json(silent=True))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+            
+        return json_bytes_response(batch_lookup_body(names, pokemon_service.get_many(names)))
+        
+    except Exception as e:
+        logger.error(f"Error fetching Pokemon batch: {e}")
+        return jsonify({'error': 'Failed to fetch Pokemon'}), 500
+
 @app.route('/api/pokemon/<pokemon_name>')
 def get_pokemon_details(pokemon_name):
     """API endpoint to get specific Pokemon details"""
     try:
-        pokemon = pokemon_service.search_pokemon(pokemon_name)
+        key = response_cache_key()
+        rendered = response_cache.get(key)
+        if rendered is not None:
+            return rendered_response(rendered)
+            
+        pokemon, stale = pokemon_service.search_pokemon_with_status(pokemon_name, match=False)
         
         if pokemon:
-            pokemon_dict = {
-                'id': pokemon.id,
-                'name': pokemon.name,
-                'height': pokemon.get_height_meters(),
-                'weight': pokemon.get_weight_kg(),
-                'types': pokemon.types,
-                'abilities': pokemon.abilities,
-                'base_experience': pokemon.base_experience,
-                'sprite_url': pokemon.sprite_url,
-                'description': pokemon.description
-            }
-            return jsonify(pokemon_dict)
+            # The body is the plain Pokemon object, so staleness is reported in a header
+            rendered = RenderedResponse(pokemon.to_json(), pokemon_etag(pokemon),
+                                        {**POKEMON_POLICY.headers(stale), 'X-Stale': 'true' if stale else 'false'})
+            if not stale:
+                response_cache.put(key, rendered)
+            return rendered_response(rendered)
         else:
             return jsonify({'error': 'Pokemon not found'}), 404
             
@@ -105,21 +191,10 @@ def search_pokemon():
         if not query:
             return jsonify({'error': 'Search query is required'}), 400
         
-        pokemon = pokemon_service.search_pokemon(query)
+        pokemon, stale = pokemon_service.search_pokemon_with_status(query)
         
         if pokemon:
-            pokemon_dict = {
-                'id': pokemon.id,
-                'name': pokemon.name,
-                'height': pokemon.get_height_meters(),
-                'weight': pokemon.get_weight_kg(),
-                'types': pokemon.types,
-                'abilities': pokemon.abilities,
-                'base_experience': pokemon.base_experience,
-                'sprite_url': pokemon.sprite_url,
-                'description': pokemon.description
-            }
-            return jsonify({'pokemon': pokemon_dict, 'found': True})
+            return json_bytes_response(search_found_body(pokemon, stale))
         else:
             return jsonify({'found': False, 'message': f'Pokemon "{query}" not found'})
             
@@ -127,6 +202,38 @@ def search_pokemon():
         logger.error(f"Error searching for Pokemon: {e}")
         return jsonify({'error': 'Search failed'}), 500
 
+@app.route('/api/search/suggest')
+def suggest_pokemon():
+    """API endpoint for search autocomplete, answered from the local name index"""
+    try:
+        query = request.args.get('q', '').strip().lower()
+        limit = request.args.get('limit', config.SEARCH_SUGGESTION_LIMIT, type=int)
+        
+        if not query:
+            return jsonify({'query': query, 'suggestions': []})
+        
+        limit = max(1, min(limit, config.MAX_PAGE_SIZE))
+        return jsonify({'query': query, 'suggestions': pokemon_service.suggest_pokemon(query, limit)})
+        
+    except Exception as e:
+        logger.error(f"Error suggesting Pokemon names: {e}")
+        return jsonify({'error': 'Suggestions failed'}), 500
+
+@app.route('/api/stats')
+def get_stats():
+    """API endpoint for aggregate stats: percentiles, top-N and per-type averages (stat=speed&type=fire&top=5&percentiles=50,90)"""
+    try:
+        try:
+            query = StatsQuery.from_params(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+            
+        return jsonify(pokemon_service.stats_report(query))
+        
+    except Exception as e:
+        logger.error(f"Error computing Pokemon stats: {e}")
+        return jsonify({'error': 'Failed to compute Pokemon stats'}), 500
+
 @app.route('/battle')
 def battle_page():
     """Battle simulator page route"""
@@ -136,10 +243,19 @@ def battle_page():
 def get_pokemon_names():
     """API endpoint to get a list of Pokemon names for dropdowns"""
     try:
+        key = response_cache_key()
+        rendered = response_cache.get(key)
+        if rendered is not None:
+            return rendered_response(rendered)
+            
         # Get first 151 Pokemon (original generation) for dropdown
         response = pokemon_service.api_client.get_pokemon_list(limit=151, offset=0)
         pokemon_names = [pokemon['name'] for pokemon in response.get('results', [])]
-        return jsonify({'pokemon': pokemon_names})
+        body = encode_json({'pokemon': pokemon_names})
+        rendered = RenderedResponse(body, content_etag(body), PAGE_POLICY.headers())
+        if pokemon_names:
+            response_cache.put(key, rendered)
+        return rendered_response(rendered)
     except Exception as e:
         logger.error(f"Error fetching Pokemon names: {e}")
         return jsonify({'error': 'Failed to fetch Pokemon names'}), 500
@@ -148,44 +264,17 @@ def get_pokemon_names():
 def get_battle_pokemon(pokemon_name):
     """API endpoint to get Pokemon battle stats"""
     try:
-        pokemon_details = pokemon_service.api_client.get_pokemon_details(pokemon_name)
-        if not pokemon_details:
+        key = response_cache_key()
+        rendered = response_cache.get(key)
+        if rendered is not None:
+            return rendered_response(rendered)
+            
+        battle_pokemon = load_battle_pokemon(pokemon_name)
+        if not battle_pokemon:
             return jsonify({'error': 'Pokemon not found'}), 404
         
-        # Extract stats for battle
-        stats = {}
-        for stat in pokemon_details.get('stats', []):
-            stat_name = stat['stat']['name']
-            stat_value = stat['base_stat']
-            stats[stat_name] = stat_value
-        
-        # Get moves for special attacks
-        moves = []
-        for move_data in pokemon_details.get('moves', [])[:4]:  # Get first 4 moves
-            move_name = move_data['move']['name']
-            moves.append(move_name)
-        
-        battle_data = {
-            'id': pokemon_details.get('id'),
-            'name': pokemon_details.get('name', '').title(),
-            'sprite_url': pokemon_details.get('sprites', {}).get('front_default'),
-            'back_sprite_url': pokemon_details.get('sprites', {}).get('back_default'),
-            'types': [type_info['type']['name'] for type_info in pokemon_details.get('types', [])],
-            'stats': {
-                'hp': stats.get('hp', 50),
-                'attack': stats.get('attack', 50),
-                'defense': stats.get('defense', 50),
-                'special-attack': stats.get('special-attack', 50),
-                'special-defense': stats.get('special-defense', 50),
-                'speed': stats.get('speed', 50)
-            },
-            'moves': moves,
-            'defend_active': False,
-            'attack_multiplier': 1.0,
-            'defense_multiplier': 1.0
-        }
-        
-        return jsonify(battle_data)
+        body = encode_json(battle_pokemon)
+        return rendered_response(response_cache.put(key, RenderedResponse(body, content_etag(body), POKEMON_POLICY.headers())))
         
     except Exception as e:
         logger.error(f"Error fetching battle Pokemon {pokemon_name}: {e}")
@@ -196,60 +285,7 @@ def get_computer_action():
     """API endpoint to get computer's action choice"""
     try:
         data = request.get_json()
-        computer_pokemon = data.get('computer_pokemon')
-        player_pokemon = data.get('player_pokemon')
-        
-        # Calculate HP percentages for decision making
-        computer_hp_percent = computer_pokemon['current_hp'] / computer_pokemon['max_hp']
-        player_hp_percent = player_pokemon['current_hp'] / player_pokemon['max_hp']
-        
-        # AI decision logic with weights
-        action_weights = {}
-        
-        # Always can attack
-        action_weights['attack'] = 40
-        
-        # Heal if low on HP (below 35%)
-        if computer_hp_percent < 0.35:
-            action_weights['heal'] = 50
-        else:
-            action_weights['heal'] = 10
-            
-        # Defend if player has high attack stats or computer is low on HP
-        player_attack = player_pokemon['stats']['attack']
-        if player_attack > computer_pokemon['stats']['defense'] or computer_hp_percent < 0.25:
-            action_weights['defend'] = 30
-        else:
-            action_weights['defend'] = 15
-            
-        # Special move if computer has good special attack
-        if computer_pokemon['stats']['special-attack'] > computer_pokemon['stats']['attack']:
-            action_weights['special'] = 35
-        else:
-            action_weights['special'] = 25
-            
-        # Don't heal if already at high HP
-        if computer_hp_percent > 0.8:
-            action_weights['heal'] = 5
-            
-        # Choose action based on weights
-        actions = list(action_weights.keys())
-        weights = list(action_weights.values())
-        
-        chosen_action = random.choices(actions, weights=weights, k=1)[0]
-        
-        # Generate action description
-        action_descriptions = {
-            'attack': "The opponent is preparing to attack!",
-            'defend': "The opponent is taking a defensive stance!",
-            'heal': "The opponent is focusing to recover!",
-            'special': "The opponent is charging up a special move!"
-        }
-        
-        return jsonify({
-            'action': chosen_action,
-            'description': action_descriptions[chosen_action]
-        })
+        return jsonify(choose_computer_action(data.get('computer_pokemon'), data.get('player_pokemon')))
         
     except Exception as e:
         logger.error(f"Error getting computer action: {e}")
@@ -260,93 +296,285 @@ def simulate_battle():
     """API endpoint to simulate a battle turn with different actions"""
     try:
         data = request.get_json()
-        action = data.get('action', 'attack')
-        attacker = data.get('attacker')
-        defender = data.get('defender')
+        return jsonify(simulate_turn(data.get('action', 'attack'), data.get('attacker'), data.get('defender')))
         
-        result = {}
-        
-        if action == 'attack':
-            # Standard attack action
-            base_damage = attacker['stats']['attack'] * attacker.get('attack_multiplier', 1.0)
-            random_factor = random.randint(-5, 5)
-            defense = defender['stats']['defense'] * defender.get('defense_multiplier', 1.0)
-            
-            # Apply defend reduction if defender is defending
-            damage = max(1, int(base_damage + random_factor - defense))
-            if defender.get('defend_active', False):
-                damage = int(damage * 0.5)
-                result['defend_blocked'] = True
-            
-            new_hp = max(0, defender['current_hp'] - damage)
-            
-            result = {
-                'action': 'attack',
-                'damage': damage,
-                'new_hp': new_hp,
-                'is_fainted': new_hp <= 0,
-                'battle_log': f"{attacker['name']} used Tackle! It dealt {damage} damage to {defender['name']}!"
-            }
-            
-        elif action == 'defend':
-            # Defend action - sets up damage reduction for next turn
-            result = {
-                'action': 'defend',
-                'damage': 0,
-                'new_hp': defender['current_hp'],
-                'is_fainted': False,
-                'defend_active': True,
-                'battle_log': f"{attacker['name']} is defending! Incoming damage will be reduced next turn."
-            }
+    except Exception as e:
+        logger.error(f"Error simulating battle: {e}")
+        return jsonify({'error': 'Battle simulation failed'}), 500
+
+@app.route('/api/battle/batch', methods=['POST'])
+def simulate_battle_batch():
+    """API endpoint to run many full battles between two Pokemon and return win rates, turns and damage"""
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            data = {}
+        try:
+            battles, seed, max_turns = batch_options(data)
+            player = battle_combatant(data.get('player'))
+            computer = battle_combatant(data.get('computer'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
             
-        elif action == 'heal':
-            # Heal action - restore 20% of max HP
-            heal_amount = int(attacker['max_hp'] * 0.2)
-            new_hp = min(attacker['max_hp'], attacker['current_hp'] + heal_amount)
-            actual_heal = new_hp - attacker['current_hp']
+        if player is None or computer is None:
+            return jsonify({'error': 'Pokemon not found'}), 404
             
-            result = {
-                'action': 'heal',
-                'damage': 0,
-                'heal_amount': actual_heal,
-                'new_hp': new_hp,
-                'is_fainted': False,
-                'battle_log': f"{attacker['name']} used Heal! Restored {actual_heal} HP."
-            }
+        outcomes = run_battles(player, computer, battles, seed=seed, max_turns=max_turns)
+        return jsonify({'seed': seed, **outcomes.summary()})
+        
+    except Exception as e:
+        logger.error(f"Error running battle batch: {e}")
+        return jsonify({'error': 'Battle batch failed'}), 500
+
+def battle_combatant(pokemon) -> Optional[Combatant]:
+    """
+    Resolve one side of a battle batch request
+    
+    Args:
+        pokemon: A Pokemon name or ID, or a battle Pokemon dict as /api/battle/pokemon returns it
+            (optionally with the current max_hp, current_hp and defend_active)
             
-        elif action == 'special':
-            # Special move - enhanced damage using special attack
-            base_damage = attacker['stats']['special-attack'] * attacker.get('attack_multiplier', 1.0)
-            random_factor = random.randint(-3, 8)  # Higher variance for special moves
-            defense = defender['stats']['special-defense'] * defender.get('defense_multiplier', 1.0)
+    Returns:
+        Combatant, or None if the named Pokemon doesn't exist
+        
+    Raises:
+        ValueError: If the value is missing or malformed
+    """
+    if isinstance(pokemon, dict):
+        return Combatant.from_battle_pokemon(pokemon)
+    if not isinstance(pokemon, (str, int)) or not str(pokemon).strip():
+        raise ValueError("'player' and 'computer' must be Pokemon names or battle Pokemon")
+        
+    battle_pokemon = load_battle_pokemon(pokemon)
+    return Combatant.from_battle_pokemon(battle_pokemon) if battle_pokemon else None
+
+def load_battle_pokemon(pokemon) -> Optional[Dict]:
+    """
+    Battle Pokemon for a name or ID, as /api/battle/pokemon returns it
+    
+    Returns:
+        Battle Pokemon dict, or None if the Pokemon doesn't exist
+        
+    Raises:
+        ValueError: If the value isn't a name or ID
+    """
+    if not isinstance(pokemon, (str, int)) or not str(pokemon).strip():
+        raise ValueError("'player' and 'computer' must be Pokemon names or IDs")
+        
+    pokemon_details = pokemon_service.api_client.get_pokemon_details(str(pokemon).strip().lower())
+    if not pokemon_details:
+        return None
+    return battle_pokemon_from_details(pokemon_details, pokemon_service.battle_stats(pokemon_details))
+
+@app.route('/api/battle/sessions', methods=['POST'])
+def create_battle_session():
+    """API endpoint to start a battle held on the server ({"player": "pikachu", "computer": 25}); turns then send only the action"""
+    try:
+        body, status = open_battle_session(request.get_json(silent=True))
+        return jsonify(body), status
+        
+    except Exception as e:
+        logger.error(f"Error creating battle session: {e}")
+        return jsonify({'error': 'Failed to start battle'}), 500
+
+def open_battle_session(data) -> Tuple[Dict, int]:
+    """Start a battle session for a request body with 'player' and 'computer'; returns (response body, HTTP status)"""
+    if not isinstance(data, dict):
+        data = {}
+    try:
+        player = load_battle_pokemon(data.get('player'))
+        computer = load_battle_pokemon(data.get('computer'))
+    except ValueError as e:
+        return {'error': str(e)}, 400
+        
+    if player is None or computer is None:
+        return {'error': 'Pokemon not found'}, 404
+        
+    session_id, _ = battle_sessions.create(player, computer)
+    return {'session_id': session_id, 'player': player, 'computer': computer,
+            'next': 'player', 'expires_in': battle_sessions.ttl}, 201
+
+@app.route('/api/battle/sessions/<session_id>/turn', methods=['POST'])
+def play_battle_turn(session_id):
+    """API endpoint to play the player's action ({"action": "attack"}) or, with no action, the computer's announced one"""
+    try:
+        body, status = play_session_turn(session_id, request.get_json(silent=True))
+        return jsonify(body), status
+        
+    except Exception as e:
+        logger.error(f"Error playing battle turn: {e}")
+        return jsonify({'error': 'Battle turn failed'}), 500
+
+def play_session_turn(session_id, data) -> Tuple[Dict, int]:
+    """Play one turn of a battle session for a request body with an optional 'action'; returns (response body, HTTP status)"""
+    action = data.get('action') if isinstance(data, dict) else None
+    if action is not None and action not in ACTIONS:
+        return {'error': f"'action' must be one of {', '.join(ACTIONS)}"}, 400
+        
+    try:
+        delta = battle_sessions.play(str(session_id), action)
+    except ValueError as e:
+        # Not this side's turn, or the battle is over
+        return {'error': str(e)}, 409
+        
+    if delta is None:
+        return {'error': 'Battle session not found or expired'}, 404
+    return delta, 200
+
+@app.route('/api/battle/sessions/<session_id>', methods=['DELETE'])
+def end_battle_session(session_id):
+    """API endpoint to close a battle session before it expires"""
+    if not battle_sessions.end(session_id):
+        return jsonify({'error': 'Battle session not found or expired'}), 404
+    return '', 204
+
+@sock.route('/ws')
+def live_channel(ws):
+    """
+    WebSocket carrying streamed Pokemon pages and battle turns over one connection
+    
+    Client messages are JSON objects with a `type` and an `id` that every reply
+    echoes. `page` ({"page": 2}) is answered with a `page` message holding the
+    pagination, one `pokemon` message per card as soon as it loads (`index` is
+    its position on the page) and `done`. `battle_start`, `turn` and
+    `battle_end` take the bodies of the /api/battle/sessions endpoints (plus
+    `session_id`) and reply with the same type. Failures reply `error` with
+    the HTTP status the endpoint would have used.
+    """
+    def send(body: bytes):
+        ws.send(body.decode('utf-8'))
+        
+    while True:
+        try:
+            message = json.loads(ws.receive())
+        except ValueError:
+            message = None
+        if not isinstance(message, dict):
+            send(channel_body(None, 'error', {'error': 'Messages must be JSON objects', 'status': 400}))
+            continue
             
-            # Special moves do 1.3x damage
-            damage = max(1, int((base_damage + random_factor - defense) * 1.3))
-            if defender.get('defend_active', False):
-                damage = int(damage * 0.5)
-                result['defend_blocked'] = True
+        message_id, message_type = message.get('id'), message.get('type')
+        try:
+            if message_type == 'page':
+                stream_page(send, message_id, message)
+                continue
+            if message_type == 'battle_start':
+                body, status = open_battle_session(message)
+            elif message_type == 'turn':
+                body, status = play_session_turn(message.get('session_id'), message)
+            elif message_type == 'battle_end':
+                ended = battle_sessions.end(str(message.get('session_id')))
+                body, status = ({}, 200) if ended else ({'error': 'Battle session not found or expired'}, 404)
+            else:
+                body, status = {'error': "'type' must be one of page, battle_start, turn, battle_end"}, 400
+            send(channel_body(message_id, message_type if status < 400 else 'error',
+                              body if status < 400 else {**body, 'status': status}))
+                              
+        except ConnectionClosed:
+            raise
+        except Exception as e:
+            logger.error(f"Error handling {message_type} message: {e}")
+            send(channel_body(message_id, 'error', {'error': 'Request failed', 'status': 500}))
+
+def stream_page(send, message_id, message: Dict):
+    """Send a page of Pokemon over the live channel card by card, in the order they finish loading"""
+    try:
+        page = max(1, int(message.get('page', 1)))
+        limit = max(1, min(int(message.get('limit', pokemon_service.page_size)), config.MAX_PAGE_SIZE))
+    except (TypeError, ValueError):
+        send(channel_body(message_id, 'error', {'error': "'page' and 'limit' must be integers", 'status': 400}))
+        return
+        
+    pagination_info, pokemon_stream = pokemon_service.stream_pokemon_page(
+        offset=(page - 1) * limit, limit=limit, client_id=request.remote_addr)
+    send(channel_page_body(message_id, pagination_info))
+    count = 0
+    for position, pokemon in pokemon_stream:
+        send(channel_pokemon_body(message_id, position, pokemon))
+        count += 1
+    send(channel_body(message_id, 'done', {'count': count}))
+
+@app.route('/api/battle/tournament')
+def get_tournament():
+    """API endpoint for the round-robin win-probability matrix of a Pokemon set (set=151|indexed&battles=200&seed=0)"""
+    try:
+        try:
+            pokemon_set, battles, seed = tournament_options(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
             
-            new_hp = max(0, defender['current_hp'] - damage)
+        names, stats = pokemon_service.battle_roster(pokemon_set)
+        if len(names) < 2:
+            return jsonify({'error': 'Not enough Pokemon loaded for a tournament'}), 404
             
-            # Get a random move name if available
-            move_name = "Special Attack"
-            if attacker.get('moves') and len(attacker['moves']) > 0:
-                move_name = attacker['moves'][random.randint(0, len(attacker['moves']) - 1)].replace('-', ' ').title()
+        # Computed in the background across all cores; 202 with progress until the matrix is ready, 503 while
+        # too many other tournaments are queued
+        status, result = tournament_runner.get(names, stats, battles, seed)
+        if result is None:
+            response = jsonify({'set': pokemon_set, **status})
+            if 'retry_after' in status:
+                response.headers['Retry-After'] = str(status['retry_after'])
+            return response, TOURNAMENT_STATUS_CODES.get(status['status'], 202)
+        return jsonify({'set': pokemon_set, **status, **result.to_dict()})
+        
+    except Exception as e:
+        logger.error(f"Error running tournament: {e}")
+        return jsonify({'error': 'Tournament failed'}), 500
+
+@app.route('/sprites/<int:pokemon_id>/<variant>')
+def get_sprite(pokemon_id, variant):
+    """Pokemon sprite (front, back or shiny) proxied from SPRITE_BASE_URL through the local sprite store (size=48 for a thumbnail)"""
+    try:
+        if variant not in SPRITE_VARIANTS:
+            return jsonify({'error': 'Sprite not found'}), 404
+        try:
+            size = sprite_size(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
             
-            result = {
-                'action': 'special',
-                'damage': damage,
-                'new_hp': new_hp,
-                'is_fainted': new_hp <= 0,
-                'move_name': move_name,
-                'battle_log': f"{attacker['name']} used {move_name}! It dealt {damage} damage to {defender['name']}!"
-            }
+        sprite = sprite_store.get(pokemon_id, variant, size)
+        if sprite is None:
+            return jsonify({'error': 'Sprite not found'}), 404
+        return sprite_response(sprite)
         
-        return jsonify(result)
+    except Exception as e:
+        logger.error(f"Error fetching sprite {pokemon_id}/{variant}: {e}")
+        return jsonify({'error': 'Failed to fetch sprite'}), 500
+
+@app.route('/sprites/sheet')
+def get_sprite_sheet():
+    """One PNG strip with the sprites of several Pokemon, e.g. a page of cards (ids=1,2,3&variant=front&size=48)"""
+    try:
+        try:
+            pokemon_ids, variant, size = sheet_options(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+            
+        return sprite_response(*sprite_store.get_sheet(pokemon_ids, variant, size))
         
     except Exception as e:
-        logger.error(f"Error simulating battle: {e}")
-        return jsonify({'error': 'Battle simulation failed'}), 500
+        logger.error(f"Error building sprite sheet: {e}")
+        return jsonify({'error': 'Failed to build sprite sheet'}), 500
+
+@app.route('/api/cache/stats')
+def get_cache_stats():
+    """API endpoint exposing upstream and rendered response cache, request coalescing, circuit breaker, stale serving and prefetch counters"""
+    api_client = pokemon_service.api_client
+    single_flight = getattr(api_client, 'single_flight', None)
+    circuit_breaker = getattr(api_client, 'circuit_breaker', None)
+    upstream = {
+        'coalescing': single_flight.stats() if single_flight is not None else None,
+        'circuit_breaker': circuit_breaker.stats() if circuit_breaker is not None else None,
+        'stale_while_revalidate': pokemon_service.stale_stats(),
+        'prefetch': pokemon_service.prefetcher.stats() if pokemon_service.prefetcher is not None else None,
+        'battle_sessions': battle_sessions.stats(),
+        'rendered_responses': response_cache.stats(),
+        'sprites': sprite_store.stats(),
+    }
+    
+    if api_client.cache is None:
+        return jsonify({'enabled': False, **upstream})
+    return jsonify({'enabled': True, **api_client.cache.stats(), **upstream})
 
 @app.errorhandler(404)
 def not_found(error):
@@ -364,4 +592,5 @@ if __name__ == '__main__':
     print("🔄 The application will automatically load with lazy loading enabled")
     print("🛑 Press Ctrl+C to stop the server\n")
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    # PokemonService is stateless, so requests can be served from many threads
+    app.run(debug=True, host='0.0.0.0', port=5000, threaded=True)
\ No newline at end of file